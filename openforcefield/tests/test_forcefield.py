@@ -404,13 +404,13 @@ def create_cyclohexane():
 
 nonbonded_resolution_matrix = [
     {'vdw_method': 'cutoff', 'electrostatics_method': 'Coulomb', 'has_periodic_box': True,
-     'omm_force': None, 'exception': IncompatibleParameterError, 'exception_match': ''},
+     'omm_force': openmm.NonbondedForce.CutoffPeriodic, 'exception': None, 'exception_match': ''},
     {'vdw_method': 'cutoff', 'electrostatics_method': 'Coulomb', 'has_periodic_box': False,
      'omm_force': openmm.NonbondedForce.NoCutoff, 'exception': None, 'exception_match': ''},
     {'vdw_method': 'cutoff', 'electrostatics_method': 'reaction-field', 'has_periodic_box': True,
-     'omm_force': None, 'exception': SMIRNOFFSpecError, 'exception_match': 'reaction-field'},
+     'omm_force': openmm.NonbondedForce.CutoffPeriodic, 'exception': None, 'exception_match': ''},
     {'vdw_method': 'cutoff', 'electrostatics_method': 'reaction-field', 'has_periodic_box': False,
-     'omm_force': None, 'exception': SMIRNOFFSpecError, 'exception_match': 'reaction-field'},
+     'omm_force': openmm.NonbondedForce.CutoffNonPeriodic, 'exception': None, 'exception_match': ''},
     {'vdw_method': 'cutoff', 'electrostatics_method': 'PME', 'has_periodic_box': True,
      'omm_force': openmm.NonbondedForce.PME, 'exception': None, 'exception_match': ''},
     {'vdw_method': 'cutoff', 'electrostatics_method': 'PME', 'has_periodic_box': False,
@@ -421,9 +421,9 @@ nonbonded_resolution_matrix = [
     {'vdw_method': 'PME', 'electrostatics_method': 'Coulomb', 'has_periodic_box': False,
      'omm_force': openmm.NonbondedForce.NoCutoff, 'exception': None, 'exception_match': ''},
     {'vdw_method': 'PME', 'electrostatics_method': 'reaction-field', 'has_periodic_box': True,
-     'omm_force': None, 'exception': SMIRNOFFSpecError, 'exception_match': 'reaction-field'},
+     'omm_force': None, 'exception': IncompatibleParameterError, 'exception_match': 'LJPME'},
     {'vdw_method': 'PME', 'electrostatics_method': 'reaction-field', 'has_periodic_box': False,
-     'omm_force': None, 'exception': SMIRNOFFSpecError, 'exception_match': 'reaction-field'},
+     'omm_force': openmm.NonbondedForce.CutoffNonPeriodic, 'exception': None, 'exception_match': ''},
     {'vdw_method': 'PME', 'electrostatics_method': 'PME', 'has_periodic_box': True,
      'omm_force': openmm.NonbondedForce.LJPME, 'exception': None, 'exception_match': ''},
     {'vdw_method': 'PME', 'electrostatics_method': 'PME', 'has_periodic_box': False,
@@ -747,6 +747,81 @@ class TestForceField():
         assert '<Date>' not in xml_str
 
 
+    def test_compiled_cache(self, tmpdir, monkeypatch):
+        """Test that the compiled cache is reused and invalidated when the sources change"""
+        cache_dir = str(tmpdir.mkdir('cache'))
+        offxml_file_path = os.path.join(str(tmpdir), 'forcefield.offxml')
+        with open(offxml_file_path, 'w') as f:
+            f.write(xml_ff_w_comments)
+
+        # The first load parses the sources and creates the cache entry.
+        ff_1 = ForceField(offxml_file_path, simple_xml_ff, cache_dir=cache_dir,
+                          allow_cosmetic_attributes=True)
+        assert len(os.listdir(cache_dir)) == 1
+
+        # The second load must not parse the sources.
+        n_parsed = [0]
+        original_parse = ForceField.parse_smirnoff_from_source
+        def counting_parse(self, source):
+            n_parsed[0] += 1
+            return original_parse(self, source)
+        monkeypatch.setattr(ForceField, 'parse_smirnoff_from_source', counting_parse)
+
+        ff_2 = ForceField(offxml_file_path, simple_xml_ff, cache_dir=cache_dir,
+                          allow_cosmetic_attributes=True)
+        assert n_parsed[0] == 0
+        assert ff_1.to_string() == ff_2.to_string()
+        assert ff_1.author == ff_2.author
+        assert ff_1.date == ff_2.date
+
+        # Modifying the cached force field doesn't affect the cache entry.
+        ff_2.get_parameter_handler('Bonds').parameters[0].length *= 2
+        ff_3 = ForceField(offxml_file_path, simple_xml_ff, cache_dir=cache_dir,
+                          allow_cosmetic_attributes=True)
+        assert n_parsed[0] == 0
+        assert ff_1.to_string() == ff_3.to_string()
+
+        # Changing the file content invalidates the cache entry.
+        with open(offxml_file_path, 'w') as f:
+            f.write(xml_ff_w_comments.replace('length="1.51 * angstrom"', 'length="1.52 * angstrom"'))
+        ff_4 = ForceField(offxml_file_path, simple_xml_ff, cache_dir=cache_dir,
+                          allow_cosmetic_attributes=True)
+        assert n_parsed[0] == 2
+        assert ff_4.get_parameter_handler('Bonds').parameters['[#6X4:1]-[#6X3:2]'].length == 1.52 * unit.angstrom
+        assert len(os.listdir(cache_dir)) == 2
+
+        # A corrupted cache entry is ignored and the sources are parsed again.
+        for file_name in os.listdir(cache_dir):
+            with open(os.path.join(cache_dir, file_name), 'wb') as f:
+                f.write(b'corrupted')
+        ff_5 = ForceField(offxml_file_path, simple_xml_ff, cache_dir=cache_dir,
+                          allow_cosmetic_attributes=True)
+        assert n_parsed[0] == 4
+        assert ff_4.to_string() == ff_5.to_string()
+
+        # Cache files that other users can write to are not loaded.
+        for file_name in os.listdir(cache_dir):
+            os.chmod(os.path.join(cache_dir, file_name), 0o666)
+        ForceField(offxml_file_path, simple_xml_ff, cache_dir=cache_dir, allow_cosmetic_attributes=True)
+        assert n_parsed[0] == 6
+
+        # Changing the version of a handler class creates a new entry.
+        from openforcefield.typing.engines.smirnoff.parameters import BondHandler
+        n_cache_files = len(os.listdir(cache_dir))
+        monkeypatch.setattr(BondHandler, '_MAX_SUPPORTED_SECTION_VERSION', 100.0)
+        ForceField(offxml_file_path, simple_xml_ff, cache_dir=cache_dir, allow_cosmetic_attributes=True)
+        assert len(os.listdir(cache_dir)) == n_cache_files + 1
+
+        # Handlers that can't be pickled are not cached, but the force field is still created.
+        import pickle
+        def unpicklable_dump(*args, **kwargs):
+            raise TypeError('cannot pickle this handler')
+        monkeypatch.setattr(pickle, 'dump', unpicklable_dump)
+        monkeypatch.setattr(BondHandler, '_MAX_SUPPORTED_SECTION_VERSION', 101.0)
+        ff_6 = ForceField(offxml_file_path, simple_xml_ff, cache_dir=cache_dir, allow_cosmetic_attributes=True)
+        assert ff_6.to_string() == ff_5.to_string()
+        assert len(os.listdir(cache_dir)) == n_cache_files + 1
+
     def test_load_two_sources_incompatible_tags(self):
         """Test loading data from two SMIRNOFF data sources which have incompatible physics"""
         # Make an XML forcefield with a modifiedvdW 1-4 scaling factor
@@ -837,6 +912,50 @@ class TestForceField():
                 as excinfo:
             omm_system = forcefield.create_openmm_system(topology)
 
+    def test_parameterize_missing_bonds_multiple_copies(self):
+        """Test that unassigned valence terms are reported once for all the copies of a molecule"""
+        from openforcefield.typing.engines.smirnoff.parameters import UnassignedBondParameterException
+
+        forcefield = ForceField('''
+<SMIRNOFF version="0.3" aromaticity_model="OEAroModel_MDL">
+  <Bonds version="0.3">
+    <Bond smirks="[#6X4:1]-[#6X4:2]" id="b1" k="620.0 * kilocalories_per_mole/angstrom**2" length="1.526 * angstrom"/>
+  </Bonds>
+</SMIRNOFF>
+''')
+        ethanol = create_ethanol()
+        topology = Topology.from_molecules([ethanol, ethanol, ethanol])
+        with pytest.raises(UnassignedBondParameterException,
+                           match='- Topology indices [(]1, 2[)]: '
+                                 'names and elements [(](C\d+)? C[)], [(](O\d+)? O[)],') as excinfo:
+            forcefield.create_openmm_system(topology)
+
+        # Only the bonds of the first copy, except the C-C bond, are listed.
+        unassigned_atom_tuples = excinfo.value.unassigned_topology_atom_tuples
+        assert len(unassigned_atom_tuples) == ethanol.n_bonds - 1
+        for atom_tuple in unassigned_atom_tuples:
+            assert all(atom.topology_atom_index < ethanol.n_atoms for atom in atom_tuple)
+
+    def test_check_valence_terms_missing_from_later_copy(self):
+        """Test that terms missing only from a later copy of a molecule are reported"""
+        from openforcefield.topology import ValenceDict
+        from openforcefield.typing.engines.smirnoff.parameters import BondHandler, UnassignedValenceParameterException
+
+        ethanol = create_ethanol()
+        topology = Topology.from_molecules([ethanol, ethanol])
+        assigned_terms = ValenceDict()
+        for topology_bond in topology.topology_bonds:
+            assigned_terms[[atom.topology_atom_index for atom in topology_bond.atoms]] = None
+        # Drop a bond of the second copy only.
+        missing_term = [atom.topology_atom_index for atom in list(topology.topology_bonds)[-1].atoms]
+        del assigned_terms[missing_term]
+
+        with pytest.raises(UnassignedValenceParameterException, match='all copies of each molecule') as excinfo:
+            BondHandler._check_all_valence_terms_assigned(assigned_terms, topology, 'bonds')
+        unassigned_atom_tuples = excinfo.value.unassigned_topology_atom_tuples
+        assert len(unassigned_atom_tuples) == 1
+        assert sorted(atom.topology_atom_index for atom in unassigned_atom_tuples[0]) == sorted(missing_term)
+
     @pytest.mark.parametrize("toolkit_registry,registry_description", toolkit_registries)
     def test_parameterize_1_cyclohexane_1_ethanol(self, toolkit_registry, registry_description):
         """Test parameterizing a periodic system of two distinct molecules"""
@@ -891,6 +1010,29 @@ class TestForceField():
         # TODO: Add check to ensure system energy is finite
 
 
+    def test_nonbonded_exceptions_reordered_topology(self):
+        """Test that the 1-2, 1-3 and 1-4 exceptions follow the topology atom order of reordered molecules"""
+        from simtk.openmm import app, NonbondedForce
+
+        forcefield = ForceField('test_forcefields/smirnoff99Frosst.offxml')
+        molecules = [create_ethanol()]
+        pdbfile = app.PDBFile(get_data_file_path('systems/test_systems/1_ethanol_reordered.pdb'))
+        topology = Topology.from_openmm(pdbfile.topology, unique_molecules=molecules)
+        omm_system = forcefield.create_openmm_system(topology, charge_from_molecules=molecules)
+        force = [f for f in omm_system.getForces() if type(f) == NonbondedForce][0]
+
+        # Create the exceptions expected from the bonds of the topology.
+        expected_force = NonbondedForce()
+        for particle_index in range(force.getNumParticles()):
+            expected_force.addParticle(*force.getParticleParameters(particle_index))
+        bonds = [tuple(atom.topology_atom_index for atom in bond.atoms) for bond in topology.topology_bonds]
+        expected_force.createExceptionsFromBonds(bonds, 0.83333, forcefield.get_parameter_handler('vdW').scale14)
+
+        assert force.getNumExceptions() == expected_force.getNumExceptions()
+        for exception_index in range(force.getNumExceptions()):
+            assert force.getExceptionParameters(exception_index) == \
+                   expected_force.getExceptionParameters(exception_index)
+
     @pytest.mark.skipif( not(OpenEyeToolkitWrapper.is_available()), reason='Test requires OE toolkit')
     def test_parameterize_ethanol_different_reference_ordering_openeye(self):
         """
@@ -1075,6 +1217,56 @@ class TestForceField():
                 omm_system = forcefield.create_openmm_system(topology)
 
 
+    @pytest.mark.parametrize('has_periodic_box', [True, False])
+    def test_reaction_field_cutoff(self, has_periodic_box):
+        """Test that reaction-field electrostatics use the handlers' cutoff, which must be the same for vdW"""
+        from simtk.openmm import app
+
+        molecules = [create_ethanol()]
+        forcefield = ForceField('test_forcefields/smirnoff99Frosst.offxml')
+        pdbfile = app.PDBFile(get_data_file_path('systems/test_systems/1_ethanol.pdb'))
+        topology = Topology.from_openmm(pdbfile.topology, unique_molecules=molecules)
+        if not has_periodic_box:
+            topology.box_vectors = None
+
+        forcefield.get_parameter_handler('vdW').cutoff = 12.0 * unit.angstrom
+        electrostatics_handler = forcefield.get_parameter_handler('Electrostatics')
+        electrostatics_handler.method = 'reaction-field'
+        electrostatics_handler.cutoff = 10.0 * unit.angstrom
+        with pytest.raises(IncompatibleParameterError, match='equal to the vdW cutoff'):
+            forcefield.create_openmm_system(topology, charge_from_molecules=molecules)
+
+        electrostatics_handler.cutoff = 12.0 * unit.angstrom
+        omm_system = forcefield.create_openmm_system(topology, charge_from_molecules=molecules)
+        nonbonded_force = [f for f in omm_system.getForces() if isinstance(f, openmm.NonbondedForce)][0]
+        assert np.isclose(nonbonded_force.getCutoffDistance() / unit.angstrom, 12.0)
+        if has_periodic_box:
+            assert nonbonded_force.getNonbondedMethod() == openmm.NonbondedForce.CutoffPeriodic
+        else:
+            assert nonbonded_force.getNonbondedMethod() == openmm.NonbondedForce.CutoffNonPeriodic
+
+    @pytest.mark.parametrize('gbsa_model', ['HCT', 'OBC1', 'OBC2'])
+    def test_gbsa_cutoff_nonperiodic(self, gbsa_model):
+        """Test that GBSA forces follow the cutoff of reaction-field electrostatics in nonperiodic systems"""
+        molecules = [create_ethanol()]
+        off_gbsas = {'HCT': 'test_forcefields/GBSA_HCT-1.0.offxml',
+                     'OBC1': 'test_forcefields/GBSA_OBC1-1.0.offxml',
+                     'OBC2': 'test_forcefields/GBSA_OBC2-1.0.offxml'
+                     }
+        forcefield = ForceField('test_forcefields/smirnoff99Frosst.offxml', off_gbsas[gbsa_model])
+        forcefield.get_parameter_handler('Electrostatics').method = 'reaction-field'
+        topology = Topology.from_molecules(molecules)
+
+        omm_system = forcefield.create_openmm_system(topology, charge_from_molecules=molecules)
+        nonbonded_force = [f for f in omm_system.getForces() if isinstance(f, openmm.NonbondedForce)][0]
+        gbsa_force = [f for f in omm_system.getForces()
+                      if isinstance(f, (openmm.GBSAOBCForce, openmm.CustomGBForce))][0]
+        assert nonbonded_force.getNonbondedMethod() == openmm.NonbondedForce.CutoffNonPeriodic
+        # The GBSA force models the solvent, so there is no reaction field dielectric beyond the cutoff
+        assert nonbonded_force.getReactionFieldDielectric() == 1.0
+        assert gbsa_force.getNonbondedMethod() == openmm.CustomGBForce.CutoffNonPeriodic
+        assert gbsa_force.getCutoffDistance() == nonbonded_force.getCutoffDistance()
+
 
 class TestForceFieldChargeAssignment:
     @pytest.mark.parametrize("toolkit_registry,registry_description", toolkit_registries)
@@ -1181,6 +1373,39 @@ class TestForceFieldChargeAssignment:
             q, sigma, epsilon = nonbondedForce.getParticleParameters(particle_index)
             assert q != (0. * unit.elementary_charge)
 
+    @pytest.mark.parametrize("toolkit_registry,registry_description", toolkit_registries)
+    def test_charges_from_many_molecules(self, toolkit_registry, registry_description):
+        """
+        Test that charges are taken from the first isomorphic molecule in a charge_from_molecules list
+        containing unrelated molecules and atom orderings different from the topology
+        """
+        from simtk.openmm import app, NonbondedForce
+
+        ethanol = create_ethanol()
+        cyclohexane = create_cyclohexane()
+        # Same molecule as ethanol with the atom ordering reversed, and different charges which should be ignored
+        reversed_ethanol = create_reversed_ethanol()
+        reversed_ethanol.partial_charges = -1 * ethanol.partial_charges[::-1]
+        charge_mols = [create_acetaldehyde(), create_benzene_no_aromatic(), reversed_ethanol, ethanol]
+
+        file_path = get_data_file_path('test_forcefields/smirnoff99Frosst.offxml')
+        forcefield = ForceField(file_path)
+        pdbfile = app.PDBFile(get_data_file_path('systems/test_systems/1_cyclohexane_1_ethanol.pdb'))
+        topology = Topology.from_openmm(pdbfile.topology, unique_molecules=[ethanol, cyclohexane])
+
+        omm_system = forcefield.create_openmm_system(topology,
+                                                     charge_from_molecules=charge_mols,
+                                                     toolkit_registry=toolkit_registry)
+        nonbondedForce = [f for f in omm_system.getForces() if type(f) == NonbondedForce][0]
+        # The first ethanol atom in the topology is the last atom of reversed_ethanol
+        expected_charges = ((18, 0.4 * unit.elementary_charge),
+                            (19, 0.3 * unit.elementary_charge),
+                            (20, 0.2 * unit.elementary_charge),
+                            )
+        for particle_index, expected_charge in expected_charges:
+            q, sigma, epsilon = nonbondedForce.getParticleParameters(particle_index)
+            assert q == expected_charge
+
     def test_library_charges_to_single_water(self):
         """Test assigning charges to one water molecule using library charges"""
         from simtk.openmm import NonbondedForce
@@ -1363,6 +1588,44 @@ class TestForceFieldChargeAssignment:
             q, sigma, epsilon = nonbondedForce.getParticleParameters(particle_index)
             assert q == expected_charge
 
+    def test_assign_library_charges_to_multiple_copies(self):
+        """Test that library charges matched on a reference molecule are copied to all its reordered instances,
+        and that library charges that cannot match the molecule are skipped."""
+        from simtk.openmm import NonbondedForce
+        ff = ForceField('test_forcefields/smirnoff99Frosst.offxml', xml_ethanol_library_charges_in_parts_ff)
+        library_charge_handler = ff.get_parameter_handler('LibraryCharges')
+        library_charge_handler.add_parameter({'smirks': '[#7:1]-[#1:2]',
+                                              'charge1': -999 * unit.elementary_charge,
+                                              'charge2': -999 * unit.elementary_charge})
+
+        ethanol = Molecule.from_file(get_data_file_path('molecules/ethanol.sdf'))
+        ethanol_reordered = Molecule.from_file(get_data_file_path('molecules/ethanol_reordered.sdf'))
+        top = Topology.from_molecules([ethanol, ethanol_reordered] * 3)
+        assert top.n_reference_molecules == 1
+        omm_system = ff.create_openmm_system(top)
+        nonbondedForce = [f for f in omm_system.getForces() if type(f) == NonbondedForce][0]
+        expected_charges = [-0.2, -0.1, 0.3, 0.08, -0.02, -0.02, -0.02, -0.01, -0.01, -0.2,
+                            0.3, -0.1, 0.08, -0.02, -0.02, -0.02, -0.01, -0.01] * 3 * unit.elementary_charge
+        for particle_index, expected_charge in enumerate(expected_charges):
+            q, sigma, epsilon = nonbondedForce.getParticleParameters(particle_index)
+            assert q == expected_charge
+
+    def test_assign_library_charges_with_connectivity_primitives(self):
+        """Test that library charges whose SMIRKS use D, R and X primitives next to element symbols are applied"""
+        from simtk.openmm import NonbondedForce
+        xml_ff = xml_ethanol_library_charges_ff.replace(
+            '[#1:1]-[#6:2](-[#1:3])(-[#1:4])-[#6:5](-[#1:6])(-[#1:7])-[#8:8]-[#1:9]',
+            '[#1:1]-[CD4:2](-[#1:3])(-[#1:4])-[CX4:5](-[#1:6])(-[#1:7])-[OD2!R:8]-[#1:9]')
+        ff = ForceField('test_forcefields/smirnoff99Frosst.offxml', xml_ff)
+
+        top = Topology.from_molecules([Molecule.from_file(get_data_file_path('molecules/ethanol.sdf'))])
+        omm_system = ff.create_openmm_system(top)
+        nonbondedForce = [f for f in omm_system.getForces() if type(f) == NonbondedForce][0]
+        expected_charges = [-0.2, -0.1, 0.3, 0.08, -0.02, -0.02, -0.02, -0.01, -0.01] * unit.elementary_charge
+        for particle_index, expected_charge in enumerate(expected_charges):
+            q, sigma, epsilon = nonbondedForce.getParticleParameters(particle_index)
+            assert q == expected_charge
+
     def test_assign_charges_using_library_charges_by_single_atoms(self):
         """Test assigning charges to parts of a molecule using per-atom library charges. Note that these LibraryCharge
         SMIRKS will match multiple atoms, so this is also a test of correct usage of the parameter hierarchy.."""
@@ -31,7 +31,7 @@ import numpy as np
 import pytest
 from simtk import unit
 
-from openforcefield.topology.molecule import Molecule, Atom, InvalidConformerError
+from openforcefield.topology.molecule import Molecule, MoleculeArchive, Atom, InvalidConformerError
 from openforcefield.utils import get_data_file_path
 # TODO: Will the ToolkitWrapper allow us to pare that down?
 from openforcefield.utils.toolkits import OpenEyeToolkitWrapper, RDKitToolkitWrapper, AmberToolsToolkitWrapper, ToolkitRegistry
@@ -265,6 +265,44 @@ class TestMolecule:
         molecule_copy = pickle.loads(serialized)
         assert molecule == molecule_copy
 
+    @pytest.mark.parametrize('mmap', [True, False])
+    def test_molecule_archive(self, tmpdir, mmap):
+        """Test writing molecules to a MoleculeArchive and reading them back by index."""
+        ethanol = create_ethanol()
+        ethanol.add_conformers(unit.Quantity(np.random.random((3, ethanol.n_atoms, 3)), unit.angstrom))
+        ethanol.bonds[0].fractional_bond_order = 1.1
+        acetaldehyde = create_acetaldehyde()
+        acetaldehyde.name = 'acetaldehyde'
+        acetaldehyde.partial_charges = unit.Quantity(np.linspace(-0.5, 0.5, acetaldehyde.n_atoms),
+                                                     unit.elementary_charge)
+        molecules = [ethanol, create_cyclohexane(), acetaldehyde, Molecule()]
+
+        file_path = str(tmpdir.join('molecules.offarc'))
+        assert MoleculeArchive.write(file_path, molecules) == 4
+        with MoleculeArchive(file_path, mmap=mmap) as archive:
+            assert len(archive) == 4
+            for molecule, archived_molecule in zip(molecules, archive):
+                assert archived_molecule == molecule
+                assert archived_molecule.to_dict() == molecule.to_dict()
+
+            # Conformers and charges can be read on their own, by negative index too
+            assert archive.get_conformers(0).shape == (3, ethanol.n_atoms, 3)
+            assert archive.get_conformers(1).shape == (0, 18, 3)
+            assert archive.get_partial_charges(1) is None
+            assert (archive.get_partial_charges(-2) == acetaldehyde.partial_charges).all()
+            with pytest.raises(IndexError):
+                archive[4]
+
+            # Molecules read from the archive can be modified without changing the archive
+            archived_ethanol = archive[0]
+            archived_ethanol.conformers[0][0] = [100.0, 100.0, 100.0] * unit.angstrom
+            archived_ethanol.add_conformer(ethanol.conformers[0])
+            assert archived_ethanol.n_conformers == 4
+            assert (archive[0].conformers[0] == ethanol.conformers[0]).all()
+
+        with pytest.raises(ValueError, match='not a molecule archive'):
+            MoleculeArchive(get_data_file_path('molecules/ethanol.sdf'))
+
     # ----------------------------------------------------
     # Test Molecule constructors and conversion utilities.
     # ----------------------------------------------------
@@ -281,6 +319,34 @@ class TestMolecule:
         molecule_copy = Molecule(molecule)
         assert molecule_copy == molecule
 
+    def test_from_arrays(self):
+        """Test creating a molecule from arrays of atom and bond attributes."""
+        ethanol = create_ethanol()
+        molecule = Molecule.from_arrays([atom.atomic_number for atom in ethanol.atoms],
+                                        [atom.formal_charge for atom in ethanol.atoms],
+                                        [atom.is_aromatic for atom in ethanol.atoms],
+                                        None,
+                                        [(bond.atom1_index, bond.atom2_index) for bond in ethanol.bonds],
+                                        [bond.bond_order for bond in ethanol.bonds],
+                                        name='ethanol')
+        assert molecule == ethanol
+        assert molecule.name == 'ethanol'
+        assert molecule.to_dict()['atoms'] == ethanol.to_dict()['atoms']
+        assert molecule.to_dict()['bonds'] == ethanol.to_dict()['bonds']
+        assert molecule.atoms[0].bonds[0] is molecule.bonds[0]
+
+        # Invalid inputs are rejected before any atom is created
+        with pytest.raises(Exception, match='expected formal_charges to have shape'):
+            Molecule.from_arrays([6, 8], [0], [False, False], None, [(0, 1)], [2])
+        with pytest.raises(Exception, match='atom indices outside the range'):
+            Molecule.from_arrays([6, 8], [0, 0], [False, False], None, [(0, 2)], [2])
+        with pytest.raises(Exception, match='between an atom and itself'):
+            Molecule.from_arrays([6, 8], [0, 0], [False, False], None, [(0, 0)], [2])
+        with pytest.raises(Exception, match='repeated bonds'):
+            Molecule.from_arrays([6, 8], [0, 0], [False, False], None, [(0, 1), (1, 0)], [2, 2])
+        with pytest.raises(Exception, match='atom stereochemistry'):
+            Molecule.from_arrays([6, 8], [0, 0], [False, False], ['X', None], [(0, 1)], [2])
+
     @pytest.mark.parametrize('toolkit', [OpenEyeToolkitWrapper, RDKitToolkitWrapper])
     @pytest.mark.parametrize('molecule', mini_drug_bank())
     def test_to_from_smiles(self, molecule, toolkit):
@@ -529,7 +595,7 @@ class TestMolecule:
         # now we want to combine the conformers to one molecule
         butane = molecules[0]
         for mol in molecules[1:]:
-            butane.add_conformer(mol._conformers[0])
+            butane.add_conformer(mol.conformers[0])
 
         # make sure we have the 7 conformers
         assert butane.n_conformers == 7
@@ -776,6 +842,53 @@ class TestMolecule:
         assert mol1.is_isomorphic_with(mol2) is False
         assert mol2.is_isomorphic_with(mol1) is False
 
+    def test_cached_graph_invariants(self):
+        """Test that the cached graph and isomorphism invariants are reused and invalidated on changes"""
+        ethanol = create_ethanol()
+        ethanol_reverse = create_reversed_ethanol()
+        graph = ethanol._get_networkx_graph()
+        invariants = ethanol._get_graph_invariants()
+        assert ethanol._get_networkx_graph() is graph
+        assert invariants == ethanol_reverse._get_graph_invariants()
+        assert ethanol.hill_formula == 'C2H6O'
+        # to_networkx still hands out a private copy
+        assert ethanol.to_networkx() is not graph
+
+        # same Hill formula and degree sequence, different connectivity
+        mol1 = Molecule.from_smiles('Fc1ccc(F)cc1')
+        mol2 = Molecule.from_smiles('Fc1ccccc1F')
+        assert mol1.hill_formula == mol2.hill_formula
+        assert mol1._get_graph_invariants() != mol2._get_graph_invariants()
+
+        # changing the graph invalidates the cache
+        molecule = Molecule(ethanol)
+        molecule._get_graph_invariants()
+        atom = molecule.add_atom(1, 0, False)
+        assert molecule._cached_graph is None
+        assert molecule._get_networkx_graph().number_of_nodes() == ethanol.n_atoms + 1
+        molecule.bonds[0].bond_order = 2
+        assert molecule._cached_graph is None
+
+    def test_hash_without_toolkit(self):
+        """Test that molecules can be hashed without a toolkit, consistently with equality"""
+        ethanol = create_ethanol()
+        ethanol_reverse = create_reversed_ethanol()
+        acetaldehyde = create_acetaldehyde()
+        assert ethanol == ethanol_reverse
+        assert hash(ethanol) == hash(ethanol_reverse)
+        assert hash(ethanol) != hash(acetaldehyde)
+        assert len({ethanol, ethanol_reverse, acetaldehyde}) == 2
+
+        # stereoisomers are not equal and should have different hashes
+        mol1 = Molecule.from_smiles('C[C@H](F)Cl')
+        mol2 = Molecule.from_smiles('C[C@@H](F)Cl')
+        assert mol1 != mol2
+        assert hash(mol1) != hash(mol2)
+
+        # changing the stereochemistry invalidates the cached hash
+        mol2.atoms[1].stereochemistry = mol1.atoms[1].stereochemistry
+        assert hash(mol1) == hash(mol2)
+
     isomorphic_permutations = [{'aromatic_matching': True, 'formal_charge_matching': True, 'bond_order_matching': True,
                                 'atom_stereochemistry_matching': True, 'bond_stereochemistry_matching': True,
                                 'result': False},
@@ -1159,6 +1272,46 @@ class TestMolecule:
             for torsion in common_torsions:
                 assert is_three_memebered_ring_torsion(torsion)
 
+    @pytest.mark.parametrize('smiles', ['CCO', 'C1CC1', 'C1CCC1', 'c1ccccc1O', 'C[N+](C)(C)C', '[Na+].[Cl-]'])
+    def test_valence_term_indices(self, smiles):
+        """Test that the vectorized angles and torsions match an explicit enumeration"""
+        molecule = Molecule.from_smiles(smiles)
+        bonded = {atom.molecule_atom_index: {a.molecule_atom_index for a in atom.bonded_atoms}
+                  for atom in molecule.atoms}
+
+        # Enumerate the terms by explicitly walking the bonds.
+        angles, propers, impropers = set(), set(), set()
+        for i in bonded:
+            for j in bonded[i]:
+                for k in bonded[j] - {i}:
+                    angles.add(min((i, j, k), (k, j, i)))
+                    for l in bonded[k] - {i, j}:
+                        propers.add((i, j, k, l) if i < l else (l, k, j, i))
+                    for l in bonded[j] - {i, k}:
+                        impropers.add((i, j, k, l))
+
+        for name, expected, n_atoms in [('angles', angles, 3), ('propers', propers, 4), ('impropers', impropers, 4)]:
+            indices = molecule._get_valence_term_indices(name)
+            assert indices.shape == (len(expected), n_atoms)
+            assert [tuple(term) for term in indices.tolist()] == sorted(expected)
+            atoms = {tuple(atom.molecule_atom_index for atom in term) for term in getattr(molecule, name)}
+            assert atoms == expected
+            assert getattr(molecule, 'n_' + name) == len(expected)
+
+    def test_valence_terms_invalidated_by_add_bond(self):
+        """Test that angles and torsions are recomputed when a bond is added"""
+        molecule = Molecule()
+        for _ in range(4):
+            molecule.add_atom(6, 0, False)
+        molecule.add_bond(0, 1, 1, False)
+        molecule.add_bond(1, 2, 1, False)
+        assert molecule.n_angles == 1
+        assert molecule.n_propers == 0
+        molecule.add_bond(2, 3, 1, False)
+        assert molecule.n_angles == 2
+        assert molecule.n_propers == 1
+        assert len(molecule.propers) == 1
+
     @pytest.mark.parametrize('molecule', mini_drug_bank())
     def test_total_charge(self, molecule):
         """Test total charge"""
@@ -1261,6 +1414,52 @@ class TestMolecule:
         with pytest.raises(Exception) as excinfo:
             molecule.add_conformer(conf_unitless)
 
+    def test_bulk_conformers(self):
+        """Test adding, setting and retrieving many conformers at once"""
+        molecule = create_ethanol()
+        n_atoms = molecule.n_atoms
+        assert molecule.conformers_array is None
+
+        coordinates = np.arange(5 * n_atoms * 3, dtype=np.float64).reshape(5, n_atoms, 3)
+        molecule.add_conformer(unit.Quantity(coordinates[0], unit.angstrom))
+        molecule.add_conformers(unit.Quantity(coordinates[1:] / 10., unit.nanometer))
+        assert molecule.n_conformers == 5
+        assert np.allclose(molecule.conformers_array.value_in_unit(unit.angstrom), coordinates)
+
+        # Conformers are views into the same storage
+        molecule.conformers[2][0, 0] = -1. * unit.angstrom
+        assert molecule.conformers_array[2, 0, 0] == -1. * unit.angstrom
+
+        # The conformer list can't be modified, since that would not change the molecule
+        with pytest.raises(TypeError):
+            molecule.conformers.append(unit.Quantity(coordinates[0], unit.angstrom))
+        assert molecule.n_conformers == 5
+
+        # Setting conformers copies the input, so molecules don't share their storage
+        molecule.set_conformers(unit.Quantity(coordinates, unit.angstrom))
+        coordinates[0, 0, 0] = 42.
+        assert molecule.conformers[0][0, 0] == 0. * unit.angstrom
+        molecule_2 = create_ethanol()
+        molecule_2.set_conformers(molecule.conformers_array)
+        molecule_2.conformers[0][0, 0] = 99. * unit.angstrom
+        assert molecule.conformers[0][0, 0] == 0. * unit.angstrom
+        coordinates[0, 0, 0] = 0.
+
+        # Round trip through the dict representation
+        molecule_copy = Molecule.from_dict(molecule.to_dict())
+        assert molecule_copy.n_conformers == 5
+        assert np.allclose(molecule_copy.conformers_array.value_in_unit(unit.angstrom), coordinates)
+
+        # Wrong shapes and missing units are rejected
+        with pytest.raises(Exception) as excinfo:
+            molecule.add_conformers(unit.Quantity(coordinates[:, 1:], unit.angstrom))
+        with pytest.raises(Exception) as excinfo:
+            molecule.set_conformers(coordinates)
+
+        molecule.set_conformers(None)
+        assert molecule.n_conformers == 0
+        assert molecule.conformers is None
+
     @pytest.mark.parametrize('molecule', mini_drug_bank())
     def test_add_atoms_and_bonds(self, molecule):
         """Test the creation of a molecule from the addition of atoms and bonds"""
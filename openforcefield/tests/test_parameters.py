@@ -14,6 +14,8 @@ Test classes and function in module openforcefield.typing.engines.smirnoff.param
 # GLOBAL IMPORTS
 #======================================================================
 
+import copy
+
 import pytest
 from simtk import unit
 
@@ -383,6 +385,31 @@ class TestParameterHandler:
         assert 'pilot' not in param_dict
         assert not(bh.attribute_is_cosmetic('pilot'))
 
+    def test_get_parameter(self):
+        """Test ParameterHandler.get_parameter() lookups by SMIRKS, id and other attributes."""
+        from simtk import unit
+        bh = BondHandler(skip_version_check=True)
+        bh.add_parameter({'smirks': '[*:1]-[*:2]', 'id': 'b1',
+                          'length': 1*unit.angstrom,
+                          'k': 10*unit.kilocalorie_per_mole/unit.angstrom**2})
+        bh.add_parameter({'smirks': '[*:1]=[*:2]', 'id': 'b2',
+                          'length': 1*unit.angstrom,
+                          'k': 20*unit.kilocalorie_per_mole/unit.angstrom**2})
+
+        assert bh.get_parameter({'smirks': '[*:1]-[*:2]'}) == [bh.parameters[0]]
+        assert bh.get_parameter({'id': 'b2'}) == [bh.parameters[1]]
+        assert bh.get_parameter({'smirks': '[*:1]=[*:2]', 'id': 'b2'}) == [bh.parameters[1]]
+        assert bh.get_parameter({'smirks': '[*:1]=[*:2]', 'id': 'b1'}) == []
+        assert bh.get_parameter({'length': 1*unit.angstrom}) == list(bh.parameters)
+        assert bh.get_parameter({'id': 'b3'}) == []
+
+        # Lookups reflect changes of the ids.
+        bh.parameters[1].id = 'b3'
+        assert bh.get_parameter({'id': 'b2'}) == []
+        assert bh.get_parameter({'id': 'b3'}) == [bh.parameters[1]]
+        bh.parameters[1].id = None
+        assert bh.get_parameter({'id': 'b3'}) == []
+
 
 class TestParameterList:
     """Test capabilities of ParameterList for accessing and manipulating SMIRNOFF parameter definitions.
@@ -564,6 +591,59 @@ class TestParameterList:
             parameter_list_2.append(new_parameter)
         assert parameter_list.to_list() == parameter_list_2.to_list()
 
+    def test_smirks_index(self):
+        """Test that SMIRKS lookups stay consistent when the list or the parameters are modified."""
+        import pickle
+        p1 = ParameterType(smirks='[*:1]')
+        p2 = ParameterType(smirks='[#1:1]')
+        p3 = ParameterType(smirks='[#7:1]')
+        parameters = ParameterList([p1, p2])
+        assert parameters.index('[#1:1]') == 1
+
+        # Changing the SMIRKS of a parameter updates the lookups.
+        p2.smirks = '[#6:1]'
+        assert '[#1:1]' not in parameters
+        assert parameters['[#6:1]'] is p2
+
+        parameters.insert(0, p3)
+        assert parameters.index('[#6:1]') == 2
+        assert parameters.index('[#7:1]') == 0
+        del parameters['[#7:1]']
+        assert parameters.index('[#6:1]') == 1
+        parameters.reverse()
+        assert parameters.index('[#6:1]') == 0
+        parameters[0] = p3
+        assert '[#6:1]' not in parameters
+        assert parameters.index('[#7:1]') == 0
+        parameters.pop(0)
+        assert '[#7:1]' not in parameters
+        parameters += [p2, p3]
+        assert parameters.index('[#7:1]') == 2
+
+        # Duplicate SMIRKS resolve to the first parameter.
+        parameters.append(ParameterType(smirks='[*:1]'))
+        assert parameters.index('[*:1]') == 0
+
+        # The lookups of pickled copies are consistent.
+        parameters_copy = pickle.loads(pickle.dumps(parameters))
+        assert [p.smirks for p in parameters_copy] == [p.smirks for p in parameters]
+        assert parameters_copy.index('[#7:1]') == 2
+        parameters_copy[2].smirks = '[#8:1]'
+        assert parameters_copy.index('[#8:1]') == 2
+        assert parameters.index('[#7:1]') == 2
+
+        # Modifying a parameter updates the index of the lists containing it
+        # in place, and leaves the index of the other lists untouched.
+        p4 = ParameterType(smirks='[#9:1]')
+        first_parameters = ParameterList([ParameterType(smirks='[#17:1]'), p4])
+        second_parameters = ParameterList([ParameterType(smirks='[#35:1]')])
+        assert first_parameters.index('[#9:1]') == 1
+        assert second_parameters.index('[#35:1]') == 0
+        p4.smirks = '[#53:1]'
+        assert first_parameters._is_index_valid() and second_parameters._is_index_valid()
+        assert '[#9:1]' not in first_parameters
+        assert first_parameters.index('[#53:1]') == 1
+
 
 class TestParameterType:
 
@@ -613,6 +693,56 @@ class TestParameterType:
         parameter_attributes = MyParameter._get_optional_parameter_attributes()
         assert list(parameter_attributes.keys()) == expected_names
 
+    def test_attribute_metadata_cache(self):
+        """The ParameterAttributes are cached separately for each class."""
+        class MyParameter(ParameterType):
+            attr = ParameterAttribute()
+
+        class MyChildParameter(MyParameter):
+            indexed = IndexedParameterAttribute()
+
+        assert list(MyParameter._get_parameter_attributes()) == ['smirks', 'id', 'parent_id', 'attr']
+        assert list(MyChildParameter._get_parameter_attributes()) == ['smirks', 'id', 'parent_id', 'attr', 'indexed']
+        assert MyParameter._get_attribute_metadata() is MyParameter._get_attribute_metadata()
+        assert list(MyParameter._get_indexed_parameter_attributes()) == []
+        assert list(MyChildParameter._get_indexed_parameter_attributes()) == ['indexed']
+
+        # Modifying the returned dicts doesn't affect the cache.
+        MyParameter._get_required_parameter_attributes().clear()
+        assert list(MyParameter._get_required_parameter_attributes()) == ['smirks', 'attr']
+
+    def test_from_trusted_dicts(self):
+        """ParameterType._from_trusted_dicts() creates the same parameters as the constructor."""
+        from openforcefield.typing.engines.smirnoff import vdWHandler
+
+        torsion_dicts = [
+            {'smirks': '[*:1]-[*:2]-[*:3]-[*:4]', 'id': 't1',
+             'periodicity1': '2', 'phase1': 0 * unit.degree, 'k1': 1 * unit.kilocalorie_per_mole,
+             'periodicity2': 3, 'phase2': 180 * unit.degree, 'k2': '2 * kilocalorie_per_mole',
+             'idivf1': 1, 'idivf2': 1, 'pilot': 'alice'},
+        ]
+        expected = [ProperTorsionHandler.ProperTorsionType(**d, allow_cosmetic_attributes=True)
+                    for d in torsion_dicts]
+        parameters = ProperTorsionHandler.ProperTorsionType._from_trusted_dicts(
+            copy.deepcopy(torsion_dicts), allow_cosmetic_attributes=True)
+        assert [p.to_dict() for p in parameters] == [p.to_dict() for p in expected]
+        assert parameters[0].periodicity == [2, 3]
+        assert parameters[0].attribute_is_cosmetic('pilot')
+
+        # Values are still validated.
+        with pytest.raises(IncompatibleUnitError):
+            ProperTorsionHandler.ProperTorsionType._from_trusted_dicts(
+                [{'smirks': '[*:1]-[*:2]-[*:3]-[*:4]', 'periodicity1': 2, 'phase1': 0 * unit.angstrom,
+                  'k1': 1 * unit.kilocalorie_per_mole, 'idivf1': 1}])
+        with pytest.raises(SMIRNOFFSpecError, match="require the following missing parameters"):
+            ProperTorsionHandler.ProperTorsionType._from_trusted_dicts([{'smirks': '[*:1]-[*:2]-[*:3]-[*:4]'}])
+        with pytest.raises(SMIRNOFFSpecError, match="Unexpected kwarg"):
+            ProperTorsionHandler.ProperTorsionType._from_trusted_dicts(copy.deepcopy(torsion_dicts))
+
+        # Parameter types with a custom constructor go through it.
+        with pytest.raises(SMIRNOFFSpecError, match="Either sigma or rmin_half must be specified"):
+            vdWHandler.vdWType._from_trusted_dicts([{'smirks': '[*:1]', 'epsilon': 1 * unit.kilocalorie_per_mole}])
+
     def test_required_attribute_on_init(self):
         """ParameterType raises TypeError if a required attribute is not specified on construction."""
         class MyParameter(ParameterType):
@@ -967,6 +1097,28 @@ class TestLibraryChargeHandler:
         """Test creation of an empty LibraryChargeHandler"""
         handler = LibraryChargeHandler(skip_version_check=True)
 
+    @pytest.mark.parametrize(('smirks', 'expected_composition'), [
+        ('[#1:1]-[#8X2H2+0:2]-[#1:3]', (((1, 2), (8, 1)), 3, 2)),
+        ('[NX3:1]([#1:2])([#6])[#6H1:3]=[#8:4]', (((1, 1), (6, 2), (7, 1), (8, 1)), 5, 4)),
+        ('[Cl-:1]', (((17, 1),), 1, 0)),
+        ('[CD3:1]', (((6, 1),), 1, 0)),
+        ('[ND2:1]-[CR:2]', (((6, 1), (7, 1)), 2, 1)),
+        ('[SR:1]', (((16, 1),), 1, 0)),
+        ('[Ch1:1]', (((6, 1),), 1, 0)),
+        ('[se:1]', (((34, 1),), 1, 0)),
+        ('[as:1]', (((33, 1),), 1, 0)),
+        ('[si:1]', ((), 1, 0)),
+        ('[cr5:1]:[se:2]', (((6, 1), (34, 1)), 2, 1)),
+        ('[#6:1]1:c:c:c:c:c1', (((6, 6),), 6, 6)),
+        ('[#6,#7:1]-[*:2]', ((), 2, 1)),
+        ('[#6$(*-[#8]):1]', None),
+        ('[Na+:1].[Cl-:2]', None),
+    ])
+    def test_smirks_composition(self, smirks, expected_composition):
+        """Test the element composition and bond count used to index library charges"""
+        from openforcefield.typing.engines.smirnoff.parameters import _get_smirks_composition
+        assert _get_smirks_composition(smirks) == expected_composition
+
 class TestGBSAHandler:
     def test_create_default_gbsahandler(self):
         """Test creation of an empty GBSAHandler, with all default attributes"""
@@ -216,7 +216,7 @@ class TestOpenEyeToolkitWrapper:
             assert atom1.to_dict() == atom2.to_dict()
         for bond1, bond2 in zip(molecule.bonds, molecule2.bonds):
             assert bond1.to_dict() == bond2.to_dict()
-        assert (molecule._conformers[0] == molecule2._conformers[0]).all()
+        assert (molecule.conformers[0] == molecule2.conformers[0]).all()
         for pc1, pc2 in zip(molecule._partial_charges, molecule2._partial_charges):
             pc1_ul = pc1 / unit.elementary_charge
             pc2_ul = pc2 / unit.elementary_charge
@@ -260,8 +260,8 @@ class TestOpenEyeToolkitWrapper:
             assert atom1.to_dict() == atom2.to_dict()
         for bond1, bond2 in zip(molecule.bonds, molecule2.bonds):
             assert bond1.to_dict() == bond2.to_dict()
-        assert (molecule._conformers == None)
-        assert (molecule2._conformers == None)
+        assert (molecule.conformers == None)
+        assert (molecule2.conformers == None)
         for pc1, pc2 in zip(molecule._partial_charges, molecule2._partial_charges):
             pc1_ul = pc1 / unit.elementary_charge
             pc2_ul = pc2 / unit.elementary_charge
@@ -385,8 +385,8 @@ class TestOpenEyeToolkitWrapper:
         toolkit_wrapper = OpenEyeToolkitWrapper()
         filename = get_data_file_path('molecules/toluene.sdf')
         molecule = Molecule.from_file(filename, toolkit_registry=toolkit_wrapper)
-        assert len(molecule._conformers) == 1
-        assert molecule._conformers[0].shape == (15,3)
+        assert len(molecule.conformers) == 1
+        assert molecule.conformers[0].shape == (15,3)
 
     @pytest.mark.skipif(not OpenEyeToolkitWrapper.is_available(), reason='OpenEye Toolkit not available')
     @pytest.mark.skip
@@ -396,8 +396,8 @@ class TestOpenEyeToolkitWrapper:
         toolkit_wrapper = OpenEyeToolkitWrapper()
         filename = get_data_file_path('molecules/toluene.sdf')
         molecule = Molecule.from_file(filename, toolkit_registry=toolkit_wrapper)
-        assert len(molecule._conformers) == 1
-        assert molecule._conformers[0].shape == (15,3)
+        assert len(molecule.conformers) == 1
+        assert molecule.conformers[0].shape == (15,3)
 
     @pytest.mark.skipif(not OpenEyeToolkitWrapper.is_available(), reason='OpenEye Toolkit not available')
     def test_get_mol2_coordinates(self):
@@ -405,16 +405,16 @@ class TestOpenEyeToolkitWrapper:
         toolkit_wrapper = OpenEyeToolkitWrapper()
         filename = get_data_file_path('molecules/toluene.mol2')
         molecule1 = Molecule.from_file(filename, toolkit_registry=toolkit_wrapper)
-        assert len(molecule1._conformers) == 1
-        assert molecule1._conformers[0].shape == (15, 3)
+        assert len(molecule1.conformers) == 1
+        assert molecule1.conformers[0].shape == (15, 3)
         assert_almost_equal(molecule1.conformers[0][5][1] / unit.angstrom, 22.98, decimal=2)
 
         # Test loading from file-like object
         with open(filename, 'r') as infile:
             molecule2 = Molecule(infile, file_format='MOL2', toolkit_registry=toolkit_wrapper)
         assert molecule1.is_isomorphic_with(molecule2)
-        assert len(molecule2._conformers) == 1
-        assert molecule2._conformers[0].shape == (15, 3)
+        assert len(molecule2.conformers) == 1
+        assert molecule2.conformers[0].shape == (15, 3)
         assert_almost_equal(molecule2.conformers[0][5][1] / unit.angstrom, 22.98, decimal=2)
 
         # Test loading from gzipped mol2
@@ -422,8 +422,8 @@ class TestOpenEyeToolkitWrapper:
         with gzip.GzipFile(filename + '.gz', 'r') as infile:
             molecule3 = Molecule(infile, file_format='MOL2', toolkit_registry=toolkit_wrapper)
         assert molecule1.is_isomorphic_with(molecule3)
-        assert len(molecule3._conformers) == 1
-        assert molecule3._conformers[0].shape == (15, 3)
+        assert len(molecule3.conformers) == 1
+        assert molecule3.conformers[0].shape == (15, 3)
         assert_almost_equal(molecule3.conformers[0][5][1] / unit.angstrom, 22.98, decimal=2)
 
     @pytest.mark.skipif(not OpenEyeToolkitWrapper.is_available(), reason='OpenEye Toolkit not available')
@@ -432,8 +432,8 @@ class TestOpenEyeToolkitWrapper:
         toolkit_wrapper = OpenEyeToolkitWrapper()
         filename = get_data_file_path('molecules/toluene_charged.mol2')
         molecule = Molecule.from_file(filename, toolkit_registry=toolkit_wrapper)
-        assert len(molecule._conformers) == 1
-        assert molecule._conformers[0].shape == (15,3)
+        assert len(molecule.conformers) == 1
+        assert molecule.conformers[0].shape == (15,3)
         target_charges = unit.Quantity(np.array([-0.1342,-0.1271,-0.1271,-0.1310,
                                                  -0.1310,-0.0765,-0.0541, 0.1314,
                                                   0.1286, 0.1286, 0.1303, 0.1303,
@@ -1005,7 +1005,7 @@ class TestRDKitToolkitWrapper:
             assert atom1.to_dict() == atom2.to_dict()
         for bond1, bond2 in zip(molecule.bonds, molecule2.bonds):
             assert bond1.to_dict() == bond2.to_dict()
-        assert (molecule._conformers[0] == molecule2._conformers[0]).all()
+        assert (molecule.conformers[0] == molecule2.conformers[0]).all()
         for pc1, pc2 in zip(molecule._partial_charges, molecule2._partial_charges):
             pc1_ul = pc1 / unit.elementary_charge
             pc2_ul = pc2 / unit.elementary_charge
@@ -1048,8 +1048,8 @@ class TestRDKitToolkitWrapper:
             assert atom1.to_dict() == atom2.to_dict()
         for bond1, bond2 in zip(molecule.bonds, molecule2.bonds):
             assert bond1.to_dict() == bond2.to_dict()
-        assert (molecule._conformers == None)
-        assert (molecule2._conformers == None)
+        assert (molecule.conformers == None)
+        assert (molecule2.conformers == None)
         for pc1, pc2 in zip(molecule._partial_charges, molecule2._partial_charges):
             pc1_ul = pc1 / unit.elementary_charge
             pc2_ul = pc2 / unit.elementary_charge
@@ -1062,10 +1062,285 @@ class TestRDKitToolkitWrapper:
         toolkit_wrapper = RDKitToolkitWrapper()
         filename = get_data_file_path('molecules/toluene.sdf')
         molecule = Molecule.from_file(filename, toolkit_registry=toolkit_wrapper)
-        assert len(molecule._conformers) == 1
-        assert molecule._conformers[0].shape == (15, 3)
+        assert len(molecule.conformers) == 1
+        assert molecule.conformers[0].shape == (15, 3)
         assert_almost_equal(molecule.conformers[0][5][1] / unit.angstrom, 2.0104, decimal=4)
 
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    @pytest.mark.parametrize('compression', ['', '.gz', '.bz2'])
+    def test_iter_file(self, tmpdir, compression):
+        """Test RDKitToolkitWrapper for lazily reading records of compressed and uncompressed sdf and smi files"""
+        import bz2
+        import gzip
+        from openforcefield.utils.toolkits import _open_file
+        toolkit_wrapper = RDKitToolkitWrapper()
+        openers = {'': open, '.gz': gzip.open, '.bz2': bz2.open}
+
+        sdf_data = open(get_data_file_path('molecules/MiniDrugBank.sdf')).read()
+        sdf_file_path = str(tmpdir.join('MiniDrugBank.sdf' + compression))
+        with openers[compression](sdf_file_path, 'wt') as file_obj:
+            file_obj.write(sdf_data)
+        expected_molecules = toolkit_wrapper.from_file(get_data_file_path('molecules/MiniDrugBank.sdf'), 'SDF',
+                                                       allow_undefined_stereo=True)
+        records = list(toolkit_wrapper.iter_file(sdf_file_path, 'SDF', allow_undefined_stereo=True))
+        molecules = [molecule for _, molecule, error in records if error is None]
+        assert [molecule.name for molecule in molecules] == [molecule.name for molecule in expected_molecules]
+        # Records which fail sanitization are reported with their index
+        failed_records = [(record_index, error) for record_index, molecule, error in records if error is not None]
+        assert len(failed_records) == len(records) - len(expected_molecules)
+
+        # Only the requested records are read
+        shard = list(toolkit_wrapper.iter_file(sdf_file_path, 'SDF', allow_undefined_stereo=True, start=5, stop=8))
+        assert [record_index for record_index, _, _ in shard] == [5, 6, 7]
+        assert [molecule.name for _, molecule, _ in shard] == [molecule.name for _, molecule, _ in records[5:8]]
+
+        smi_file_path = str(tmpdir.join('molecules.smi' + compression))
+        with _open_file(smi_file_path, 'wt') as file_obj:
+            file_obj.write('CCO ethanol\n\nc1ccccc1 benzene\nC1CC1(C\nCC\n')
+        records = list(toolkit_wrapper.iter_file(smi_file_path, 'SMI', start=1))
+        assert [record_index for record_index, _, _ in records] == [1, 2, 3]
+        assert records[0][1].name == 'benzene'
+        assert records[0][1].n_atoms == 12
+        assert records[1][1] is None and isinstance(records[1][2], ValueError)
+        assert records[2][1].n_atoms == 8
+
+        # Molecules with undefined stereochemistry are reported without ending the stream
+        with _open_file(smi_file_path, 'wt') as file_obj:
+            file_obj.write('CCO\nCC(F)Cl\nCC\n')
+        records = list(toolkit_wrapper.iter_file(smi_file_path, 'SMI'))
+        assert [record_index for record_index, _, _ in records] == [0, 1, 2]
+        assert records[1][1] is None and isinstance(records[1][2], UndefinedStereochemistryError)
+        assert records[2][1].n_atoms == 8
+        with pytest.raises(UndefinedStereochemistryError):
+            toolkit_wrapper.from_file(smi_file_path, 'SMI')
+
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    def test_from_file_raises_conversion_errors(self, tmpdir, monkeypatch):
+        """Test that RDKitToolkitWrapper.from_file skips unparsable records but raises conversion errors"""
+        toolkit_wrapper = RDKitToolkitWrapper()
+        smi_file_path = str(tmpdir.join('molecules.smi'))
+        with open(smi_file_path, 'w') as file_obj:
+            file_obj.write('CCO\nC1CC1(C\nCC\n')
+        assert [molecule.n_atoms for molecule in toolkit_wrapper.from_file(smi_file_path, 'SMI')] == [9, 8]
+
+        uncached_from_rdkit = RDKitToolkitWrapper.from_rdkit
+        def from_rdkit(self, rdmol, *args, **kwargs):
+            if rdmol.GetNumAtoms() == 8:
+                raise RuntimeError('Can not convert ethane')
+            return uncached_from_rdkit(self, rdmol, *args, **kwargs)
+        monkeypatch.setattr(RDKitToolkitWrapper, 'from_rdkit', from_rdkit)
+
+        with pytest.raises(RuntimeError, match='Can not convert ethane'):
+            toolkit_wrapper.from_file(smi_file_path, 'SMI')
+        # Streaming reports the error and continues
+        records = list(toolkit_wrapper.iter_file(smi_file_path, 'SMI'))
+        assert isinstance(records[2][2], RuntimeError)
+
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    def test_from_file_parallel(self, tmpdir):
+        """Test RDKitToolkitWrapper for reading sdf and smi files with a pool of processes"""
+        import os
+        toolkit_wrapper = RDKitToolkitWrapper()
+        sdf_file_path = get_data_file_path('molecules/MiniDrugBank.sdf')
+        index_path = str(tmpdir.join('MiniDrugBank.sdf.index'))
+        expected_molecules = toolkit_wrapper.from_file(sdf_file_path, 'SDF', allow_undefined_stereo=True)
+
+        errors = list()
+        molecules = toolkit_wrapper.from_file_parallel(sdf_file_path, 'SDF', allow_undefined_stereo=True,
+                                                       n_workers=2, index_path=index_path, errors=errors)
+        assert [molecule.name for molecule in molecules] == [molecule.name for molecule in expected_molecules]
+        assert all(molecule == expected for molecule, expected in zip(molecules, expected_molecules))
+        assert len(errors) > 0
+        assert all(isinstance(error, ValueError) for _, error in errors)
+        assert os.path.exists(index_path)
+
+        # The saved index is reused, and molecules can be returned in their serialized form
+        molecule_dicts = toolkit_wrapper.from_file_parallel(sdf_file_path, 'SDF', allow_undefined_stereo=True,
+                                                            n_workers=2, index_path=index_path, serialize=True)
+        assert Molecule.from_dict(molecule_dicts[-1]) == expected_molecules[-1]
+
+        smi_file_path = str(tmpdir.join('molecules.smi'))
+        with open(smi_file_path, 'w') as file_obj:
+            file_obj.write('CCO ethanol\n\nc1ccccc1 benzene\n  C1CC1(C\nCC\n')
+        errors = list()
+        molecules = toolkit_wrapper.from_file_parallel(smi_file_path, 'SMI', n_workers=2, errors=errors)
+        assert [molecule.n_atoms for molecule in molecules] == [9, 12, 8]
+        assert [record_index for record_index, _ in errors] == [2]
+
+        # Exceptions raised in the workers reach the caller
+        with open(smi_file_path, 'a') as file_obj:
+            file_obj.write('CC(F)Cl\n')
+        with pytest.raises(UndefinedStereochemistryError):
+            toolkit_wrapper.from_file(smi_file_path, 'SMI', n_workers=2)
+
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    @pytest.mark.parametrize('file_name', ['molecules.sdf', 'molecules.sdf.gz', 'molecules.smi.bz2'])
+    def test_molecule_writer(self, tmpdir, file_name):
+        """Test writing many molecules and their conformers to one file with MoleculeWriter using the RDKit"""
+        from openforcefield.topology import MoleculeWriter
+        toolkit_wrapper = RDKitToolkitWrapper()
+        ethanol = create_ethanol()
+        ethanol.add_conformers(unit.Quantity(np.random.random((3, ethanol.n_atoms, 3)), unit.angstrom))
+        molecules = [ethanol, create_cyclohexane(), create_acetaldehyde()]
+
+        file_path = str(tmpdir.join(file_name))
+        with MoleculeWriter(file_path, toolkit_registry=toolkit_wrapper) as writer:
+            for molecule in molecules:
+                writer.write(molecule)
+        assert writer.n_molecules == 3
+        with pytest.raises(ValueError, match='closed MoleculeWriter'):
+            writer.write(ethanol)
+
+        molecules_read = list(Molecule.iter_file(file_path, toolkit_registry=toolkit_wrapper))
+        if file_name.startswith('molecules.sdf'):
+            # Each conformer is written as a separate record
+            expected_molecules = [ethanol] * 3 + molecules[1:]
+            assert_almost_equal(molecules_read[1].conformers[0] / unit.angstrom,
+                                ethanol.conformers[1] / unit.angstrom, decimal=4)
+        else:
+            expected_molecules = molecules
+        assert molecules_read == expected_molecules
+
+    @pytest.mark.skipif(not OpenEyeToolkitWrapper.is_available(), reason='OpenEye Toolkit not available')
+    @pytest.mark.parametrize('file_name', ['molecules.sdf', 'molecules.mol2'])
+    def test_molecule_writer_openeye(self, tmpdir, file_name):
+        """Test writing many molecules to one file with MoleculeWriter through one OpenEye output stream"""
+        from openforcefield.topology import MoleculeWriter
+        toolkit_wrapper = OpenEyeToolkitWrapper()
+        molecules = [create_ethanol(), create_cyclohexane(), create_acetaldehyde()]
+        for molecule in molecules:
+            molecule.generate_conformers(n_conformers=1, toolkit_registry=toolkit_wrapper)
+
+        file_path = str(tmpdir.join(file_name))
+        with MoleculeWriter(file_path, toolkit_registry=toolkit_wrapper) as writer:
+            for molecule in molecules:
+                writer.write(molecule)
+        molecules_read = list(Molecule.iter_file(file_path, toolkit_registry=toolkit_wrapper))
+        assert [molecule.to_smiles() for molecule in molecules_read] == [molecule.to_smiles() for molecule in molecules]
+
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    def test_molecule_writer_closes_file_on_error(self, tmpdir, monkeypatch):
+        """Test that MoleculeWriter closes the file it opened if the toolkit writer can't be opened"""
+        import openforcefield.topology.molecule
+        from openforcefield.topology import MoleculeWriter
+
+        opened_files = []
+        def open_file(*args, **kwargs):
+            opened_files.append(open(*args, **kwargs))
+            return opened_files[-1]
+
+        def open_molecule_writer(*args, **kwargs):
+            raise ValueError('Can not write')
+
+        monkeypatch.setattr(openforcefield.topology.molecule, '_open_file', open_file)
+        monkeypatch.setattr(RDKitToolkitWrapper, '_open_molecule_writer', open_molecule_writer)
+        with pytest.raises(ValueError, match='Can not write'):
+            MoleculeWriter(str(tmpdir.join('molecules.sdf')), toolkit_registry=RDKitToolkitWrapper())
+        assert len(opened_files) == 1
+        assert opened_files[0].closed
+
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    @pytest.mark.parametrize('n_workers', [1, 2])
+    def test_smiles_and_inchi_batch(self, n_workers):
+        """Test converting batches of SMILES and InChI in order, collecting the errors of each item"""
+        toolkit_wrapper = RDKitToolkitWrapper()
+        # Large enough to be split across the worker processes
+        smiles = ['CCO', 'c1ccccc1', 'C1CC', 'C(F)(Cl)Br'] * 40
+
+        errors = []
+        molecules = Molecule.from_smiles_batch(smiles, toolkit_registry=toolkit_wrapper,
+                                               n_workers=n_workers, errors=errors)
+        assert len(molecules) == len(smiles)
+        assert [index for index, _ in errors] == [index for index in range(len(smiles)) if index % 4 >= 2]
+        assert isinstance(errors[1][1], UndefinedStereochemistryError)
+        assert all(molecule is None for molecule in molecules[2::4])
+        assert molecules[0] == create_ethanol()
+
+        valid_molecules = [molecule for molecule in molecules if molecule is not None]
+        expected_smiles = [molecule.to_smiles(toolkit_registry=toolkit_wrapper) for molecule in valid_molecules]
+        assert Molecule.to_smiles_batch(valid_molecules, toolkit_registry=toolkit_wrapper,
+                                        n_workers=n_workers) == expected_smiles
+
+        inchis = Molecule.to_inchi_batch(valid_molecules, toolkit_registry=toolkit_wrapper, n_workers=n_workers)
+        assert inchis == [molecule.to_inchi(toolkit_registry=toolkit_wrapper) for molecule in valid_molecules]
+        inchi_keys = Molecule.to_inchikey_batch(valid_molecules, toolkit_registry=toolkit_wrapper,
+                                                n_workers=n_workers)
+        assert inchi_keys[:2] == ['LFQSCWFLJHTTHZ-UHFFFAOYSA-N', 'UHOVQNZJYSORNB-UHFFFAOYSA-N']
+
+        errors = []
+        molecules_from_inchi = Molecule.from_inchi_batch(inchis + ['InChI=1S/garbage'], toolkit_registry=toolkit_wrapper,
+                                                         n_workers=n_workers, errors=errors)
+        assert [index for index, _ in errors] == [len(inchis)]
+        assert molecules_from_inchi[:-1] == valid_molecules
+
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    def test_smiles_batch_resolves_toolkit_once(self):
+        """Test that batch conversions use the first toolkit providing the method, through the molecule methods"""
+        from_smiles_calls = []
+
+        class EthanolFailingToolkitWrapper(RDKitToolkitWrapper):
+            def from_smiles(self, smiles, hydrogens_are_explicit=False, allow_undefined_stereo=False):
+                from_smiles_calls.append(smiles)
+                if smiles == 'CCO':
+                    raise ValueError('Can not parse ethanol')
+                return super().from_smiles(smiles, hydrogens_are_explicit=hydrogens_are_explicit,
+                                           allow_undefined_stereo=allow_undefined_stereo)
+
+        toolkit_registry = ToolkitRegistry(toolkit_precedence=[EthanolFailingToolkitWrapper, RDKitToolkitWrapper])
+        errors = []
+        molecules = Molecule.from_smiles_batch(['c1ccccc1', 'CCO', 'C'], toolkit_registry=toolkit_registry,
+                                               errors=errors)
+        # Each item is converted once, and the error of the failed item is recorded
+        assert from_smiles_calls == ['c1ccccc1', 'CCO', 'C']
+        assert [index for index, _ in errors] == [1]
+        assert isinstance(errors[0][1], ValueError)
+        assert molecules[1] is None
+
+        # The SMILES are cached on the molecules, as by Molecule.to_smiles
+        valid_molecules = [molecules[0], molecules[2]]
+        smiles = Molecule.to_smiles_batch(valid_molecules, toolkit_registry=toolkit_registry)
+        assert all(len(molecule._cached_smiles) == 1 for molecule in valid_molecules)
+        assert smiles == [molecule.to_smiles(toolkit_registry=toolkit_registry) for molecule in valid_molecules]
+
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    def test_from_smiles_cache(self, monkeypatch):
+        """Test that the from_smiles cache returns independent copies without calling the toolkit again"""
+        toolkit_wrapper = RDKitToolkitWrapper()
+        toolkit_calls = []
+        uncached_from_smiles = RDKitToolkitWrapper.from_smiles
+
+        def counting_from_smiles(self, smiles, *args, **kwargs):
+            toolkit_calls.append(smiles)
+            return uncached_from_smiles(self, smiles, *args, **kwargs)
+        monkeypatch.setattr(RDKitToolkitWrapper, 'from_smiles', counting_from_smiles)
+
+        Molecule.set_from_smiles_cache_size(2)
+        try:
+            water = Molecule.from_smiles('O', toolkit_registry=toolkit_wrapper)
+            water.name = 'modified water'
+            water_copy = Molecule.from_smiles('O', toolkit_registry=toolkit_wrapper)
+            assert toolkit_calls == ['O']
+            assert water_copy is not water
+            assert water_copy == water
+            assert water_copy.name == ''
+
+            # Each combination of arguments is cached separately
+            Molecule.from_smiles('O', toolkit_registry=toolkit_wrapper, allow_undefined_stereo=True)
+            assert toolkit_calls == ['O', 'O']
+
+            # The least recently used molecule is dropped when the cache is full
+            Molecule.from_smiles('O', toolkit_registry=toolkit_wrapper)
+            Molecule.from_smiles('[Na+]', toolkit_registry=toolkit_wrapper)
+            Molecule.from_smiles('O', toolkit_registry=toolkit_wrapper)
+            Molecule.from_smiles('O', toolkit_registry=toolkit_wrapper, allow_undefined_stereo=True)
+            assert toolkit_calls == ['O', 'O', '[Na+]', 'O']
+
+            Molecule.set_from_smiles_cache_size(0)
+            Molecule.from_smiles('O', toolkit_registry=toolkit_wrapper)
+            assert toolkit_calls == ['O', 'O', '[Na+]', 'O', 'O']
+        finally:
+            Molecule.set_from_smiles_cache_size(0)
+
     # Find a multiconformer SDF file
     @pytest.mark.skip
     #@pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
@@ -1075,8 +1350,8 @@ class TestRDKitToolkitWrapper:
         toolkit_wrapper = RDKitToolkitWrapper()
         filename = get_data_file_path('molecules/toluene.sdf')
         molecule = Molecule.from_file(filename, toolkit_registry=toolkit_wrapper)
-        assert len(molecule._conformers) == 1
-        assert molecule._conformers[0].shape == (15,3)
+        assert len(molecule.conformers) == 1
+        assert molecule.conformers[0].shape == (15,3)
 
     # Unskip this when we implement PDB-reading support for RDKitToolkitWrapper
     @pytest.mark.skip
@@ -1086,8 +1361,8 @@ class TestRDKitToolkitWrapper:
         toolkit_wrapper = RDKitToolkitWrapper()
         filename = get_data_file_path('molecules/toluene.pdb')
         molecule = Molecule.from_file(filename, toolkit_registry=toolkit_wrapper)
-        assert len(molecule._conformers) == 1
-        assert molecule._conformers[0].shape == (15,3)
+        assert len(molecule.conformers) == 1
+        assert molecule.conformers[0].shape == (15,3)
 
     # Unskip this when we implement PDB-reading support for RDKitToolkitWrapper
     @pytest.mark.skip
@@ -1097,8 +1372,8 @@ class TestRDKitToolkitWrapper:
         toolkit_wrapper = RDKitToolkitWrapper()
         filename = get_data_file_path('molecules/toluene.pdb')
         molecule = Molecule.from_file(filename, toolkit_registry=toolkit_wrapper)
-        assert len(molecule._conformers) == 1
-        assert molecule._conformers[0].shape == (15,3)
+        assert len(molecule.conformers) == 1
+        assert molecule.conformers[0].shape == (15,3)
 
     @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
     def test_generate_conformers(self):
@@ -1475,3 +1750,99 @@ class TestToolkitRegistry:
         assert len(ret[0]) == 2
 
         
+
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    def test_deferred_registration(self):
+        """Test that toolkits are only registered when a registry with deferred registration is first used"""
+        registry = ToolkitRegistry(toolkit_precedence=[RDKitToolkitWrapper],
+                                   defer_registration=True)
+        assert registry._deferred_registration is not None
+        assert registry._toolkit_list == []
+
+        assert [type(c) for c in registry.registered_toolkits] == [RDKitToolkitWrapper]
+        assert registry._deferred_registration is None
+
+        # Registering another toolkit completes the deferred registration first.
+        registry = ToolkitRegistry(toolkit_precedence=[RDKitToolkitWrapper],
+                                   defer_registration=True)
+        registry.add_toolkit(RDKitToolkitWrapper())
+        assert len(registry.registered_toolkits) == 2
+
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    def test_call_dispatch(self):
+        """Test that ToolkitRegistry.call() skips toolkits that do not implement a method and records call statistics"""
+        failing_toolkit = RDKitToolkitWrapper()
+        toolkit = RDKitToolkitWrapper()
+        n_failed_calls = [0]
+
+        def fail(*args, **kwargs):
+            n_failed_calls[0] += 1
+            raise NotImplementedError()
+
+        failing_toolkit.to_smiles = fail
+        registry = ToolkitRegistry(toolkit_precedence=[])
+        registry.add_toolkit(failing_toolkit)
+        registry.add_toolkit(toolkit)
+
+        # Only the first call tries the failing toolkit.
+        molecule = create_ethanol()
+        for _ in range(3):
+            assert registry.call('to_smiles', molecule) == toolkit.to_smiles(molecule)
+        assert n_failed_calls[0] == 1
+        assert registry.resolve('to_smiles') == fail
+
+        statistics = registry.call_statistics
+        assert set(statistics) == {'to_smiles'}
+        assert statistics['to_smiles']['n_calls'] == 3
+        assert statistics['to_smiles']['cumulative_time'] > 0.0
+
+        # Registering a toolkit resets the dispatch.
+        registry.add_toolkit(RDKitToolkitWrapper())
+        registry.call('to_smiles', molecule)
+        assert n_failed_calls[0] == 2
+
+        registry.reset_call_statistics()
+        assert registry.call_statistics == {}
+
+    @pytest.mark.skipif(not RDKitToolkitWrapper.is_available(), reason='RDKit Toolkit not available')
+    def test_call_dispatch_value_error(self):
+        """Test that a toolkit raising ValueError for one input is still tried first for the next ones"""
+        picky_toolkit = RDKitToolkitWrapper()
+        toolkit = RDKitToolkitWrapper()
+        ethanol = create_ethanol()
+        cyclohexane = create_cyclohexane()
+
+        def to_smiles(molecule, *args, **kwargs):
+            if molecule.n_atoms == ethanol.n_atoms:
+                raise ValueError('Unsupported molecule')
+            return 'picky toolkit'
+
+        picky_toolkit.to_smiles = to_smiles
+        registry = ToolkitRegistry(toolkit_precedence=[])
+        registry.add_toolkit(picky_toolkit)
+        registry.add_toolkit(toolkit)
+
+        assert registry.call('to_smiles', ethanol) == toolkit.to_smiles(ethanol)
+        # The failure with ethanol does not change the precedence for the next molecule.
+        assert registry.call('to_smiles', cyclohexane) == 'picky toolkit'
+        assert registry.call('to_smiles', ethanol) == toolkit.to_smiles(ethanol)
+
+    def test_import_time(self):
+        """Check that importing the SMIRNOFF engine imports no toolkit or heavy dependency"""
+        import subprocess
+        import sys
+
+        script = (
+            "import sys\n"
+            "import openforcefield.typing.engines.smirnoff\n"
+            "import openforcefield.utils.toolkits\n"
+            "modules = ['rdkit', 'openeye', 'networkx', 'pkg_resources', 'distutils', 'concurrent.futures.process']\n"
+            "print(','.join(m for m in modules if m in sys.modules))\n"
+            "assert openforcefield.utils.toolkits.GLOBAL_TOOLKIT_REGISTRY._deferred_registration is not None\n"
+            # The availability flags are still exported by star imports.
+            "from openforcefield.utils.toolkits import *\n"
+            "from openforcefield.utils import *\n"
+            "assert isinstance(RDKIT_AVAILABLE, bool) and isinstance(AMBERTOOLS_AVAILABLE, bool)\n"
+        )
+        imported_modules = subprocess.check_output([sys.executable, '-c', script], universal_newlines=True)
+        assert imported_modules.strip() == ''
@@ -180,6 +180,42 @@ class TestTopology(TestCase):
         assert topology.n_topology_molecules == 2
         assert topology.n_reference_molecules == 2
 
+    def test_to_from_dict(self):
+        """Test round-tripping a topology through its dict and YAML representations"""
+        topology = Topology()
+        for _ in range(3):
+            topology.add_molecule(self.ethane_from_smiles)
+        # Add copies with their atoms in a different order than the reference molecule
+        reversed_order = dict((i, 7 - i) for i in range(8))
+        topology.add_molecule(self.ethane_from_smiles, local_topology_to_reference_index=reversed_order)
+        topology.add_molecule(self.propane_from_smiles_w_vsites)
+        topology.add_molecule(self.ethane_from_smiles, local_topology_to_reference_index=reversed_order)
+        topology.box_vectors = unit.Quantity(np.array([10, 20, 30]), unit.angstrom)
+        topology.add_constraint(0, 1)
+        topology.add_constraint(2, 3, 1.5 * unit.angstrom)
+
+        topology_dict = topology.to_dict()
+        # Only the unique molecules and the reordered copies are stored
+        assert len(topology_dict['reference_molecules']) == 2
+        assert topology_dict['topology_molecules'] == [[0, 4], [1, 1], [0, 1]]
+        assert topology_dict['reordered_topology_molecules'] == [3, 5]
+
+        for topology_copy in [Topology.from_yaml(topology.to_yaml()),
+                              Topology.from_messagepack(topology.to_messagepack()),
+                              Topology.from_dict(topology.to_dict(numpy_arrays=True)),
+                              Topology(topology)]:
+            assert topology_copy.n_reference_molecules == 2
+            assert topology_copy.n_topology_molecules == 6
+            assert topology_copy.n_topology_virtual_sites == topology.n_topology_virtual_sites
+            for atom, atom_copy in zip(topology.topology_atoms, topology_copy.topology_atoms):
+                assert atom.atomic_number == atom_copy.atomic_number
+            for bond, bond_copy in zip(topology.topology_bonds, topology_copy.topology_bonds):
+                assert ([atom.topology_atom_index for atom in bond.atoms] ==
+                        [atom.topology_atom_index for atom in bond_copy.atoms])
+            assert np.allclose(topology_copy.box_vectors / unit.angstrom, [10, 20, 30])
+            assert topology_copy.is_constrained(1, 0) is True
+            assert topology_copy.is_constrained(3, 2) == 1.5 * unit.angstrom
+
 
     def test_n_topology_atoms(self):
         """Test n_atoms function"""
@@ -488,6 +524,31 @@ class TestTopology(TestCase):
             assert bond.bond_order == bond_copy.bond_order
             assert bond.bond.is_aromatic == bond_copy.bond.is_aromatic
 
+    def test_to_openmm_reordered_atoms(self):
+        """Test that to_openmm() preserves the topology atom order of molecules whose atoms are reordered
+        with respect to their reference molecule."""
+        from simtk.openmm import app
+        pdbfile = app.PDBFile(get_data_file_path('systems/packmol_boxes/cyclohexane_ethanol_0.4_0.6.pdb'))
+        molecules = [create_ethanol(), create_cyclohexane()]
+        topology = Topology.from_openmm(pdbfile.topology, unique_molecules=molecules)
+        omm_topology = topology.to_openmm()
+
+        # Both molecules have more than 5 copies, so there is one chain per reference molecule.
+        assert omm_topology.getNumChains() == 2
+        assert omm_topology.getNumResidues() == topology.n_topology_molecules
+
+        omm_atoms = list(omm_topology.atoms())
+        assert len(omm_atoms) == topology.n_topology_atoms
+        for omm_atom, atom in zip(omm_atoms, topology.topology_atoms):
+            assert omm_atom.name == atom.atom.name
+            assert omm_atom.element.atomic_number == atom.atomic_number
+
+        omm_bonds = list(omm_topology.bonds())
+        assert len(omm_bonds) == topology.n_topology_bonds
+        for omm_bond, bond in zip(omm_bonds, topology.topology_bonds):
+            assert [omm_atom.index for omm_atom in omm_bond] == [atom.topology_atom_index for atom in bond.atoms]
+            assert omm_bond.order == bond.bond_order
+
     @pytest.mark.skipif( not(OpenEyeToolkitWrapper.is_available()), reason='Test requires OE toolkit')
     def test_from_openmm_duplicate_unique_mol(self):
         """Check that a DuplicateUniqueMoleculeError is raised if we try to pass in two indistinguishably unique mols"""
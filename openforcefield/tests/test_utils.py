@@ -92,3 +92,66 @@ def test_ast_eval(unit_string, expected_unit):
     ast_root_node = ast.parse(unit_string, mode='eval').body
     parsed_units = _ast_eval(ast_root_node)
     assert parsed_units == expected_unit
+
+
+@pytest.mark.parametrize('quantity_string', [
+    '1.09 * angstrom',
+    '-0.5 * kilocalories_per_mole',
+    '680.0 * kilocalories_per_mole/angstrom**2',
+    '1 * kilojoule + 500 * joule',
+    '2 * nanometer * angstrom',
+    '3 * angstrom / nanometer',
+    '1.0 * dimensionless',
+    '[1, 2] * angstrom',
+    '1e-5 * angstrom ** -2',
+    '7 * (angstrom * mole)',
+])
+def test_string_to_quantity_fast_path(quantity_string):
+    """Test that the cached parsing in string_to_quantity() matches the full evaluation."""
+    from openforcefield.utils.utils import _ast_eval
+    expected_quantity = _ast_eval(ast.parse(quantity_string, mode='eval').body)
+    for _ in range(2):
+        parsed_quantity = utils.string_to_quantity(quantity_string)
+        assert parsed_quantity == expected_quantity
+        assert type(parsed_quantity) == type(expected_quantity)
+        if isinstance(expected_quantity, unit.Quantity):
+            assert parsed_quantity.unit == expected_quantity.unit
+            assert type(parsed_quantity._value) == type(expected_quantity._value)
+
+    # Cached quantities are not shared between calls.
+    if isinstance(expected_quantity, unit.Quantity):
+        assert utils.string_to_quantity(quantity_string) is not utils.string_to_quantity(quantity_string)
+
+
+def test_string_to_quantity_force_field():
+    """Test that string_to_quantity() gives the same results as _ast_eval() on all the strings of a force field."""
+    from openforcefield.typing.engines.smirnoff import XMLParameterIOHandler
+    from openforcefield.utils.utils import _ast_eval
+
+    smirnoff_data = XMLParameterIOHandler().parse_file(
+        utils.get_data_file_path('test_forcefields/smirnoff99Frosst.offxml'))
+
+    def iter_strings(data):
+        if isinstance(data, dict):
+            for value in data.values():
+                yield from iter_strings(value)
+        elif isinstance(data, list):
+            for item in data:
+                yield from iter_strings(item)
+        elif isinstance(data, str):
+            yield data
+
+    n_quantities = 0
+    for string in iter_strings(smirnoff_data):
+        try:
+            expected_quantity = _ast_eval(ast.parse(string, mode='eval').body)
+        except (AttributeError, TypeError, SyntaxError):
+            with pytest.raises((AttributeError, TypeError, SyntaxError)):
+                utils.string_to_quantity(string)
+            continue
+        parsed_quantity = utils.string_to_quantity(string)
+        assert parsed_quantity == expected_quantity
+        if isinstance(expected_quantity, unit.Quantity):
+            assert parsed_quantity.unit == expected_quantity.unit
+            n_quantities += 1
+    assert n_quantities > 500
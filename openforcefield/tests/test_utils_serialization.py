@@ -13,6 +13,9 @@ Tests for utility methods for serialization
 # GLOBAL IMPORTS
 #=============================================================================================
 
+import io
+
+import numpy as np
 import pytest
 
 
@@ -113,6 +116,75 @@ class TestUtilsSerialization:
         assert self.thing == thing_from_pkl
 
 
+class ArrayThing(Serializable):
+    """A class that stores numpy arrays directly in the binary formats."""
+
+    def __init__(self, description, coordinates, indices):
+        self.description = description
+        self.coordinates = coordinates
+        self.indices = indices
+
+    def to_dict(self):
+        return {
+            'description': self.description,
+            'coordinates': self.coordinates.tolist(),
+            'indices': self.indices.tolist()
+        }
+
+    def _to_binary_dict(self):
+        return {
+            'description': self.description,
+            'arrays': [self.coordinates, self.indices]
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        if 'arrays' in d:
+            return cls(d['description'], *d['arrays'])
+        return cls(d['description'], np.array(d['coordinates']), np.array(d['indices'], dtype=np.int32))
+
+
+class TestUtilsNumpySerialization:
+    """Test that numpy arrays are stored natively by the binary serialization formats."""
+
+    @classmethod
+    def setup_class(cls):
+        cls.thing = ArrayThing('blorb', np.random.random((100, 5, 3)), np.arange(10, dtype=np.int32))
+
+    def check_arrays(self, thing):
+        assert thing.description == self.thing.description
+        for array, expected_array in [(thing.coordinates, self.thing.coordinates),
+                                      (thing.indices, self.thing.indices)]:
+            assert isinstance(array, np.ndarray)
+            assert array.dtype == expected_array.dtype
+            assert np.array_equal(array, expected_array)
+
+    def test_json(self):
+        """Test that the text formats still use to_dict"""
+        self.check_arrays(ArrayThing.from_json(self.thing.to_json()))
+
+    def test_bson(self):
+        """Test BSON serialization of numpy arrays"""
+        self.check_arrays(ArrayThing.from_bson(self.thing.to_bson()))
+
+    def test_messagepack(self):
+        """Test MessagePack serialization of numpy arrays"""
+        messagepack_thing = self.thing.to_messagepack()
+        # The array data is stored as is, not byte-swapped or converted to lists
+        assert self.thing.coordinates.tobytes() in messagepack_thing
+        thing_from_messagepack = ArrayThing.from_messagepack(messagepack_thing)
+        self.check_arrays(thing_from_messagepack)
+        # Deserialized arrays are read-only views into the serialized data
+        assert not thing_from_messagepack.coordinates.flags.writeable
+
+    def test_messagepack_file(self):
+        """Test MessagePack serialization of numpy arrays to and from a file-like object"""
+        file_obj = io.BytesIO()
+        self.thing.to_messagepack_file(file_obj)
+        file_obj.seek(0)
+        self.check_arrays(ArrayThing.from_messagepack_file(file_obj))
+
+
 class DictionaryContainer(Serializable):
     def __init__(self, dictionary):
         import copy
@@ -1,7 +1,7 @@
 from openforcefield.topology.molecule import (
     Particle, Atom, Bond,
     VirtualSite, BondChargeVirtualSite, MonovalentLonePairVirtualSite, DivalentLonePairVirtualSite, TrivalentLonePairVirtualSite,
-    FrozenMolecule, Molecule
+    FrozenMolecule, Molecule, MoleculeWriter, MoleculeArchive
 )
 
 from openforcefield.topology.topology import (
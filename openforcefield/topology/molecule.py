@@ -36,19 +36,22 @@ Molecular chemical entity representation and routines to interface with cheminfo
 import numpy as np
 from collections import OrderedDict, Counter
 from copy import deepcopy
+import hashlib
+import io
+import itertools
+import json
+import logging
 import operator
+import os
 
 from simtk import unit
 from simtk.openmm.app import element, Element
 
-import networkx as nx
-from networkx.algorithms.isomorphism import GraphMatcher
-
 import openforcefield
 from openforcefield.utils import serialize_numpy, deserialize_numpy, quantity_to_string, string_to_quantity
 from openforcefield.utils.toolkits import ToolkitRegistry, ToolkitWrapper, RDKitToolkitWrapper, OpenEyeToolkitWrapper, \
     InvalidToolkitError, GLOBAL_TOOLKIT_REGISTRY
-from openforcefield.utils.toolkits import DEFAULT_AROMATICITY_MODEL
+from openforcefield.utils.toolkits import DEFAULT_AROMATICITY_MODEL, _open_file
 from openforcefield.utils.serialization import Serializable
 
 
@@ -63,10 +66,189 @@ from openforcefield.utils.serialization import Serializable
 # TODO: Allow all OpenEye aromaticity models to be used with OpenEye names?
 #       Only support OEAroModel_MDL in RDKit version?
 
+#=============================================================================================
+# CONFIGURE LOGGER
+#=============================================================================================
+
+logger = logging.getLogger(__name__)
+
 #=============================================================================================
 # PRIVATE SUBROUTINES
 #=============================================================================================
 
+
+def _weisfeiler_lehman_hash(graph, node_attributes=('atomic_number', ), edge_attributes=(), n_iterations=3):
+    """
+    Compute a Weisfeiler-Lehman hash of a molecular graph.
+
+    Isomorphic graphs always have the same hash, so different hashes prove that two graphs are not
+    isomorphic. Only the listed node and edge attributes are taken into account.
+
+    Parameters
+    ----------
+    graph : networkx.Graph
+        The molecular graph to hash
+    node_attributes : tuple of str, default=('atomic_number', )
+        The node attributes used as initial atom labels
+    edge_attributes : tuple of str, default=()
+        The edge attributes combined with the neighbor labels at each iteration
+    n_iterations : int, default=3
+        The number of label refinement iterations
+
+    Returns
+    -------
+    wl_hash : str
+        A hexadecimal digest of the graph
+    """
+    def digest(label):
+        return hashlib.blake2b(label.encode(), digest_size=8).hexdigest()
+
+    labels = {node: digest(repr(tuple(data.get(attribute) for attribute in node_attributes)))
+              for node, data in graph.nodes(data=True)}
+    for _ in range(n_iterations):
+        new_labels = {}
+        for node, neighbors in graph.adjacency():
+            neighborhood = sorted(
+                repr(tuple(edge_data.get(attribute) for attribute in edge_attributes)) + labels[neighbor]
+                for neighbor, edge_data in neighbors.items())
+            new_labels[node] = digest(labels[node] + '|' + ','.join(neighborhood))
+        labels = new_labels
+    return hashlib.blake2b(','.join(sorted(labels.values())).encode(), digest_size=16).hexdigest()
+
+
+def _graph_invariants(graph):
+    """
+    Compute cheap isomorphism invariants of a molecular graph with ``atomic_number`` node attributes.
+
+    Two graphs can only be isomorphic (under any of the matching options of
+    :py:meth:`FrozenMolecule.are_isomorphic`) if their invariants are equal.
+
+    Parameters
+    ----------
+    graph : networkx.Graph
+        The molecular graph
+
+    Returns
+    -------
+    invariants : tuple
+        The number of atoms, number of bonds, Hill formula, sorted sequence of
+        (atomic number, degree) pairs and element-only Weisfeiler-Lehman hash
+    """
+    degree_sequence = tuple(sorted(
+        (graph.nodes[node].get('atomic_number'), degree) for node, degree in graph.degree()))
+    return (graph.number_of_nodes(),
+            graph.number_of_edges(),
+            FrozenMolecule.to_hill_formula(graph),
+            degree_sequence,
+            _weisfeiler_lehman_hash(graph))
+
+
+def _extend_paths(paths, column, neighbors, neighbor_start, n_neighbors):
+    """
+    Extend paths of bonded atoms with each neighbor of one of their atoms.
+
+    Parameters
+    ----------
+    paths : numpy.ndarray
+        A (n_paths, path_length) array of atom indices.
+    column : int
+        The position in the path of the atom whose neighbors are appended.
+    neighbors : numpy.ndarray
+        The indices of the neighbors of all atoms, grouped by atom.
+    neighbor_start : numpy.ndarray
+        ``neighbor_start[i]`` is the position in ``neighbors`` of the first neighbor of atom ``i``.
+    n_neighbors : numpy.ndarray
+        ``n_neighbors[i]`` is the number of neighbors of atom ``i``.
+
+    Returns
+    -------
+    extended_paths : numpy.ndarray
+        A (n_extended_paths, path_length + 1) array with one row for each path and neighbor.
+    """
+    atom_indices = paths[:, column]
+    counts = n_neighbors[atom_indices]
+    path_indices = np.repeat(np.arange(len(paths)), counts)
+    # Position of each new row within the neighbors of its atom.
+    neighbor_offsets = np.arange(len(path_indices)) - np.repeat(np.cumsum(counts) - counts, counts)
+    next_atom_indices = neighbors[neighbor_start[atom_indices[path_indices]] + neighbor_offsets]
+    return np.column_stack([paths[path_indices], next_atom_indices])
+
+
+def _sort_rows(array):
+    """Sort the rows of a 2D array lexicographically."""
+    return array[np.lexsort(array.T[::-1])]
+
+
+class _ConformerList(list):
+    """
+    The list of conformers returned by ``FrozenMolecule.conformers``, which raises on attempts to modify it.
+
+    The conformers are stored in a single array owned by the molecule, so adding or removing items of this
+    list would not change the molecule. Copies and pickles of the list are plain lists.
+    """
+
+    def _raise_immutable(self, *args, **kwargs):
+        raise TypeError('The list returned by Molecule.conformers can not be modified. Use '
+                        'Molecule.add_conformer, Molecule.add_conformers or Molecule.set_conformers instead.')
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _raise_immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _raise_immutable
+
+    def __reduce__(self):
+        return list, (list(self), )
+
+
+# The smallest number of items per worker for which batch conversions are split across processes
+_MIN_BATCH_ITEMS_PER_WORKER = 64
+
+
+def _convert_batch_chunk(molecule_class, method_name, items, first_index, kwargs):
+    """
+    Convert a chunk of items with a ``FrozenMolecule`` method, recording the error of each item that fails.
+
+    If ``kwargs['toolkit_registry']`` is a ``ToolkitRegistry``, the toolkit that provides the method is
+    resolved once for the whole chunk and passed to the method of each item as its ``toolkit_registry``.
+    This is a module-level function so that it can be sent to worker processes.
+
+    Parameters
+    ----------
+    molecule_class : type
+        The molecule class to call constructor methods (such as ``from_smiles``) on
+    method_name : str
+        The name of the method. Methods starting with ``from_`` are called on ``molecule_class`` with each
+        item as their first argument, other methods are called on each item (which must be a molecule).
+    items : list
+        The items to convert
+    first_index : int
+        The index of the first item in the whole batch
+    kwargs : dict
+        Keyword arguments passed to every method call, including ``toolkit_registry``
+
+    Returns
+    -------
+    results : list of tuple
+        The batch index, result (None if the conversion failed) and error (None if it succeeded) of each item
+    """
+    toolkit_registry = kwargs['toolkit_registry']
+    if isinstance(toolkit_registry, ToolkitRegistry):
+        dispatch_methods = toolkit_registry._get_dispatch_methods(method_name)
+        if len(dispatch_methods) > 0:
+            kwargs = dict(kwargs, toolkit_registry=dispatch_methods[0][0])
+
+    is_constructor = method_name.startswith('from_')
+    results = list()
+    for index, item in enumerate(items, first_index):
+        try:
+            if is_constructor:
+                result = getattr(molecule_class, method_name)(item, **kwargs)
+            else:
+                result = getattr(item, method_name)(**kwargs)
+        except Exception as e:
+            results.append((index, None, e))
+        else:
+            results.append((index, result, None))
+    return results
+
 #=============================================================================================
 # Particle
 #=============================================================================================
@@ -308,6 +490,8 @@ class Atom(Particle):
         #if (value != 'CW') and (value != 'CCW') and not(value is None):
         #    raise Exception("Atom stereochemistry setter expected 'CW', 'CCW', or None. Received {} (type {})".format(value, type(value)))
         self._stereochemistry = value
+        if self._molecule is not None:
+            self._molecule._invalidate_cached_graph()
 
     @property
     def element(self):
@@ -1304,6 +1488,8 @@ class Bond(Serializable):
     @bond_order.setter
     def bond_order(self, value):
         self._bond_order = value
+        if self._molecule is not None:
+            self._molecule._invalidate_cached_graph()
 
     @property
     def fractional_bond_order(self):
@@ -1402,6 +1588,11 @@ class FrozenMolecule(Serializable):
 
     """
 
+    # Least-recently-used cache of FrozenMolecule templates built by from_smiles, shared by all
+    # molecule classes. It is disabled while its maximum size is 0 (see set_from_smiles_cache_size).
+    _from_smiles_cache = OrderedDict()
+    _from_smiles_cache_size = 0
+
     def __init__(self,
                  other=None,
                  file_format=None,
@@ -1580,7 +1771,7 @@ class FrozenMolecule(Serializable):
     # Safe serialization
     ####################################################################################################
 
-    def to_dict(self):
+    def to_dict(self, numpy_arrays=False):
         """
         Return a dictionary representation of the molecule.
 
@@ -1589,6 +1780,13 @@ class FrozenMolecule(Serializable):
            * Document the representation standard.
            * How do we do version control with this standard?
 
+        Parameters
+        ----------
+        numpy_arrays : bool, optional, default=False
+            If True, the conformers and partial charges are stored as numpy arrays of shape
+            (n_conformers, n_atoms, 3) and (n_atoms,) that share memory with the molecule, rather
+            than being serialized to bytes.
+
         Returns
         -------
         molecule_dict : OrderedDict
@@ -1615,39 +1813,65 @@ class FrozenMolecule(Serializable):
         molecule_dict['properties'] = self._properties
         if hasattr(self, '_cached_properties'):
             molecule_dict['cached_properties'] = self._cached_properties
-        # TODO: Conformers
-        if self._conformers is None:
+        if self._n_conformers == 0:
             molecule_dict['conformers'] = None
         else:
-            molecule_dict['conformers'] = []
             molecule_dict[
                 'conformers_unit'] = 'angstrom'  # Have this defined as a class variable?
-            for conf in self._conformers:
-                conf_unitless = (conf / unit.angstrom)
-                conf_serialized, conf_shape = serialize_numpy((conf_unitless))
-                molecule_dict['conformers'].append(conf_serialized)
+            if numpy_arrays:
+                molecule_dict['conformers'] = self._conformer_buffer[:self._n_conformers]
+            else:
+                # Serialize the whole conformer buffer at once, then split it into one chunk per conformer
+                conformers_serialized, conformers_shape = serialize_numpy(
+                    self._conformer_buffer[:self._n_conformers])
+                conformer_n_bytes = len(conformers_serialized) // self._n_conformers
+                molecule_dict['conformers'] = [
+                    conformers_serialized[i * conformer_n_bytes:(i + 1) * conformer_n_bytes]
+                    for i in range(self._n_conformers)
+                ]
         if self._partial_charges is None:
             molecule_dict['partial_charges'] = None
             molecule_dict['partial_charges_unit'] = None
 
         else:
             charges_unitless = self._partial_charges / unit.elementary_charge
-            charges_serialized, charges_shape = serialize_numpy(
-                charges_unitless)
-            molecule_dict['partial_charges'] = charges_serialized
+            if numpy_arrays:
+                molecule_dict['partial_charges'] = np.asarray(charges_unitless, dtype=np.float64)
+            else:
+                charges_serialized, charges_shape = serialize_numpy(
+                    charges_unitless)
+                molecule_dict['partial_charges'] = charges_serialized
             molecule_dict['partial_charges_unit'] = 'elementary_charge'
 
         return molecule_dict
 
+    def _to_binary_dict(self):
+        """
+        Return the dictionary representation used by the binary serialization formats, with the
+        conformers and partial charges as numpy arrays.
+        """
+        return self.to_dict(numpy_arrays=True)
+
     def __hash__(self):
         """
         Returns a hash of this molecule. Used when checking molecule uniqueness in Topology creation.
 
+        The hash is computed from the cached molecular graph without a cheminformatics toolkit, and
+        is equal for any two molecules that are equal under ``__eq__``.
+
         Returns
         -------
-        string
-        """
-        return hash(self.to_smiles())
+        int
+        """
+        if self._cached_molecule_hash is None:
+            # Bond orders and bond aromaticity are left out, since ``__eq__`` considers bonds equal if
+            # either of them match and so cannot be consistently hashed
+            wl_hash = _weisfeiler_lehman_hash(
+                self._get_networkx_graph(),
+                node_attributes=('atomic_number', 'is_aromatic', 'formal_charge', 'stereochemistry'),
+                edge_attributes=('stereochemistry', ))
+            self._cached_molecule_hash = hash((self._get_graph_invariants(), wl_hash))
+        return self._cached_molecule_hash
 
     @classmethod
     def from_dict(cls, molecule_dict):
@@ -1670,6 +1894,140 @@ class FrozenMolecule(Serializable):
         mol._initialize_from_dict(molecule_dict)
         return mol
 
+    @classmethod
+    def from_arrays(cls,
+                    atomic_numbers,
+                    formal_charges,
+                    is_aromatic,
+                    stereo,
+                    bonds,
+                    bond_orders,
+                    bond_is_aromatic=None,
+                    bond_stereo=None,
+                    fractional_bond_orders=None,
+                    atom_names=None,
+                    name=''):
+        """
+        Create a new Molecule from arrays of atom and bond attributes.
+
+        All inputs are validated at once before the atoms and bonds are created, which is much faster
+        than adding atoms and bonds one at a time with ``add_atom`` and ``add_bond``.
+
+        Parameters
+        ----------
+        atomic_numbers : array-like of int with shape (n_atoms,)
+            Atomic number of each atom
+        formal_charges : array-like of int with shape (n_atoms,)
+            Formal charge of each atom
+        is_aromatic : array-like of bool with shape (n_atoms,)
+            Whether each atom is aromatic
+        stereo : list of str or None with length n_atoms, or None
+            Either 'R', 'S' or None for each atom. If None, no atom has specified stereochemistry.
+        bonds : array-like of int with shape (n_bonds, 2)
+            Indices of the two atoms in each bond
+        bond_orders : array-like of int with shape (n_bonds,)
+            Integral bond order of the Kekulized form of each bond
+        bond_is_aromatic : array-like of bool with shape (n_bonds,), optional, default=None
+            Whether each bond is aromatic. If None, no bond is aromatic.
+        bond_stereo : list of str or None with length n_bonds, optional, default=None
+            Either 'E', 'Z' or None for each bond. If None, no bond has specified stereochemistry.
+        fractional_bond_orders : list of float or None with length n_bonds, optional, default=None
+            The fractional (eg. Wiberg) bond order of each bond, or None if not available.
+        atom_names : list of str with length n_atoms, optional, default=None
+            An optional name for each atom
+        name : str, optional, default=''
+            The name of the molecule
+
+        Returns
+        -------
+        molecule : Molecule
+            A Molecule with the given atoms and bonds
+
+        Examples
+        --------
+
+        Define an ethylene molecule
+
+        >>> molecule = Molecule.from_arrays([6, 6, 1, 1, 1, 1], [0, 0, 0, 0, 0, 0], [False] * 6, None,
+        ...                                 [(0, 1), (0, 2), (0, 3), (1, 4), (1, 5)], [2, 1, 1, 1, 1])
+
+        """
+        atomic_numbers = np.asarray(atomic_numbers, dtype=np.int64)
+        formal_charges = np.asarray(formal_charges, dtype=np.int64)
+        is_aromatic = np.asarray(is_aromatic, dtype=bool)
+        n_atoms = atomic_numbers.shape[0]
+        bonds = np.asarray(bonds, dtype=np.int64).reshape(-1, 2)
+        bond_orders = np.asarray(bond_orders, dtype=np.int64)
+        n_bonds = bonds.shape[0]
+        if bond_is_aromatic is None:
+            bond_is_aromatic = np.zeros(n_bonds, dtype=bool)
+        bond_is_aromatic = np.asarray(bond_is_aromatic, dtype=bool)
+        if stereo is None:
+            stereo = [None] * n_atoms
+        if bond_stereo is None:
+            bond_stereo = [None] * n_bonds
+        if fractional_bond_orders is None:
+            fractional_bond_orders = [None] * n_bonds
+        if atom_names is None:
+            atom_names = [None] * n_atoms
+
+        # Check that the per-atom and per-bond inputs are consistent
+        for label, values, n_expected in [('atomic_numbers', atomic_numbers, n_atoms),
+                                          ('formal_charges', formal_charges, n_atoms),
+                                          ('is_aromatic', is_aromatic, n_atoms),
+                                          ('stereo', stereo, n_atoms),
+                                          ('atom_names', atom_names, n_atoms),
+                                          ('bond_orders', bond_orders, n_bonds),
+                                          ('bond_is_aromatic', bond_is_aromatic, n_bonds),
+                                          ('bond_stereo', bond_stereo, n_bonds),
+                                          ('fractional_bond_orders', fractional_bond_orders, n_bonds)]:
+            if len(values) != n_expected or np.ndim(values) != 1:
+                raise Exception('Molecule.from_arrays expected {} to have shape ({},), '
+                                'got {}'.format(label, n_expected, np.shape(values)))
+        if n_atoms != 0 and atomic_numbers.min() < 0:
+            raise Exception('Molecule.from_arrays received negative atomic numbers: '
+                            '{}'.format(atomic_numbers[atomic_numbers < 0]))
+        invalid_stereo = set(stereo) - {None, 'R', 'S'}
+        if len(invalid_stereo) != 0:
+            raise Exception("Molecule.from_arrays expected atom stereochemistry of 'R', 'S' or None, "
+                            "got {}".format(invalid_stereo))
+        invalid_stereo = set(bond_stereo) - {None, 'E', 'Z'}
+        if len(invalid_stereo) != 0:
+            raise Exception("Molecule.from_arrays expected bond stereochemistry of 'E', 'Z' or None, "
+                            "got {}".format(invalid_stereo))
+
+        # Check that the bonds connect existing and distinct atoms, and that no bond is repeated
+        if n_bonds != 0:
+            if bonds.min() < 0 or bonds.max() >= n_atoms:
+                raise Exception('Molecule.from_arrays received bonds to atom indices outside '
+                                'the range [0, {})'.format(n_atoms))
+            self_bonds = bonds[:, 0] == bonds[:, 1]
+            if self_bonds.any():
+                raise Exception('Molecule.from_arrays received bonds between an atom and itself: '
+                                '{}'.format(bonds[self_bonds].tolist()))
+            sorted_bonds = np.sort(bonds, axis=1)
+            unique_bonds, counts = np.unique(sorted_bonds, axis=0, return_counts=True)
+            if len(unique_bonds) != n_bonds:
+                raise Exception('Molecule.from_arrays received repeated bonds: '
+                                '{}'.format(unique_bonds[counts > 1].tolist()))
+
+        # Everything is valid, so build the atom and bond lists in one pass
+        molecule = cls()
+        molecule.name = name
+        molecule._atoms = [Atom(atomic_number, formal_charge, aromatic,
+                                stereochemistry=atom_stereo, name=atom_name, molecule=molecule)
+                           for atomic_number, formal_charge, aromatic, atom_stereo, atom_name
+                           in zip(atomic_numbers.tolist(), formal_charges.tolist(), is_aromatic.tolist(),
+                                  stereo, atom_names)]
+        atoms = molecule._atoms
+        molecule._bonds = [Bond(atoms[atom1], atoms[atom2], bond_order, aromatic,
+                                stereochemistry=stereochemistry, fractional_bond_order=fractional_bond_order)
+                           for (atom1, atom2), bond_order, aromatic, stereochemistry, fractional_bond_order
+                           in zip(bonds.tolist(), bond_orders.tolist(), bond_is_aromatic.tolist(),
+                                  bond_stereo, fractional_bond_orders)]
+        molecule._invalidate_cached_properties()
+        return molecule
+
     def _initialize_from_dict(self, molecule_dict):
         """
         Initialize this Molecule from a dictionary representation
@@ -1751,24 +2109,30 @@ class FrozenMolecule(Serializable):
             self._partial_charges = None
         else:
             charges_shape = (self.n_atoms, )
-            partial_charges_unitless = deserialize_numpy(
-                molecule_dict['partial_charges'], charges_shape)
+            if isinstance(molecule_dict['partial_charges'], np.ndarray):
+                partial_charges_unitless = np.array(molecule_dict['partial_charges'], dtype=np.float64)
+            else:
+                partial_charges_unitless = deserialize_numpy(
+                    molecule_dict['partial_charges'], charges_shape)
             pc_unit = getattr(unit, molecule_dict['partial_charges_unit'])
             partial_charges = unit.Quantity(partial_charges_unitless, pc_unit)
             self._partial_charges = partial_charges
 
         if molecule_dict['conformers'] is None:
-            self._conformers = None
+            self._set_conformers(None)
+        elif isinstance(molecule_dict['conformers'], np.ndarray):
+            # Copy the array, which may be a read-only view into serialized data or another molecule
+            conformers_unitless = np.array(molecule_dict['conformers'], dtype=np.float64)
+            c_unit = getattr(unit, molecule_dict['conformers_unit'])
+            self._adopt_conformers(unit.Quantity(conformers_unitless, c_unit))
         else:
-            self._conformers = list()
-            for ser_conf in molecule_dict['conformers']:
-                # TODO: Update to use string_to_quantity
-                conformers_shape = ((self.n_atoms, 3))
-                conformer_unitless = deserialize_numpy(ser_conf,
-                                                       conformers_shape)
-                c_unit = getattr(unit, molecule_dict['conformers_unit'])
-                conformer = unit.Quantity(conformer_unitless, c_unit)
-                self._conformers.append(conformer)
+            # Deserialize all conformers in one pass into a single writable buffer
+            # TODO: Update to use string_to_quantity
+            conformers_shape = (len(molecule_dict['conformers']), self.n_atoms, 3)
+            conformers_unitless = deserialize_numpy(
+                bytearray().join(molecule_dict['conformers']), conformers_shape)
+            c_unit = getattr(unit, molecule_dict['conformers_unit'])
+            self._adopt_conformers(unit.Quantity(conformers_unitless, c_unit))
 
         self._properties = molecule_dict['properties']
 
@@ -1794,7 +2158,10 @@ class FrozenMolecule(Serializable):
         self._properties = {}  # Attached properties to be preserved
         #self._cached_properties = None # Cached properties (such as partial charges) can be recomputed as needed
         self._partial_charges = None
-        self._conformers = None  # Optional conformers
+        # Optional conformers, stored as a single (capacity, n_atoms, 3) float64 buffer in angstroms
+        self._conformer_buffer = None
+        self._n_conformers = 0
+        self._invalidate_cached_graph()
 
     def _copy_initializer(self, other):
         """
@@ -1878,6 +2245,34 @@ class FrozenMolecule(Serializable):
             self._cached_smiles[func_qualname] = smiles
             return smiles
 
+    @classmethod
+    def to_smiles_batch(cls, molecules, toolkit_registry=GLOBAL_TOOLKIT_REGISTRY, n_workers=1, errors=None):
+        """
+        Return the canonical isomeric SMILES representations of many molecules.
+
+        Parameters
+        ----------
+        molecules : iterable of openforcefield.topology.Molecule
+            The molecules to convert
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper, optional, default=GLOBAL_TOOLKIT_REGISTRY
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for SMILES conversion
+        n_workers : int, optional, default=1
+            The number of worker processes. If None, the number of CPUs is used. Batches too small to
+            benefit from the extra processes are converted in this process.
+        errors : list, optional, default=None
+            If given, an ``(index, error)`` tuple is appended to this list for each molecule that could not be
+            converted. Otherwise, a warning is logged for these molecules.
+
+        Returns
+        -------
+        smiles : list of str
+            Canonical isomeric explicit-hydrogen SMILES, in the order of ``molecules``, with None for each
+            molecule that could not be converted
+
+        """
+        kwargs = dict(toolkit_registry=toolkit_registry)
+        return cls._convert_batch('to_smiles', molecules, kwargs, n_workers, errors)
+
     @staticmethod
     def from_inchi(inchi, allow_undefined_stereo=False, toolkit_registry=GLOBAL_TOOLKIT_REGISTRY):
         """
@@ -1922,6 +2317,40 @@ class FrozenMolecule(Serializable):
 
         return molecule
 
+    @classmethod
+    def from_inchi_batch(cls,
+                         inchi_iterable,
+                         allow_undefined_stereo=False,
+                         toolkit_registry=GLOBAL_TOOLKIT_REGISTRY,
+                         n_workers=1,
+                         errors=None):
+        """
+        Construct many molecules from their InChI representations.
+
+        Parameters
+        ----------
+        inchi_iterable : iterable of str
+            The InChI representations of the molecules
+        allow_undefined_stereo : bool, default=False
+            Whether to accept InChI with undefined stereochemistry. If False,
+            InChI with undefined stereochemistry are treated as errors.
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper, optional, default=GLOBAL_TOOLKIT_REGISTRY
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for InChI-to-molecule conversion
+        n_workers : int, optional, default=1
+            The number of worker processes. If None, the number of CPUs is used. Batches too small to
+            benefit from the extra processes are converted in this process.
+        errors : list, optional, default=None
+            If given, an ``(index, error)`` tuple is appended to this list for each InChI that could not be
+            converted. Otherwise, a warning is logged for these InChIs.
+
+        Returns
+        -------
+        molecules : list of openforcefield.topology.Molecule
+            The molecules, in the order of ``inchi_iterable``, with None for each InChI that could not be parsed
+        """
+        kwargs = dict(allow_undefined_stereo=allow_undefined_stereo, toolkit_registry=toolkit_registry)
+        return cls._convert_batch('from_inchi', inchi_iterable, kwargs, n_workers, errors)
+
     def to_inchi(self, fixed_hydrogens=False, toolkit_registry=GLOBAL_TOOLKIT_REGISTRY):
         """
         Create an InChI string for the molecule using the requested toolkit backend.
@@ -1965,6 +2394,40 @@ class FrozenMolecule(Serializable):
 
         return inchi
 
+    @classmethod
+    def to_inchi_batch(cls,
+                       molecules,
+                       fixed_hydrogens=False,
+                       toolkit_registry=GLOBAL_TOOLKIT_REGISTRY,
+                       n_workers=1,
+                       errors=None):
+        """
+        Create the InChIs of many molecules.
+
+        Parameters
+        ----------
+        molecules : iterable of openforcefield.topology.Molecule
+            The molecules to convert
+        fixed_hydrogens: bool, default=False
+            If a fixed hydrogen layer should be added to the InChI, if `True` this will produce non standard
+            specific InChI strings of the molecules.
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper, optional, default=GLOBAL_TOOLKIT_REGISTRY
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for molecule-to-InChI conversion
+        n_workers : int, optional, default=1
+            The number of worker processes. If None, the number of CPUs is used. Batches too small to
+            benefit from the extra processes are converted in this process.
+        errors : list, optional, default=None
+            If given, an ``(index, error)`` tuple is appended to this list for each molecule that could not be
+            converted. Otherwise, a warning is logged for these molecules.
+
+        Returns
+        -------
+        inchis : list of str
+            The InChIs, in the order of ``molecules``, with None for each molecule that could not be converted
+        """
+        kwargs = dict(fixed_hydrogens=fixed_hydrogens, toolkit_registry=toolkit_registry)
+        return cls._convert_batch('to_inchi', molecules, kwargs, n_workers, errors)
+
     def to_inchikey(self, fixed_hydrogens=False, toolkit_registry=GLOBAL_TOOLKIT_REGISTRY):
         """
         Create an InChIKey for the molecule using the requested toolkit backend.
@@ -2008,6 +2471,40 @@ class FrozenMolecule(Serializable):
 
         return inchi_key
 
+    @classmethod
+    def to_inchikey_batch(cls,
+                          molecules,
+                          fixed_hydrogens=False,
+                          toolkit_registry=GLOBAL_TOOLKIT_REGISTRY,
+                          n_workers=1,
+                          errors=None):
+        """
+        Create the InChIKeys of many molecules.
+
+        Parameters
+        ----------
+        molecules : iterable of openforcefield.topology.Molecule
+            The molecules to convert
+        fixed_hydrogens: bool, default=False
+            If a fixed hydrogen layer should be added to the InChI, if `True` this will produce non standard
+            specific InChI strings of the molecules.
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper, optional, default=GLOBAL_TOOLKIT_REGISTRY
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for molecule-to-InChIKey conversion
+        n_workers : int, optional, default=1
+            The number of worker processes. If None, the number of CPUs is used. Batches too small to
+            benefit from the extra processes are converted in this process.
+        errors : list, optional, default=None
+            If given, an ``(index, error)`` tuple is appended to this list for each molecule that could not be
+            converted. Otherwise, a warning is logged for these molecules.
+
+        Returns
+        -------
+        inchi_keys : list of str
+            The InChIKeys, in the order of ``molecules``, with None for each molecule that could not be converted
+        """
+        kwargs = dict(fixed_hydrogens=fixed_hydrogens, toolkit_registry=toolkit_registry)
+        return cls._convert_batch('to_inchikey', molecules, kwargs, n_workers, errors)
+
     @staticmethod
     def from_smiles(smiles,
                     hydrogens_are_explicit=False,
@@ -2039,6 +2536,17 @@ class FrozenMolecule(Serializable):
         >>> molecule = Molecule.from_smiles('Cc1ccccc1')
 
         """
+        cache = FrozenMolecule._from_smiles_cache
+        if FrozenMolecule._from_smiles_cache_size > 0:
+            if isinstance(toolkit_registry, ToolkitRegistry):
+                toolkit_key = tuple(type(toolkit) for toolkit in toolkit_registry.registered_toolkits)
+            else:
+                toolkit_key = type(toolkit_registry)
+            cache_key = (smiles, hydrogens_are_explicit, allow_undefined_stereo, toolkit_key)
+            if cache_key in cache:
+                cache.move_to_end(cache_key)
+                return Molecule(cache[cache_key])
+
         if isinstance(toolkit_registry, ToolkitRegistry):
             molecule = toolkit_registry.call('from_smiles',
                                              smiles,
@@ -2055,8 +2563,154 @@ class FrozenMolecule(Serializable):
                 'Invalid toolkit_registry passed to from_smiles. Expected ToolkitRegistry or ToolkitWrapper. Got  {}'
                 .format(type(toolkit_registry)))
 
+        if FrozenMolecule._from_smiles_cache_size > 0:
+            cache[cache_key] = FrozenMolecule(molecule)
+            if len(cache) > FrozenMolecule._from_smiles_cache_size:
+                cache.popitem(last=False)
+
         return molecule
 
+    @staticmethod
+    def set_from_smiles_cache_size(max_size):
+        """
+        Set the maximum number of molecules cached by :py:meth:`from_smiles`.
+
+        While the cache is enabled, ``from_smiles`` returns a copy of a cached molecule when it is called again
+        with the same SMILES, ``hydrogens_are_explicit``, ``allow_undefined_stereo`` and toolkits, instead of
+        calling the toolkit. The least recently used molecules are dropped when the cache is full.
+        The cache is disabled by default.
+
+        Parameters
+        ----------
+        max_size : int
+            The maximum number of cached molecules. 0 disables and clears the cache.
+            If the cache holds more molecules, the least recently used ones are dropped.
+
+        Examples
+        --------
+
+        >>> Molecule.set_from_smiles_cache_size(128)
+        >>> water = Molecule.from_smiles('O')
+        >>> Molecule.from_smiles('O') == water
+        True
+        >>> Molecule.set_from_smiles_cache_size(0)
+
+        """
+        if max_size < 0:
+            raise ValueError(f'The from_smiles cache size must be non-negative, got {max_size}')
+        FrozenMolecule._from_smiles_cache_size = max_size
+        while len(FrozenMolecule._from_smiles_cache) > max_size:
+            FrozenMolecule._from_smiles_cache.popitem(last=False)
+
+    @staticmethod
+    def clear_from_smiles_cache():
+        """
+        Remove all molecules from the :py:meth:`from_smiles` cache, keeping its maximum size.
+        """
+        FrozenMolecule._from_smiles_cache.clear()
+
+    @classmethod
+    def _convert_batch(cls, method_name, items, kwargs, n_workers, errors):
+        """
+        Convert a batch of items with a molecule method, optionally splitting the work across a pool of processes.
+
+        Parameters
+        ----------
+        method_name : str
+            The name of the method to convert each item with (see ``_convert_batch_chunk``)
+        items : iterable
+            The items to convert
+        kwargs : dict
+            Keyword arguments passed to every method call
+        n_workers : int or None
+            The number of worker processes. If None, the number of CPUs is used.
+        errors : list or None
+            The list to append an ``(index, error)`` tuple to for each item that fails, if any
+
+        Returns
+        -------
+        results : list
+            The result of each item, in the order of ``items``, with None for the items that failed
+        """
+        items = list(items)
+        if n_workers is None:
+            n_workers = os.cpu_count()
+        n_workers = min(n_workers, len(items) // _MIN_BATCH_ITEMS_PER_WORKER)
+
+        if n_workers > 1:
+            # Use a few chunks per worker to balance the load
+            chunk_size = -(-len(items) // (4 * n_workers))
+            first_indices = range(0, len(items), chunk_size)
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                chunk_results = executor.map(_convert_batch_chunk,
+                                             itertools.repeat(cls),
+                                             itertools.repeat(method_name),
+                                             [items[first:first + chunk_size] for first in first_indices],
+                                             first_indices,
+                                             itertools.repeat(kwargs))
+                indexed_results = list(itertools.chain.from_iterable(chunk_results))
+        else:
+            indexed_results = _convert_batch_chunk(cls, method_name, items, 0, kwargs)
+
+        results = list()
+        for index, result, error in indexed_results:
+            if error is not None:
+                if errors is not None:
+                    errors.append((index, error))
+                else:
+                    logger.warning(f'Could not convert item {index} of the batch with {method_name}: {error}')
+            results.append(result)
+        return results
+
+    @classmethod
+    def from_smiles_batch(cls,
+                          smiles_iterable,
+                          hydrogens_are_explicit=False,
+                          toolkit_registry=GLOBAL_TOOLKIT_REGISTRY,
+                          allow_undefined_stereo=False,
+                          n_workers=1,
+                          errors=None):
+        """
+        Construct many molecules from their SMILES representations.
+
+        Parameters
+        ----------
+        smiles_iterable : iterable of str
+            The SMILES representations of the molecules
+        hydrogens_are_explicit : bool, default = False
+            If False, the cheminformatics toolkit will perform hydrogen addition
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper, optional, default=GLOBAL_TOOLKIT_REGISTRY
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for SMILES-to-molecule conversion
+        allow_undefined_stereo : bool, default=False
+            Whether to accept SMILES with undefined stereochemistry. If False,
+            SMILES with undefined stereochemistry are treated as errors.
+        n_workers : int, optional, default=1
+            The number of worker processes. If None, the number of CPUs is used. Batches too small to
+            benefit from the extra processes are converted in this process.
+        errors : list, optional, default=None
+            If given, an ``(index, error)`` tuple is appended to this list for each SMILES that could not be
+            converted. Otherwise, a warning is logged for these SMILESs.
+
+        Returns
+        -------
+        molecules : list of openforcefield.topology.Molecule
+            The molecules, in the order of ``smiles_iterable``, with None for each SMILES that could not be parsed
+
+        Examples
+        --------
+
+        >>> errors = []
+        >>> molecules = Molecule.from_smiles_batch(['CCO', 'c1ccccc1', 'not a smiles'], errors=errors)
+        >>> [error_index for error_index, _ in errors]
+        [2]
+
+        """
+        kwargs = dict(hydrogens_are_explicit=hydrogens_are_explicit,
+                      toolkit_registry=toolkit_registry,
+                      allow_undefined_stereo=allow_undefined_stereo)
+        return cls._convert_batch('from_smiles', smiles_iterable, kwargs, n_workers, errors)
+
     @staticmethod
     def are_isomorphic(
             mol1, mol2, return_atom_map=False,
@@ -2111,8 +2765,36 @@ class FrozenMolecule(Serializable):
             If molecules are not isomorphic given input arguments, will return None instead of dict.
         """
 
-        # Do a quick hill formula check first
-        if Molecule.to_hill_formula(mol1) != Molecule.to_hill_formula(mol2):
+        import networkx as nx
+        from networkx.algorithms.isomorphism import GraphMatcher
+
+        # Here we should work out what data type we have, also deal with lists?
+        def to_networkx_and_invariants(data):
+            """For the given data type, return the networkx graph and its isomorphism invariants"""
+            from openforcefield.topology import TopologyMolecule
+
+            if isinstance(data, FrozenMolecule):
+                # Molecule class instance, use the cached graph
+                return data._get_networkx_graph(), data._get_graph_invariants()
+            elif isinstance(data, TopologyMolecule):
+                # TopologyMolecule class instance
+                reference_molecule = data.reference_molecule
+                return reference_molecule._get_networkx_graph(), reference_molecule._get_graph_invariants()
+            elif isinstance(data, nx.Graph):
+                return data, _graph_invariants(data)
+
+            else:
+                raise NotImplementedError(f'The input type {type(data)} is not supported,'
+                                          f'please supply an openforcefield.topology.molecule.Molecule,'
+                                          f'openforcefield.topology.topology.TopologyMolecule or networkx representaion '
+                                          f'of the molecule.')
+
+        mol1_netx, mol1_invariants = to_networkx_and_invariants(mol1)
+        mol2_netx, mol2_invariants = to_networkx_and_invariants(mol2)
+
+        # Do a quick check of the cheap graph invariants (atom and bond counts, Hill formula,
+        # element-degree sequence and element-only WL hash) before running VF2
+        if mol1_invariants != mol2_invariants:
             return False, None
 
         # Build the user defined matching functions
@@ -2151,28 +2833,6 @@ class FrozenMolecule(Serializable):
         else:
             edge_match_func = None
 
-        # Here we should work out what data type we have, also deal with lists?
-        def to_networkx(data):
-            """For the given data type, return the networkx graph"""
-            from openforcefield.topology import TopologyMolecule
-
-            if isinstance(data, FrozenMolecule):
-                # Molecule class instance
-                return data.to_networkx()
-            elif isinstance(data, TopologyMolecule):
-                # TopologyMolecule class instance
-                return data.reference_molecule.to_networkx()
-            elif isinstance(data, nx.Graph):
-                return data
-
-            else:
-                raise NotImplementedError(f'The input type {type(data)} is not supported,'
-                                          f'please supply an openforcefield.topology.molecule.Molecule,'
-                                          f'openforcefield.topology.topology.TopologyMolecule or networkx representaion '
-                                          f'of the molecule.')
-
-        mol1_netx = to_networkx(mol1)
-        mol2_netx = to_networkx(mol2)
         GM = GraphMatcher(
             mol1_netx,
             mol2_netx,
@@ -2415,14 +3075,59 @@ class FrozenMolecule(Serializable):
         """
         #if hasattr(self, '_cached_properties'):
         #    delattr(self, '_cached_properties')
-        self._conformers = None
+        self._conformer_buffer = None
+        self._n_conformers = 0
         self._partial_charges = None
-        self._propers = None
-        self._impropers = None
 
         self._cached_smiles = None
+        self._invalidate_cached_graph()
         # TODO: Clear fractional bond orders
 
+    def _invalidate_cached_graph(self):
+        """
+        Indicate that the molecular graph (atoms, bonds or their attributes) has been altered.
+        """
+        self._cached_graph = None
+        self._cached_hill_formula = None
+        self._cached_graph_invariants = None
+        self._cached_molecule_hash = None
+        self._angle_indices = None
+        self._proper_indices = None
+        self._improper_indices = None
+        self._angles = None
+        self._propers = None
+        self._impropers = None
+        self._torsions = None
+
+    def _get_networkx_graph(self):
+        """
+        Return the cached NetworkX graph of this molecule, generating it on first use.
+
+        The returned graph is shared by all callers and must not be modified; use
+        :py:meth:`to_networkx` to get a private copy.
+
+        Returns
+        -------
+        graph : networkx.Graph
+        """
+        if self._cached_graph is None:
+            self._cached_graph = self.to_networkx()
+        return self._cached_graph
+
+    def _get_graph_invariants(self):
+        """
+        Return the cached isomorphism invariants of this molecule.
+
+        See :py:func:`_graph_invariants` for their definition.
+
+        Returns
+        -------
+        invariants : tuple
+        """
+        if self._cached_graph_invariants is None:
+            self._cached_graph_invariants = _graph_invariants(self._get_networkx_graph())
+        return self._cached_graph_invariants
+
     def to_networkx(self):
         """Generate a NetworkX undirected graph from the Molecule.
 
@@ -2857,55 +3562,149 @@ class FrozenMolecule(Serializable):
         index: int
             The index of this conformer
         """
-        new_conf = unit.Quantity(
-            np.zeros((self.n_atoms, 3), np.float), unit.angstrom)
-        if not (new_conf.shape == coordinates.shape):
+        if not (coordinates.shape == (self.n_atoms, 3)):
             raise Exception(
                 "molecule.add_conformer given input of the wrong shape: "
                 "Given {}, expected {}".format(coordinates.shape,
-                                               new_conf.shape))
-
-        try:
-            new_conf[:] = coordinates
-        except AttributeError as e:
-            print(e)
-            raise Exception(
-                'Coordinates passed to Molecule._add_conformer without units. Ensure that coordinates are '
-                'of type simtk.units.Quantity')
+                                               (self.n_atoms, 3)))
 
-        if self._conformers is None:
-            #TODO should we checking that the exact same conformer is not in the list already?
-            self._conformers = []
-        self._conformers.append(new_conf)
-        return len(self._conformers)
+        #TODO should we checking that the exact same conformer is not in the list already?
+        new_conf = self._coordinates_in_angstrom(coordinates)
+        self._reserve_conformers(self._n_conformers + 1)
+        self._conformer_buffer[self._n_conformers] = new_conf
+        self._n_conformers += 1
+        return self._n_conformers
 
-    @property
-    def partial_charges(self):
+    def _add_conformers(self, coordinates):
         """
-        Returns the partial charges (if present) on the molecule.
+        Add several conformations of the molecule at once
+
+        Parameters
+        ----------
+        coordinates: simtk.unit.Quantity(np.array) with shape (n_conformers, n_atoms, 3) and dimension of distance
+            Coordinates of the new conformers, with the second dimension of the array corresponding to the atom index
+            in the Molecule's indexing system.
 
         Returns
         -------
-        partial_charges : a simtk.unit.Quantity - wrapped numpy array [1 x n_atoms] or None
-            The partial charges on this Molecule's atoms. Returns None if no charges have been specified.
+        n_conformers: int
+            The number of conformers of the molecule after the addition
         """
-        return self._partial_charges
+        if not (len(coordinates.shape) == 3 and coordinates.shape[1:] == (self.n_atoms, 3)):
+            raise Exception(
+                "molecule.add_conformers given input of the wrong shape: "
+                "Given {}, expected (n_conformers, {}, 3)".format(coordinates.shape,
+                                                                  self.n_atoms))
 
-    @partial_charges.setter
-    def partial_charges(self, charges):
+        new_confs = self._coordinates_in_angstrom(coordinates)
+        n_new_confs = new_confs.shape[0]
+        self._reserve_conformers(self._n_conformers + n_new_confs)
+        self._conformer_buffer[self._n_conformers:self._n_conformers + n_new_confs] = new_confs
+        self._n_conformers += n_new_confs
+        return self._n_conformers
+
+    def _set_conformers(self, coordinates):
         """
-        Set the atomic partial charges for this molecule.
+        Replace all conformations of the molecule with a copy of ``coordinates``.
 
         Parameters
         ----------
-        charges : a simtk.unit.Quantity - wrapped numpy array [1 x n_atoms]
-            The partial charges to assign to the molecule. Must be in units compatible with simtk.unit.elementary_charge
+        coordinates: simtk.unit.Quantity(np.array) with shape (n_conformers, n_atoms, 3) and dimension of distance, or None
+            Coordinates of the new conformers. If None, all conformers are removed.
         """
-        assert hasattr(charges, 'unit')
-        assert unit.elementary_charge.is_compatible(charges.unit)
-        assert charges.shape == (self.n_atoms, )
+        self._replace_conformers(coordinates, copy=True)
 
-        charges_ec = charges.in_units_of(unit.elementary_charge)
+    def _adopt_conformers(self, coordinates):
+        """
+        Replace all conformations of the molecule, adopting ``coordinates`` as the conformer storage.
+
+        If ``coordinates`` is a C-contiguous float64 array in angstroms it is used without copying, so
+        later changes to the array are seen by the molecule. This is meant for arrays freshly built by
+        the caller, such as those of the toolkit and deserialization paths.
+
+        Parameters
+        ----------
+        coordinates: simtk.unit.Quantity(np.array) with shape (n_conformers, n_atoms, 3) and dimension of distance, or None
+            Coordinates of the new conformers. If None, all conformers are removed.
+        """
+        self._replace_conformers(coordinates, copy=False)
+
+    def _replace_conformers(self, coordinates, copy):
+        """Replace all conformations of the molecule, copying ``coordinates`` only if needed or requested."""
+        if coordinates is not None and not (len(coordinates.shape) == 3 and
+                                             coordinates.shape[1:] == (self.n_atoms, 3)):
+            raise Exception(
+                "molecule.set_conformers given input of the wrong shape: "
+                "Given {}, expected (n_conformers, {}, 3)".format(coordinates.shape,
+                                                                  self.n_atoms))
+
+        self._conformer_buffer = None
+        self._n_conformers = 0
+        if coordinates is None or coordinates.shape[0] == 0:
+            return
+        self._conformer_buffer = self._coordinates_in_angstrom(coordinates, copy=copy)
+        self._n_conformers = self._conformer_buffer.shape[0]
+
+    def _reserve_conformers(self, n_conformers):
+        """
+        Make sure the conformer buffer can hold at least ``n_conformers`` conformers, growing it
+        geometrically if needed. Views handed out before a reallocation no longer alias the buffer.
+        """
+        if self._conformer_buffer is not None and self._conformer_buffer.shape[0] >= n_conformers:
+            return
+        capacity = n_conformers
+        if self._conformer_buffer is not None:
+            capacity = max(n_conformers, 2 * self._conformer_buffer.shape[0])
+        new_buffer = np.empty((capacity, self.n_atoms, 3), dtype=np.float64)
+        if self._n_conformers != 0:
+            new_buffer[:self._n_conformers] = self._conformer_buffer[:self._n_conformers]
+        self._conformer_buffer = new_buffer
+
+    @staticmethod
+    def _coordinates_in_angstrom(coordinates, copy=False):
+        """
+        Return the unitless value of ``coordinates`` in angstroms as a C-contiguous float64 numpy array,
+        without copying if it is already stored that way and ``copy`` is False.
+        """
+        if not isinstance(coordinates, unit.Quantity):
+            raise Exception(
+                'Coordinates passed to Molecule._add_conformer without units. Ensure that coordinates are '
+                'of type simtk.units.Quantity')
+        if coordinates.unit == unit.angstrom:
+            coordinates_unitless = coordinates._value
+        else:
+            coordinates_unitless = coordinates.value_in_unit(unit.angstrom)
+        if copy:
+            return np.array(coordinates_unitless, dtype=np.float64, order='C')
+        return np.ascontiguousarray(coordinates_unitless, dtype=np.float64)
+
+    @property
+    def partial_charges(self):
+        """
+        Returns the partial charges (if present) on the molecule.
+
+        Returns
+        -------
+        partial_charges : a simtk.unit.Quantity - wrapped numpy array [1 x n_atoms] or None
+            The partial charges on this Molecule's atoms. Returns None if no charges have been specified.
+        """
+        return self._partial_charges
+
+    @partial_charges.setter
+    def partial_charges(self, charges):
+        """
+        Set the atomic partial charges for this molecule.
+
+        Parameters
+        ----------
+        charges : a simtk.unit.Quantity - wrapped numpy array [1 x n_atoms]
+            The partial charges to assign to the molecule. Must be in units compatible with simtk.unit.elementary_charge
+        """
+        assert hasattr(charges, 'unit')
+        assert unit.elementary_charge.is_compatible(charges.unit)
+        assert charges.shape == (self.n_atoms, )
+
+        charges_ec = charges.in_units_of(unit.elementary_charge)
         self._partial_charges = charges_ec
 
     @property
@@ -2939,20 +3738,17 @@ class FrozenMolecule(Serializable):
     @property
     def n_angles(self):
         """int: number of angles in the Molecule."""
-        self._construct_angles()
-        return len(self._angles)
+        return len(self._get_valence_term_indices('angles'))
 
     @property
     def n_propers(self):
         """int: number of proper torsions in the Molecule."""
-        self._construct_torsions()
-        return len(self._propers)
+        return len(self._get_valence_term_indices('propers'))
 
     @property
     def n_impropers(self):
         """int: number of improper torsions in the Molecule."""
-        self._construct_torsions()
-        return len(self._impropers)
+        return len(self._get_valence_term_indices('impropers'))
 
     @property
     def particles(self):
@@ -2972,21 +3768,40 @@ class FrozenMolecule(Serializable):
     @property
     def conformers(self):
         """
-        Returns the list of conformers for this molecule. This returns a list of simtk.unit.Quantity-wrapped numpy
-        arrays, of shape (3 x n_atoms) and with dimensions of distance. The return value is the actual list of
-        conformers, and changes to the contents affect the original FrozenMolecule.
+        Returns the list of conformers for this molecule, or None if there are none. This returns a list of
+        simtk.unit.Quantity-wrapped numpy arrays, of shape (n_atoms x 3) and with dimensions of distance. Each
+        array is a view into the molecule's conformer storage, so changes to the contents affect the original
+        FrozenMolecule.
+
+        The list itself is built on each access and raises ``TypeError`` on attempts to add, remove or
+        replace conformers through it. Use :py:meth:`Molecule.add_conformer`, :py:meth:`Molecule.add_conformers`
+        or :py:meth:`Molecule.set_conformers` instead.
 
         """
-        return self._conformers
+        if self._n_conformers == 0:
+            return None
+        return _ConformerList(unit.Quantity(conformer, unit.angstrom)
+                              for conformer in self._conformer_buffer[:self._n_conformers])
+
+    @property
+    def conformers_array(self):
+        """
+        Returns all conformers of this molecule as a single simtk.unit.Quantity-wrapped numpy array of shape
+        (n_conformers x n_atoms x 3) in angstroms, or None if there are none. The array is a view into the
+        molecule's conformer storage, so no data is copied and changes to the contents affect the original
+        FrozenMolecule.
+
+        """
+        if self._n_conformers == 0:
+            return None
+        return unit.Quantity(self._conformer_buffer[:self._n_conformers], unit.angstrom)
 
     @property
     def n_conformers(self):
         """
         Returns the number of conformers for this molecule.
         """
-        if self._conformers is None:
-            return 0
-        return len(self._conformers)
+        return self._n_conformers
 
     @property
     def virtual_sites(self):
@@ -3085,7 +3900,9 @@ class FrozenMolecule(Serializable):
         """
         Get the Hill formula of the molecule
         """
-        return Molecule.to_hill_formula(self)
+        if self._cached_hill_formula is None:
+            self._cached_hill_formula = Molecule.to_hill_formula(self)
+        return self._cached_hill_formula
 
     @staticmethod
     def to_hill_formula(molecule):
@@ -3106,6 +3923,7 @@ class FrozenMolecule(Serializable):
         NotImplementedError : if the molecule is not of one of the specified types.
         """
 
+        import networkx as nx
         from openforcefield.topology import TopologyMolecule
 
         # check for networkx then assuming we have a Molecule or TopologyMolecule instance just try and
@@ -3327,60 +4145,55 @@ class FrozenMolecule(Serializable):
         return Topology.from_molecules(self)
 
     @staticmethod
-    def from_file(file_path,
-                  file_format=None,
-                  toolkit_registry=GLOBAL_TOOLKIT_REGISTRY,
-                  allow_undefined_stereo=False):
+    def _get_file_format(file_path, file_format=None):
         """
-        Create one or more molecules from a file
-
-        .. todo::
-
-           * Extend this to also include some form of .offmol Open Force Field Molecule format?
-           * Generalize this to also include file-like objects?
+        Determine the format of a molecule file from its name, unless it is given explicitly.
 
         Parameters
         ----------
         file_path : str or file-like object
-            The path to the file or file-like object to stream one or more molecules from.
+            The path to the file or file-like object
         file_format : str, optional, default=None
-            Format specifier, usually file suffix (eg. 'MOL2', 'SMI')
-            Note that not all toolkits support all formats. Check ToolkitWrapper.toolkit_file_read_formats for your
-            loaded toolkits for details.
-        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper,
-        optional, default=GLOBAL_TOOLKIT_REGISTRY
-            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for file loading. If a Toolkit is passed, only
-            the highest-precedence toolkit is used
-        allow_undefined_stereo : bool, default=False
-            If false, raises an exception if oemol contains undefined stereochemistry.
+            Format specifier, usually file suffix (eg. 'MOL2', 'SMI'). If None, the suffix of ``file_path`` is used.
 
         Returns
         -------
-        molecules : Molecule or list of Molecules
-            If there is a single molecule in the file, a Molecule is returned;
-            otherwise, a list of Molecule objects is returned.
-
-        Examples
-        --------
-        >>> from openforcefield.tests.utils import get_monomer_mol2_file_path
-        >>> mol2_file_path = get_monomer_mol2_file_path('cyclohexane')
-        >>> molecule = Molecule.from_file(mol2_file_path)
-
+        file_format : str
+            The upper case format specifier
         """
-
         if file_format is None:
             if not (isinstance(file_path, str)):
                 raise Exception(
                     "If providing a file-like object for reading molecules, the format must be specified"
                 )
-            # Assume that files ending in ".gz" should use their second-to-last suffix for compatibility check
-            # TODO: Will all cheminformatics packages be OK with gzipped files?
-            if file_path[-3:] == '.gz':
+            # Assume that compressed files should use their second-to-last suffix for compatibility check
+            # TODO: Will all cheminformatics packages be OK with compressed files?
+            if file_path.endswith('.gz') or file_path.endswith('.bz2'):
                 file_format = file_path.split('.')[-2]
             else:
                 file_format = file_path.split('.')[-1]
         file_format = file_format.upper()
+        return file_format
+
+    @staticmethod
+    def _get_file_read_toolkit(file_path, file_format, toolkit_registry):
+        """
+        Find the highest priority toolkit that can read molecules from a file of the given format.
+
+        Parameters
+        ----------
+        file_path : str or file-like object
+            The path to the file or file-like object, used in error messages
+        file_format : str
+            The upper case format specifier
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for file loading
 
+        Returns
+        -------
+        toolkit : openforcefield.utils.toolkits.ToolkitWrapper
+            The toolkit to read the file with
+        """
         # Determine which toolkit to use (highest priority that's compatible with input type)
         if isinstance(toolkit_registry, ToolkitRegistry):
             # TODO: Encapsulate this logic into ToolkitRegistry.call()?
@@ -3426,6 +4239,53 @@ class FrozenMolecule(Serializable):
                 "'toolkit_registry' must be either a ToolkitRegistry or a ToolkitWrapper"
             )
 
+        return toolkit
+
+    @staticmethod
+    def from_file(file_path,
+                  file_format=None,
+                  toolkit_registry=GLOBAL_TOOLKIT_REGISTRY,
+                  allow_undefined_stereo=False):
+        """
+        Create one or more molecules from a file
+
+        .. todo::
+
+           * Extend this to also include some form of .offmol Open Force Field Molecule format?
+           * Generalize this to also include file-like objects?
+
+        Parameters
+        ----------
+        file_path : str or file-like object
+            The path to the file or file-like object to stream one or more molecules from.
+        file_format : str, optional, default=None
+            Format specifier, usually file suffix (eg. 'MOL2', 'SMI')
+            Note that not all toolkits support all formats. Check ToolkitWrapper.toolkit_file_read_formats for your
+            loaded toolkits for details.
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper,
+        optional, default=GLOBAL_TOOLKIT_REGISTRY
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for file loading. If a Toolkit is passed, only
+            the highest-precedence toolkit is used
+        allow_undefined_stereo : bool, default=False
+            If false, raises an exception if oemol contains undefined stereochemistry.
+
+        Returns
+        -------
+        molecules : Molecule or list of Molecules
+            If there is a single molecule in the file, a Molecule is returned;
+            otherwise, a list of Molecule objects is returned.
+
+        Examples
+        --------
+        >>> from openforcefield.tests.utils import get_monomer_mol2_file_path
+        >>> mol2_file_path = get_monomer_mol2_file_path('cyclohexane')
+        >>> molecule = Molecule.from_file(mol2_file_path)
+
+        """
+
+        file_format = FrozenMolecule._get_file_format(file_path, file_format)
+        toolkit = FrozenMolecule._get_file_read_toolkit(file_path, file_format, toolkit_registry)
+
         mols = list()
 
         if isinstance(file_path, str):
@@ -3448,6 +4308,73 @@ class FrozenMolecule(Serializable):
 
         return mols
 
+    @staticmethod
+    def iter_file(file_path,
+                  file_format=None,
+                  toolkit_registry=GLOBAL_TOOLKIT_REGISTRY,
+                  allow_undefined_stereo=False,
+                  start=0,
+                  stop=None,
+                  errors=None):
+        """
+        Lazily create molecules from the records of a file, one at a time.
+
+        Unlike :py:meth:`from_file`, the file is never read into memory as a whole, so arbitrarily large
+        files can be processed. Files whose names end in ``.gz`` or ``.bz2`` are decompressed on the fly.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the file to stream molecules from.
+        file_format : str, optional, default=None
+            Format specifier, usually file suffix (eg. 'SDF', 'SMI')
+            Note that not all toolkits support all formats. Check ToolkitWrapper.toolkit_file_read_formats for your
+            loaded toolkits for details.
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper,
+        optional, default=GLOBAL_TOOLKIT_REGISTRY
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for file loading. If a Toolkit is passed, only
+            the highest-precedence toolkit is used
+        allow_undefined_stereo : bool, default=False
+            If false, the records of molecules with undefined stereochemistry are reported as errors.
+        start : int, optional, default=0
+            The index of the first record to read. Together with ``stop``, this allows a file to be split into
+            shards that are processed independently.
+        stop : int, optional, default=None
+            The index of the record to stop reading before. If None, the file is read to the end.
+        errors : list, optional, default=None
+            If given, a ``(record_index, error)`` tuple is appended to this list for each record that could not be
+            parsed, sanitized or converted. Otherwise, a warning is logged for these records. In both cases they are
+            skipped.
+
+        Yields
+        ------
+        molecule : Molecule
+            The molecule of the next record in the file
+
+        Examples
+        --------
+        >>> from openforcefield.utils import get_data_file_path
+        >>> sdf_file_path = get_data_file_path('molecules/toluene.sdf')
+        >>> errors = list()
+        >>> for molecule in Molecule.iter_file(sdf_file_path, errors=errors):
+        ...     n_atoms = molecule.n_atoms
+
+        """
+        file_format = FrozenMolecule._get_file_format(file_path, file_format)
+        toolkit = FrozenMolecule._get_file_read_toolkit(file_path, file_format, toolkit_registry)
+
+        for record_index, molecule, error in toolkit.iter_file(file_path,
+                                                               file_format,
+                                                               allow_undefined_stereo=allow_undefined_stereo,
+                                                               start=start,
+                                                               stop=stop):
+            if error is None:
+                yield molecule
+            elif errors is not None:
+                errors.append((record_index, error))
+            else:
+                logger.warning(f'Skipping record {record_index} of {file_path}: {error}')
+
     def _to_xyz_file(self, file_path):
         """
         Write the current molecule and its conformers to a multiframe xyz file, if the molecule
@@ -3467,7 +4394,7 @@ class FrozenMolecule(Serializable):
             conformers = [unit.Quantity(np.zeros((self.n_atoms, 3), np.float), unit.angstrom)]
 
         else:
-            conformers = self._conformers
+            conformers = self.conformers
 
         if len(conformers) == 1:
             end = ''
@@ -3495,39 +4422,28 @@ class FrozenMolecule(Serializable):
         # now close the file
         xyz_data.close()
 
-    def to_file(self,
-                file_path,
-                file_format,
-                toolkit_registry=GLOBAL_TOOLKIT_REGISTRY):
-        """Write the current molecule to a file or file-like object
+    @staticmethod
+    def _get_file_write_toolkit(file_format, toolkit_registry):
+        """
+        Find the highest priority toolkit that can write molecules to a file of the given format.
 
         Parameters
         ----------
-        file_path : str or file-like object
-            A file-like object or the path to the file to be written.
         file_format : str
-            Format specifier, one of ['MOL2', 'MOL2H', 'SDF', 'PDB', 'SMI', 'CAN', 'TDT']
-            Note that not all toolkits support all formats
-        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper,
-        optional, default=GLOBAL_TOOLKIT_REGISTRY
-            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for file writing. If a Toolkit is passed, only
-            the highest-precedence toolkit is used
+            The upper case format specifier
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for file writing
+
+        Returns
+        -------
+        toolkit : openforcefield.utils.toolkits.ToolkitWrapper
+            The toolkit to write the file with
 
         Raises
         ------
         ValueError
             If the requested file_format is not supported by one of the installed cheminformatics toolkits
-
-        Examples
-        --------
-
-        >>> molecule = Molecule.from_iupac('imatinib')
-        >>> molecule.to_file('imatinib.mol2', file_format='mol2')  # doctest: +SKIP
-        >>> molecule.to_file('imatinib.sdf', file_format='sdf')  # doctest: +SKIP
-        >>> molecule.to_file('imatinib.pdb', file_format='pdb')  # doctest: +SKIP
-
         """
-
         if isinstance(toolkit_registry, ToolkitRegistry):
             pass
         elif isinstance(toolkit_registry, ToolkitWrapper):
@@ -3539,11 +4455,6 @@ class FrozenMolecule(Serializable):
                 "'toolkit_registry' must be either a ToolkitRegistry or a ToolkitWrapper"
             )
 
-        file_format = file_format.upper()
-        # check if xyz, use the toolkit independent method.
-        if file_format == 'XYZ':
-            return self._to_xyz_file(file_path=file_path)
-
         # Take the first toolkit that can write the desired output format
         toolkit = None
         for query_toolkit in toolkit_registry.registered_toolkits:
@@ -3562,6 +4473,48 @@ class FrozenMolecule(Serializable):
                 '(supported formats: {})'.format(file_format,
                                                  supported_formats))
 
+        return toolkit
+
+    def to_file(self,
+                file_path,
+                file_format,
+                toolkit_registry=GLOBAL_TOOLKIT_REGISTRY):
+        """Write the current molecule to a file or file-like object
+
+        Parameters
+        ----------
+        file_path : str or file-like object
+            A file-like object or the path to the file to be written.
+        file_format : str
+            Format specifier, one of ['MOL2', 'MOL2H', 'SDF', 'PDB', 'SMI', 'CAN', 'TDT']
+            Note that not all toolkits support all formats
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper,
+        optional, default=GLOBAL_TOOLKIT_REGISTRY
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for file writing. If a Toolkit is passed, only
+            the highest-precedence toolkit is used
+
+        Raises
+        ------
+        ValueError
+            If the requested file_format is not supported by one of the installed cheminformatics toolkits
+
+        Examples
+        --------
+
+        >>> molecule = Molecule.from_iupac('imatinib')
+        >>> molecule.to_file('imatinib.mol2', file_format='mol2')  # doctest: +SKIP
+        >>> molecule.to_file('imatinib.sdf', file_format='sdf')  # doctest: +SKIP
+        >>> molecule.to_file('imatinib.pdb', file_format='pdb')  # doctest: +SKIP
+
+        """
+
+        file_format = file_format.upper()
+        # check if xyz, use the toolkit independent method.
+        if file_format == 'XYZ':
+            return self._to_xyz_file(file_path=file_path)
+
+        toolkit = FrozenMolecule._get_file_write_toolkit(file_format, toolkit_registry)
+
         # Write file
         if type(file_path) == str:
             # Open file for writing
@@ -4004,12 +4957,10 @@ class FrozenMolecule(Serializable):
         new_molecule.partial_charges = new_charges * unit.elementary_charge
 
         # remap the conformers there can be more than one
-        if self.conformers is not None:
-            for conformer in self.conformers:
-                new_conformer = np.zeros((self.n_atoms, 3))
-                for i in range(self.n_atoms):
-                    new_conformer[i] = conformer[new_to_cur[i]].value_in_unit(unit.angstrom)
-                new_molecule.add_conformer(new_conformer * unit.angstrom)
+        if self.n_conformers != 0:
+            new_order = [new_to_cur[i] for i in range(self.n_atoms)]
+            new_conformers = self._conformer_buffer[:self._n_conformers, new_order]
+            new_molecule._adopt_conformers(unit.Quantity(new_conformers, unit.angstrom))
 
         # move any properties across
         new_molecule._properties = self._properties
@@ -4050,66 +5001,95 @@ class FrozenMolecule(Serializable):
         toolkit = OpenEyeToolkitWrapper()
         return toolkit.to_openeye(self, aromaticity_model=aromaticity_model)
 
+    def _construct_valence_term_indices(self):
+        """
+        Enumerate the angles, proper and improper torsions as arrays of atom indices.
+
+        The terms are found by extending the paths of bonded atoms, using an
+        integer adjacency list of the molecule.
+        """
+        if self._angle_indices is not None:
+            return
+
+        # Build the adjacency list from the bonds in both directions, grouped by first atom.
+        # Bond.atom1_index searches the list of atoms, so map the atoms to their indices once.
+        atom_indices = {id(atom): atom_index for atom_index, atom in enumerate(self._atoms)}
+        bond_indices = np.array([(atom_indices[id(bond.atom1)], atom_indices[id(bond.atom2)])
+                                 for bond in self._bonds], dtype=np.int64).reshape(-1, 2)
+        directed_bond_indices = np.concatenate([bond_indices, bond_indices[:, ::-1]])
+        directed_bond_indices = _sort_rows(directed_bond_indices)
+        neighbors = directed_bond_indices[:, 1]
+        n_neighbors = np.bincount(directed_bond_indices[:, 0], minlength=self.n_atoms)
+        neighbor_start = np.cumsum(n_neighbors) - n_neighbors
+        adjacency = (neighbors, neighbor_start, n_neighbors)
+
+        # i-j-k paths with i != k. Each angle appears in both directions.
+        angle_paths = _extend_paths(directed_bond_indices, 1, *adjacency)
+        angle_paths = angle_paths[angle_paths[:, 0] != angle_paths[:, 2]]
+
+        # i-j-k-l paths with j != l, and i != l to exclude i-j-k-i cycles.
+        proper_paths = _extend_paths(angle_paths, 2, *adjacency)
+        proper_paths = proper_paths[(proper_paths[:, 3] != proper_paths[:, 1]) &
+                                    (proper_paths[:, 3] != proper_paths[:, 0])]
+
+        # Impropers are all the ordered triplets of distinct atoms bonded to the central atom j, as i-j-k-l.
+        improper_paths = _extend_paths(angle_paths, 1, *adjacency)
+        improper_paths = improper_paths[(improper_paths[:, 3] != improper_paths[:, 0]) &
+                                        (improper_paths[:, 3] != improper_paths[:, 2])]
+
+        # Keep only the direction of angles and propers whose first atom index is the smallest.
+        self._angle_indices = _sort_rows(angle_paths[angle_paths[:, 0] < angle_paths[:, 2]])
+        self._proper_indices = _sort_rows(proper_paths[proper_paths[:, 0] < proper_paths[:, 3]])
+        self._improper_indices = _sort_rows(improper_paths)
+
+    def _get_valence_term_indices(self, valence_terms_name):
+        """
+        Return the atom indices of the angles, proper or improper torsions of the molecule.
+
+        Parameters
+        ----------
+        valence_terms_name : str
+            One of ``'angles'``, ``'propers'`` or ``'impropers'``.
+
+        Returns
+        -------
+        valence_term_indices : numpy.ndarray
+            A (n_terms, 3) array for angles or a (n_terms, 4) array for torsions,
+            with rows sorted lexicographically. The first atom index of angles
+            and proper torsions is smaller than the last one. This array must
+            not be modified.
+        """
+        self._construct_valence_term_indices()
+        if valence_terms_name == 'angles':
+            return self._angle_indices
+        elif valence_terms_name == 'propers':
+            return self._proper_indices
+        elif valence_terms_name == 'impropers':
+            return self._improper_indices
+        raise ValueError(f'Unknown valence terms {valence_terms_name}')
+
+    def _get_valence_term_atoms(self, valence_term_indices):
+        """Convert an array of atom indices to a set of Atom tuples."""
+        atoms = self._atoms
+        return set(tuple(atoms[atom_index] for atom_index in term) for term in valence_term_indices.tolist())
+
     def _construct_angles(self):
         """
-        Get an iterator over all i-j-k angles.
+        Construct the set of Atom tuples of the i-j-k angles.
         """
         # TODO: Build Angle objects instead of tuple of atoms.
-        if not hasattr(self, '_angles'):
-            self._construct_bonded_atoms_list()
-            self._angles = set()
-            for atom1 in self._atoms:
-                for atom2 in self._bondedAtoms[atom1]:
-                    for atom3 in self._bondedAtoms[atom2]:
-                        if atom1 == atom3:
-                            continue
-                        # TODO: Encapsulate this logic into an Angle class.
-                        if atom1.molecule_atom_index < atom3.molecule_atom_index:
-                            self._angles.add((atom1, atom2, atom3))
-                        else:
-                            self._angles.add((atom3, atom2, atom1))
+        if self._angles is None:
+            self._angles = self._get_valence_term_atoms(self._get_valence_term_indices('angles'))
 
     def _construct_torsions(self):
         """
         Construct sets containing the atoms improper and proper torsions
         """
         # TODO: Build Proper/ImproperTorsion objects instead of tuple of atoms.
-        if not hasattr(self, '_torsions'):
-            self._construct_bonded_atoms_list()
-
-            #self._torsions = set()
-            self._propers = set()
-            self._impropers = set()
-            for atom1 in self._atoms:
-                for atom2 in self._bondedAtoms[atom1]:
-                    for atom3 in self._bondedAtoms[atom2]:
-                        if atom1 == atom3:
-                            continue
-                        for atom4 in self._bondedAtoms[atom3]:
-                            if atom4 == atom2:
-                                continue
-                            # Exclude i-j-k-i
-                            if atom1 == atom4:
-                                continue
-
-                            if atom1.molecule_atom_index < atom4.molecule_atom_index:
-                                torsion = (atom1, atom2, atom3, atom4)
-                            else:
-                                torsion = (atom4, atom3, atom2, atom1)
-
-                            self._propers.add(torsion)
-
-                        for atom3i in self._bondedAtoms[atom2]:
-                            if atom3i == atom3:
-                                continue
-                            if atom3i == atom1:
-                                continue
-
-                            improper = (atom1, atom2, atom3, atom3i)
-                            self._impropers.add(improper)
-
+        if self._torsions is None:
+            self._propers = self._get_valence_term_atoms(self._get_valence_term_indices('propers'))
+            self._impropers = self._get_valence_term_atoms(self._get_valence_term_indices('impropers'))
             self._torsions = self._propers | self._impropers
-        #return iter(self._torsions)
 
     def _construct_bonded_atoms_list(self):
         """
@@ -4582,6 +5562,480 @@ class Molecule(FrozenMolecule):
 
         return self._add_conformer(coordinates)
 
+    def add_conformers(self, coordinates):
+        """
+        Add several conformations of the molecule in one call
+
+        Parameters
+        ----------
+        coordinates: simtk.unit.Quantity(np.array) with shape (n_conformers, n_atoms, 3) and dimension of distance
+            Coordinates of the new conformers, with the second dimension of the array corresponding to the atom index
+            in the Molecule's indexing system.
+
+        Returns
+        -------
+        n_conformers: int
+            The number of conformers of the molecule after the addition
+        """
+        return self._add_conformers(coordinates)
+
+    def set_conformers(self, coordinates):
+        """
+        Replace all conformations of the molecule in one call
+
+        The coordinates are copied, so later changes to ``coordinates`` do not affect the molecule.
+
+        Parameters
+        ----------
+        coordinates: simtk.unit.Quantity(np.array) with shape (n_conformers, n_atoms, 3) and dimension of distance, or None
+            Coordinates of the new conformers, with the second dimension of the array corresponding to the atom index
+            in the Molecule's indexing system. If None, all conformers are removed.
+        """
+        self._set_conformers(coordinates)
+
+
+#=============================================================================================
+# MoleculeWriter
+#=============================================================================================
+
+
+class MoleculeWriter:
+    """
+    Write many molecules, with all their conformers, to a single file.
+
+    Unlike calling :py:meth:`Molecule.to_file` for each molecule, the file and the toolkit output
+    stream are opened only once, and writes are buffered in large chunks. Files whose names end in
+    ``.gz`` or ``.bz2`` are compressed.
+
+    .. warning :: This API is experimental and subject to change.
+
+    Examples
+    --------
+
+    Write a library of molecules to a gzipped SDF file
+
+    >>> molecules = [Molecule.from_smiles(smiles) for smiles in ['CCO', 'c1ccccc1']]
+    >>> with MoleculeWriter('molecules.sdf.gz') as writer:  # doctest: +SKIP
+    ...     for molecule in molecules:
+    ...         writer.write(molecule)
+
+    """
+
+    def __init__(self,
+                 file_path,
+                 file_format=None,
+                 toolkit_registry=GLOBAL_TOOLKIT_REGISTRY,
+                 buffer_size=2**20):
+        """
+        Open a file to write molecules to.
+
+        Parameters
+        ----------
+        file_path : str or file-like object
+            The path to the file to be written, or a text file-like object to write to. A file-like
+            object is neither compressed nor closed by the writer.
+        file_format : str, optional, default=None
+            Format specifier, eg. 'SDF', 'MOL2' or 'SMI'. If None, the suffix of ``file_path`` is used.
+            Note that not all toolkits support all formats
+        toolkit_registry : openforcefield.utils.toolkits.ToolkitRegistry or openforcefield.utils.toolkits.ToolkitWrapper,
+        optional, default=GLOBAL_TOOLKIT_REGISTRY
+            :class:`ToolkitRegistry` or :class:`ToolkitWrapper` to use for file writing. If a Toolkit is passed, only
+            the highest-precedence toolkit is used
+        buffer_size : int, optional, default=2**20
+            The number of bytes to collect before writing to the file
+
+        Raises
+        ------
+        ValueError
+            If the requested file_format is not supported by one of the installed cheminformatics toolkits
+        """
+        if file_format is None:
+            file_format = FrozenMolecule._get_file_format(file_path)
+        file_format = file_format.upper()
+        toolkit = FrozenMolecule._get_file_write_toolkit(file_format, toolkit_registry)
+
+        if isinstance(file_path, str):
+            self._file_obj = io.TextIOWrapper(io.BufferedWriter(_open_file(file_path, 'wb'), buffer_size))
+            self._owns_file_obj = True
+        else:
+            self._file_obj = file_path
+            self._owns_file_obj = False
+        try:
+            self._writer = toolkit._open_molecule_writer(self._file_obj, file_format)
+        except Exception:
+            # Don't leak the file handle if the toolkit can't write to it.
+            if self._owns_file_obj:
+                self._file_obj.close()
+            raise
+        self._n_molecules = 0
+
+    @property
+    def n_molecules(self):
+        """The number of molecules written so far"""
+        return self._n_molecules
+
+    def write(self, molecule):
+        """
+        Write a molecule and all its conformers.
+
+        Parameters
+        ----------
+        molecule : openforcefield.topology.FrozenMolecule
+            The molecule to write
+        """
+        if self._writer is None:
+            raise ValueError('Can not write a molecule to a closed MoleculeWriter')
+        self._writer.write(molecule)
+        self._n_molecules += 1
+
+    def close(self):
+        """
+        Flush all buffered data and close the file, if it was opened by the writer.
+        """
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        if self._owns_file_obj:
+            self._file_obj.close()
+        else:
+            self._file_obj.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+#=============================================================================================
+# MoleculeArchive
+#=============================================================================================
+
+_ARCHIVE_MAGIC = b'OFFMARC1'
+# Arrays in an archive start at multiples of this many bytes so that they can be viewed without copying
+_ARCHIVE_ALIGNMENT = 64
+# Stereochemistry labels, indexed by the codes stored in an archive
+_ATOM_STEREO_LABELS = (None, 'R', 'S')
+_BOND_STEREO_LABELS = (None, 'E', 'Z')
+
+
+def _encode_strings(strings):
+    """
+    Pack strings into one UTF-8 byte array and an array of the offset of each string in it.
+    """
+    encoded = [string.encode() for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(string) for string in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+
+def _decode_strings(offsets, string_bytes, first, last):
+    """
+    Unpack strings ``first`` to ``last`` (exclusive) packed by ``_encode_strings``.
+    """
+    data = string_bytes[offsets[first]:offsets[last]].tobytes()
+    start = offsets[first]
+    return [data[begin - start:end - start].decode()
+            for begin, end in zip(offsets[first:last].tolist(), offsets[first + 1:last + 1].tolist())]
+
+
+class MoleculeArchive:
+    """
+    Read-only, random access to many molecules stored in a single columnar binary file.
+
+    The atoms, bonds, partial charges and conformers of all molecules are each stored contiguously in
+    one NumPy array, together with the offset of each molecule in them. The file is memory-mapped, so
+    opening an archive does not load it, and :py:meth:`get_conformers` and :py:meth:`get_partial_charges`
+    return read-only views into the file that are only read when accessed. Archives are written with
+    :py:meth:`write`.
+
+    Molecule properties and virtual sites are not stored.
+
+    .. warning :: This API is experimental and subject to change.
+
+    Examples
+    --------
+
+    Write a library of molecules to an archive and read one of them back
+
+    >>> molecules = [Molecule.from_smiles(smiles) for smiles in ['CCO', 'c1ccccc1']]
+    >>> MoleculeArchive.write('molecules.offarc', molecules)  # doctest: +SKIP
+    >>> with MoleculeArchive('molecules.offarc') as archive:  # doctest: +SKIP
+    ...     benzene = archive[1]
+
+    """
+
+    def __init__(self, file_path, mmap=True):
+        """
+        Open an archive.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the archive
+        mmap : bool, optional, default=True
+            If True, the file is memory-mapped. If False, the whole file is read into memory.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a molecule archive
+        """
+        if mmap:
+            self._buffer = np.memmap(file_path, dtype=np.uint8, mode='r')
+        else:
+            self._buffer = np.fromfile(file_path, dtype=np.uint8)
+            self._buffer.flags.writeable = False
+        magic_end = len(_ARCHIVE_MAGIC)
+        if self._buffer[:magic_end].tobytes() != _ARCHIVE_MAGIC:
+            raise ValueError(f'{file_path} is not a molecule archive')
+        header_length = int(self._buffer[magic_end:magic_end + 8].view('<u8')[0])
+        header = json.loads(self._buffer[magic_end + 8:magic_end + 8 + header_length].tobytes().decode())
+
+        self._n_molecules = header['n_molecules']
+        self._arrays = dict()
+        for array_name, (dtype, shape, offset) in header['arrays'].items():
+            n_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            self._arrays[array_name] = np.asarray(
+                self._buffer[offset:offset + n_bytes]).view(dtype).reshape(shape)
+
+    @staticmethod
+    def write(file_path, molecules):
+        """
+        Write molecules to a new archive.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the archive to write. An existing file is overwritten.
+        molecules : iterable of openforcefield.topology.FrozenMolecule
+            The molecules to write
+
+        Returns
+        -------
+        n_molecules : int
+            The number of molecules written
+
+        Raises
+        ------
+        ValueError
+            If a molecule has virtual sites
+        """
+        columns = {column: list() for column in [
+            'n_atoms', 'n_bonds', 'n_conformers', 'has_partial_charges', 'names',
+            'atomic_numbers', 'formal_charges', 'is_aromatic', 'atom_stereo', 'atom_names',
+            'bonds', 'bond_orders', 'bond_is_aromatic', 'bond_stereo', 'fractional_bond_orders',
+            'partial_charges', 'conformers']}
+        for molecule in molecules:
+            if molecule.n_virtual_sites != 0:
+                raise ValueError(f'Molecule {molecule.name} has virtual sites, which can not be archived')
+            n_atoms = molecule.n_atoms
+            columns['n_atoms'].append(n_atoms)
+            columns['n_bonds'].append(molecule.n_bonds)
+            columns['n_conformers'].append(molecule.n_conformers)
+            columns['names'].append(molecule.name)
+            for atom in molecule.atoms:
+                columns['atomic_numbers'].append(atom.atomic_number)
+                columns['formal_charges'].append(atom.formal_charge)
+                columns['is_aromatic'].append(atom.is_aromatic)
+                columns['atom_stereo'].append(_ATOM_STEREO_LABELS.index(atom.stereochemistry))
+                columns['atom_names'].append(atom.name)
+            for bond in molecule.bonds:
+                columns['bonds'].append((bond.atom1_index, bond.atom2_index))
+                columns['bond_orders'].append(bond.bond_order)
+                columns['bond_is_aromatic'].append(bond.is_aromatic)
+                columns['bond_stereo'].append(_BOND_STEREO_LABELS.index(bond.stereochemistry))
+                fractional_bond_order = bond.fractional_bond_order
+                columns['fractional_bond_orders'].append(
+                    np.nan if fractional_bond_order is None else fractional_bond_order)
+            if molecule.partial_charges is None:
+                columns['has_partial_charges'].append(False)
+                columns['partial_charges'].append(np.full(n_atoms, np.nan))
+            else:
+                columns['has_partial_charges'].append(True)
+                columns['partial_charges'].append(molecule.partial_charges.value_in_unit(unit.elementary_charge))
+            if molecule.n_conformers != 0:
+                columns['conformers'].append(
+                    molecule.conformers_array.value_in_unit(unit.angstrom).reshape(-1, 3))
+
+        n_molecules = len(columns['names'])
+        name_offsets, name_bytes = _encode_strings(columns['names'])
+        atom_name_offsets, atom_name_bytes = _encode_strings(columns['atom_names'])
+        arrays = OrderedDict([
+            ('atom_offsets', np.cumsum([0] + columns['n_atoms'], dtype=np.int64)),
+            ('bond_offsets', np.cumsum([0] + columns['n_bonds'], dtype=np.int64)),
+            ('conformer_offsets', np.cumsum(
+                [0] + [n_conformers * n_atoms for n_conformers, n_atoms
+                       in zip(columns['n_conformers'], columns['n_atoms'])], dtype=np.int64)),
+            ('has_partial_charges', np.array(columns['has_partial_charges'], dtype=bool)),
+            ('name_offsets', name_offsets),
+            ('name_bytes', name_bytes),
+            ('atomic_numbers', np.array(columns['atomic_numbers'], dtype=np.int16)),
+            ('formal_charges', np.array(columns['formal_charges'], dtype=np.int8)),
+            ('is_aromatic', np.array(columns['is_aromatic'], dtype=bool)),
+            ('atom_stereo', np.array(columns['atom_stereo'], dtype=np.uint8)),
+            ('atom_name_offsets', atom_name_offsets),
+            ('atom_name_bytes', atom_name_bytes),
+            ('bonds', np.array(columns['bonds'], dtype=np.int32).reshape(-1, 2)),
+            ('bond_orders', np.array(columns['bond_orders'], dtype=np.int8)),
+            ('bond_is_aromatic', np.array(columns['bond_is_aromatic'], dtype=bool)),
+            ('bond_stereo', np.array(columns['bond_stereo'], dtype=np.uint8)),
+            ('fractional_bond_orders', np.array(columns['fractional_bond_orders'], dtype=np.float64)),
+            ('partial_charges', np.concatenate(columns['partial_charges'] or [np.empty(0)]).astype(np.float64)),
+            ('conformers', np.concatenate(columns['conformers'] or [np.empty((0, 3))]).astype(np.float64)),
+        ])
+
+        # Lay out the arrays after the header, each starting at an aligned offset
+        def align(offset):
+            return -(-offset // _ARCHIVE_ALIGNMENT) * _ARCHIVE_ALIGNMENT
+
+        header = {'n_molecules': n_molecules, 'arrays': dict()}
+        header_bytes = b''
+        while True:
+            offset = align(len(_ARCHIVE_MAGIC) + 8 + len(header_bytes))
+            for array_name, array in arrays.items():
+                header['arrays'][array_name] = (array.dtype.str, array.shape, offset)
+                offset = align(offset + array.nbytes)
+            new_header_bytes = json.dumps(header).encode()
+            # The offsets depend on the header length, so repeat until it is stable
+            if len(new_header_bytes) == len(header_bytes):
+                break
+            header_bytes = new_header_bytes
+
+        with open(file_path, 'wb') as file_obj:
+            file_obj.write(_ARCHIVE_MAGIC)
+            file_obj.write(np.array(len(header_bytes), dtype='<u8').tobytes())
+            file_obj.write(header_bytes)
+            for array_name, array in arrays.items():
+                offset = header['arrays'][array_name][2]
+                file_obj.write(b'\0' * (offset - file_obj.tell()))
+                file_obj.write(np.ascontiguousarray(array).tobytes())
+        return n_molecules
+
+    def __len__(self):
+        return self._n_molecules
+
+    def _check_index(self, index):
+        """Return ``index`` as a non-negative integer, raising an IndexError if it is out of range"""
+        if not -self._n_molecules <= index < self._n_molecules:
+            raise IndexError(f'Molecule index {index} is out of range for an archive of '
+                             f'{self._n_molecules} molecules')
+        return int(index) % self._n_molecules
+
+    def get_conformers(self, index):
+        """
+        Get the conformers of a molecule without reading the rest of the molecule.
+
+        Parameters
+        ----------
+        index : int
+            The index of the molecule in the archive
+
+        Returns
+        -------
+        conformers : simtk.unit.Quantity wrapped numpy array of shape (n_conformers, n_atoms, 3)
+            The conformers, in angstroms, as a read-only view into the archive
+        """
+        index = self._check_index(index)
+        atom_offsets = self._arrays['atom_offsets']
+        conformer_offsets = self._arrays['conformer_offsets']
+        n_atoms = int(atom_offsets[index + 1] - atom_offsets[index])
+        conformers = self._arrays['conformers'][conformer_offsets[index]:conformer_offsets[index + 1]]
+        n_conformers = conformers.shape[0] // n_atoms if n_atoms != 0 else 0
+        return unit.Quantity(conformers.reshape(n_conformers, n_atoms, 3), unit.angstrom)
+
+    def get_partial_charges(self, index):
+        """
+        Get the partial charges of a molecule without reading the rest of the molecule.
+
+        Parameters
+        ----------
+        index : int
+            The index of the molecule in the archive
+
+        Returns
+        -------
+        partial_charges : simtk.unit.Quantity wrapped numpy array of shape (n_atoms,) or None
+            The partial charges, in elementary charges, as a read-only view into the archive. None if
+            the molecule has no partial charges.
+        """
+        index = self._check_index(index)
+        if not self._arrays['has_partial_charges'][index]:
+            return None
+        atom_offsets = self._arrays['atom_offsets']
+        return unit.Quantity(self._arrays['partial_charges'][atom_offsets[index]:atom_offsets[index + 1]],
+                             unit.elementary_charge)
+
+    def __getitem__(self, index):
+        """
+        Read a molecule from the archive.
+
+        Parameters
+        ----------
+        index : int
+            The index of the molecule in the archive
+
+        Returns
+        -------
+        molecule : openforcefield.topology.Molecule
+            The molecule, which does not share any data with the archive
+        """
+        index = self._check_index(index)
+        arrays = self._arrays
+        first_atom, last_atom = arrays['atom_offsets'][index:index + 2].tolist()
+        first_bond, last_bond = arrays['bond_offsets'][index:index + 2].tolist()
+        atom_slice = slice(first_atom, last_atom)
+        bond_slice = slice(first_bond, last_bond)
+
+        fractional_bond_orders = arrays['fractional_bond_orders'][bond_slice]
+        if np.isnan(fractional_bond_orders).all():
+            fractional_bond_orders = None
+        else:
+            fractional_bond_orders = [None if np.isnan(fractional_bond_order) else fractional_bond_order
+                                      for fractional_bond_order in fractional_bond_orders.tolist()]
+        molecule = Molecule.from_arrays(
+            arrays['atomic_numbers'][atom_slice],
+            arrays['formal_charges'][atom_slice],
+            arrays['is_aromatic'][atom_slice],
+            [_ATOM_STEREO_LABELS[code] for code in arrays['atom_stereo'][atom_slice].tolist()],
+            arrays['bonds'][bond_slice],
+            arrays['bond_orders'][bond_slice],
+            bond_is_aromatic=arrays['bond_is_aromatic'][bond_slice],
+            bond_stereo=[_BOND_STEREO_LABELS[code] for code in arrays['bond_stereo'][bond_slice].tolist()],
+            fractional_bond_orders=fractional_bond_orders,
+            atom_names=_decode_strings(arrays['atom_name_offsets'], arrays['atom_name_bytes'],
+                                       first_atom, last_atom),
+            name=_decode_strings(arrays['name_offsets'], arrays['name_bytes'], index, index + 1)[0])
+
+        partial_charges = self.get_partial_charges(index)
+        if partial_charges is not None:
+            molecule.partial_charges = unit.Quantity(np.array(partial_charges.value_in_unit(unit.elementary_charge)),
+                                                     unit.elementary_charge)
+        conformers = self.get_conformers(index)
+        if conformers.shape[0] != 0:
+            molecule._adopt_conformers(unit.Quantity(np.array(conformers.value_in_unit(unit.angstrom)),
+                                                   unit.angstrom))
+        return molecule
+
+    def __iter__(self):
+        for index in range(self._n_molecules):
+            yield self[index]
+
+    def close(self):
+        """
+        Release the archive file. Molecules read from the archive stay valid.
+        """
+        self._arrays = dict()
+        self._buffer = None
+        self._n_molecules = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 
 class InvalidConformerError(Exception):
     """
@@ -26,6 +26,7 @@ import itertools
 from collections.abc import MutableMapping
 from collections import OrderedDict
 
+import numpy as np
 from simtk import unit
 from simtk.openmm import app
 
@@ -35,7 +36,7 @@ from openforcefield.utils.toolkits import (
     GLOBAL_TOOLKIT_REGISTRY, ALLOWED_CHARGE_MODELS
 )
 from openforcefield.utils.serialization import Serializable
-from openforcefield.utils import MessageException
+from openforcefield.utils import MessageException, quantity_to_string, string_to_quantity
 
 #=============================================================================================
 # Exceptions
@@ -1508,16 +1509,167 @@ class Topology(Serializable):
                     matches.append(environment_match)
         return matches
 
-    def to_dict(self):
-        """Convert to dictionary representation."""
-        # Implement abstract method Serializable.to_dict()
-        raise NotImplementedError()  # TODO
+    def to_dict(self, numpy_arrays=False):
+        """
+        Return a dictionary representation of the topology.
+
+        Each reference molecule is stored once. The topology molecules are stored as runs of consecutive
+        copies of the same reference molecule, and only the atom orders of topology molecules whose atoms
+        are not in the order of their reference molecule are stored, so the size of the representation
+        grows with the number of unique molecules rather than atoms.
+
+        Parameters
+        ----------
+        numpy_arrays : bool, optional, default=False
+            If True, the topology molecule runs and atom orders, and the conformers and partial charges
+            of the reference molecules, are stored as numpy arrays, which is faster and more compact for
+            binary formats. Otherwise, the dictionary can be serialized with any of the ``Serializable``
+            formats.
+
+        Returns
+        -------
+        topology_dict : OrderedDict
+            A dictionary representation of the topology.
+
+        """
+        reference_molecules = list(self._reference_molecule_to_topology_molecules.keys())
+        reference_indices = {id(reference_molecule): index
+                             for index, reference_molecule in enumerate(reference_molecules)}
+
+        # Run-length encode the reference molecule of each topology molecule
+        topology_molecule_runs = list()
+        reordered_topology_molecules = list()
+        reordered_atom_indices = list()
+        for topology_molecule_index, topology_molecule in enumerate(self._topology_molecules):
+            reference_index = reference_indices[id(topology_molecule.reference_molecule)]
+            if len(topology_molecule_runs) != 0 and topology_molecule_runs[-1][0] == reference_index:
+                topology_molecule_runs[-1][1] += 1
+            else:
+                topology_molecule_runs.append([reference_index, 1])
+            top_to_ref_index = topology_molecule._top_to_ref_index
+            atom_order = [top_to_ref_index[index] for index in range(len(top_to_ref_index))]
+            if atom_order != list(range(len(atom_order))):
+                reordered_topology_molecules.append(topology_molecule_index)
+                reordered_atom_indices.extend(atom_order)
+
+        topology_dict = OrderedDict()
+        topology_dict['aromaticity_model'] = self._aromaticity_model
+        topology_dict['reference_molecules'] = [reference_molecule.to_dict(numpy_arrays=numpy_arrays)
+                                                for reference_molecule in reference_molecules]
+        if numpy_arrays:
+            topology_molecule_runs = np.array(topology_molecule_runs, dtype=np.int32).reshape(-1, 2)
+            reordered_topology_molecules = np.array(reordered_topology_molecules, dtype=np.int32)
+            reordered_atom_indices = np.array(reordered_atom_indices, dtype=np.int32)
+        topology_dict['topology_molecules'] = topology_molecule_runs
+        topology_dict['reordered_topology_molecules'] = reordered_topology_molecules
+        topology_dict['reordered_atom_indices'] = reordered_atom_indices
+        if self._box_vectors is None:
+            topology_dict['box_vectors'] = None
+            topology_dict['box_vectors_unit'] = None
+        else:
+            topology_dict['box_vectors'] = np.asarray(self._box_vectors.value_in_unit(unit.nanometer)).tolist()
+            topology_dict['box_vectors_unit'] = 'nanometer'
+        # Each constraint is stored in both orders, so only keep one of them. Constraints with a distance
+        # that is yet to be determined have no distance.
+        topology_dict['constraints'] = [
+            [iatom, jatom, None if distance is True else quantity_to_string(distance)]
+            for (iatom, jatom), distance in self._constrained_atom_pairs.items() if iatom < jatom]
+        return topology_dict
+
+    def _to_binary_dict(self):
+        """
+        Return the dictionary representation used by the binary serialization formats, with the
+        per-copy data and the reference molecule conformers and partial charges as numpy arrays.
+        """
+        return self.to_dict(numpy_arrays=True)
 
     @classmethod
-    def from_dict(cls, d):
-        """Static constructor from dictionary representation."""
-        # Implement abstract method Serializable.to_dict()
-        raise NotImplementedError()  # TODO
+    def from_dict(cls, topology_dict):
+        """
+        Create a new Topology from a dictionary representation
+
+        Parameters
+        ----------
+        topology_dict : OrderedDict
+            A dictionary representation of the topology, as returned by ``to_dict``, with or
+            without ``numpy_arrays``
+
+        Returns
+        -------
+        topology : Topology
+            A Topology created from the dictionary representation
+
+        """
+        topology = cls()
+        topology._initialize_from_dict(topology_dict)
+        return topology
+
+    def _initialize_from_dict(self, topology_dict):
+        """
+        Initialize this Topology from a dictionary representation
+
+        The topology molecules are created directly from their reference molecules, without
+        the uniqueness checks of ``add_molecule``.
+
+        Parameters
+        ----------
+        topology_dict : OrderedDict
+            A dictionary representation of the topology.
+        """
+        from openforcefield.topology.molecule import FrozenMolecule
+
+        self._initialize()
+        self._aromaticity_model = topology_dict['aromaticity_model']
+        reference_molecules = [FrozenMolecule.from_dict(molecule_dict)
+                               for molecule_dict in topology_dict['reference_molecules']]
+        for reference_molecule in reference_molecules:
+            self._reference_molecule_to_topology_molecules[reference_molecule] = list()
+
+        topology_molecule_runs = np.asarray(topology_dict['topology_molecules'], dtype=np.int64).reshape(-1, 2).tolist()
+        reordered_atom_indices = np.asarray(topology_dict['reordered_atom_indices'], dtype=np.int64).tolist()
+
+        # Split the atom orders between the reordered topology molecules
+        atom_orders = dict()
+        first_atom = 0
+        topology_molecule_index = 0
+        reordered_topology_molecules = iter(
+            np.asarray(topology_dict['reordered_topology_molecules'], dtype=np.int64).tolist())
+        next_reordered = next(reordered_topology_molecules, None)
+        for reference_index, n_copies in topology_molecule_runs:
+            n_atoms = reference_molecules[reference_index].n_atoms
+            while next_reordered is not None and next_reordered < topology_molecule_index + n_copies:
+                atom_orders[next_reordered] = reordered_atom_indices[first_atom:first_atom + n_atoms]
+                first_atom += n_atoms
+                next_reordered = next(reordered_topology_molecules, None)
+            topology_molecule_index += n_copies
+
+        for reference_index, n_copies in topology_molecule_runs:
+            reference_molecule = reference_molecules[reference_index]
+            copies = self._reference_molecule_to_topology_molecules[reference_molecule]
+            for _ in range(n_copies):
+                atom_order = atom_orders.get(len(self._topology_molecules))
+                if atom_order is not None:
+                    atom_order = dict(enumerate(atom_order))
+                topology_molecule = TopologyMolecule(reference_molecule, self, atom_order)
+                self._topology_molecules.append(topology_molecule)
+                copies.append(topology_molecule)
+
+        if topology_dict['box_vectors'] is not None:
+            self.box_vectors = unit.Quantity(np.array(topology_dict['box_vectors']),
+                                             getattr(unit, topology_dict['box_vectors_unit']))
+        for iatom, jatom, distance in topology_dict['constraints']:
+            self.add_constraint(iatom, jatom, True if distance is None else string_to_quantity(distance))
+
+    def copy_initializer(self, other):
+        """
+        Copy the contents of the specified topology.
+
+        Parameters
+        ----------
+        other : Topology
+            The topology to copy. A deep copy is made.
+        """
+        self._initialize_from_dict(other.to_dict())
 
     # TODO: Merge this into Molecule.from_networkx if/when we implement that.
     # TODO: can we now remove this as we have the ability to do this in the Molecule class?
@@ -1714,63 +1866,65 @@ class Topology(Serializable):
                 if not ref_mol.has_unique_atom_names:
                     ref_mol.generate_unique_atom_names()
 
-        # Keep track of which chains and residues have been added.
-        mol_to_chains = {}
-        mol_to_residues = {}
-
-        # Go through atoms in OpenFF to preserve the order.
+        # Build the atom names, elements and bonds of each reference molecule
+        # once. These templates are then stamped onto each topology molecule.
+        bond_types = {
+            1: Single,
+            2: Double,
+            3: Triple
+        }
+        ref_mol_templates = {}
+        for ref_mol, topology_molecules in self._reference_molecule_to_topology_molecules.items():
+            atom_templates = [(atom.name, OMMElement.getByAtomicNumber(atom.atomic_number))
+                              for atom in ref_mol.atoms]
+            bond_templates = [(bond.atom1_index, bond.atom2_index,
+                               Aromatic if bond.is_aromatic else bond_types[bond.bond_order],
+                               bond.bond_order)
+                              for bond in ref_mol.bonds]
+            # Add 1 chain per molecule unless there are more than 5 copies,
+            # in which case we add a single chain for all of them.
+            one_chain_per_molecule = len(topology_molecules) <= 5
+            ref_mol_templates[id(ref_mol)] = (atom_templates, bond_templates, one_chain_per_molecule)
+
+        # Go through the topology molecules in order to preserve the atom order,
+        # keeping track of the offset of the first atom of each molecule.
         omm_atoms = []
-        # We need to iterate over the topology molecules if we want to
-        # keep track of chains/residues as Atom.topology_molecule is
-        # instantiated every time and can't be used as a key.
-        for topology_molecule in self.topology_molecules:
-            for atom in topology_molecule.atoms:
-                reference_molecule = topology_molecule.reference_molecule
-                n_molecules = len(self._reference_molecule_to_topology_molecules[reference_molecule])
-
-                # Add 1 chain per molecule unless there are more than 5 copies,
-                # in which case we add a single chain for all of them.
-                if n_molecules <= 5:
-                    # We associate a chain to each molecule.
-                    key_molecule = topology_molecule
-                else:
-                    # We associate a chain to all the topology molecule.
-                    key_molecule = reference_molecule
+        atom_offsets = []
+        ref_mol_to_chain = {}
+        for topology_molecule in self._topology_molecules:
+            reference_molecule = topology_molecule.reference_molecule
+            atom_templates, _, one_chain_per_molecule = ref_mol_templates[id(reference_molecule)]
+            atom_offsets.append(len(omm_atoms))
+            if len(atom_templates) == 0:
+                continue
 
-                # Create a new chain if it doesn't exit.
+            # Create a new chain for the molecule, or for all copies of the reference molecule.
+            if one_chain_per_molecule:
+                chain = omm_topology.addChain()
+            else:
                 try:
-                    chain = mol_to_chains[key_molecule]
+                    chain = ref_mol_to_chain[id(reference_molecule)]
                 except KeyError:
                     chain = omm_topology.addChain()
-                    mol_to_chains[key_molecule] = chain
+                    ref_mol_to_chain[id(reference_molecule)] = chain
 
-                # Add one molecule for each topology molecule.
-                try:
-                    residue = mol_to_residues[topology_molecule]
-                except KeyError:
-                    residue = omm_topology.addResidue(reference_molecule.name, chain)
-                    mol_to_residues[topology_molecule] = residue
+            # Add one residue for each topology molecule.
+            residue = omm_topology.addResidue(reference_molecule.name, chain)
 
-                # Add atom.
-                element = OMMElement.getByAtomicNumber(atom.atomic_number)
-                omm_atom = omm_topology.addAtom(atom.atom.name, element, residue)
-
-                # Make sure that OpenFF and OpenMM Topology atoms have the same indices.
-                assert atom.topology_atom_index == int(omm_atom.id)-1
-                omm_atoms.append(omm_atom)
+            # Add the atoms in topology order.
+            top_to_ref_index = topology_molecule._top_to_ref_index
+            for top_index in range(len(atom_templates)):
+                name, element = atom_templates[top_to_ref_index[top_index]]
+                omm_atoms.append(omm_topology.addAtom(name, element, residue))
 
         # Add all bonds.
-        bond_types = {
-            1: Single,
-            2: Double,
-            3: Triple
-        }
-        for bond in self.topology_bonds:
-            atom1, atom2 = bond.atoms
-            atom1_idx, atom2_idx = atom1.topology_atom_index, atom2.topology_atom_index
-            bond_type = Aromatic if bond.bond.is_aromatic else bond_types[bond.bond_order]
-            omm_topology.addBond(omm_atoms[atom1_idx], omm_atoms[atom2_idx],
-                                 type=bond_type, order=bond.bond_order)
+        for topology_molecule, atom_offset in zip(self._topology_molecules, atom_offsets):
+            _, bond_templates, _ = ref_mol_templates[id(topology_molecule.reference_molecule)]
+            ref_to_top_index = topology_molecule._ref_to_top_index
+            for atom1_index, atom2_index, bond_type, bond_order in bond_templates:
+                omm_topology.addBond(omm_atoms[atom_offset + ref_to_top_index[atom1_index]],
+                                     omm_atoms[atom_offset + ref_to_top_index[atom2_index]],
+                                     type=bond_type, order=bond_order)
 
         if self.box_vectors is not None:
             omm_topology.setPeriodicBoxVectors(self.box_vectors)
@@ -40,7 +40,6 @@ __all__ = [
 import re
 import copy
 
-import networkx as nx
 from numpy import random
 
 import openforcefield.utils
@@ -523,6 +522,7 @@ class ChemicalEnvironment:
         # Note, not looking for ~ because that is used for empty bonds
 
         # Create an empty graph which will store Atom objects.
+        import networkx as nx
         self._graph = nx.Graph()
         self.label = label
         self.replacements = replacements
@@ -31,13 +31,19 @@ __all__ = [
 #=============================================================================================
 
 import copy
+import hashlib
+import json
 import logging
 import os
+import pickle
+import stat
+import sys
+import tempfile
 
 from collections import OrderedDict
 
 
-from simtk import openmm, unit
+from simtk import unit
 
 from openforcefield.utils import all_subclasses, MessageException, \
     convert_all_quantities_to_string, convert_all_strings_to_quantity, \
@@ -60,6 +66,39 @@ logger = logging.getLogger(__name__)
 # Directory paths used by ForceField to discover offxml files.
 _installed_offxml_dir_paths = []
 
+
+def _iter_entry_points(group):
+    """Iterate over the entry points registered in ``group``.
+
+    ``importlib.metadata`` is used when available, as importing
+    ``pkg_resources`` scans every installed distribution and is
+    comparatively slow.
+
+    Parameters
+    ----------
+    group : str
+        The name of the entry point group.
+
+    Returns
+    -------
+    entry_points : Iterable
+        The entry points registered in ``group``. Each provides a ``load()``
+        method.
+
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        # Python < 3.8
+        from pkg_resources import iter_entry_points
+        return iter_entry_points(group=group)
+
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, 'select'):
+        return all_entry_points.select(group=group)
+    # Python < 3.10 returns a dict mapping groups to entry points.
+    return all_entry_points.get(group, [])
+
 def _get_installed_offxml_dir_paths():
     """Return the list of directory paths where to search for offxml files.
 
@@ -77,14 +116,77 @@ def _get_installed_offxml_dir_paths():
     """
     global _installed_offxml_dir_paths
     if len(_installed_offxml_dir_paths) == 0:
-        from pkg_resources import iter_entry_points
         # Find all registered entry points that should return a list of
         # paths to directories where to search for offxml files.
-        for entry_point in iter_entry_points(group='openforcefield.smirnoff_forcefield_directory'):
+        for entry_point in _iter_entry_points(group='openforcefield.smirnoff_forcefield_directory'):
             _installed_offxml_dir_paths.extend(entry_point.load()())
     return _installed_offxml_dir_paths
 
 
+def _resolve_offxml_file_path(source):
+    """Return the path of the offxml file identified by ``source``.
+
+    The file is searched first relative to the current working directory,
+    then in the installed offxml directories and finally in the
+    openforcefield data directory.
+
+    Parameters
+    ----------
+    source : str
+        A file path or an XML string.
+
+    Returns
+    -------
+    source : str
+        The path to the file if one was found, otherwise ``source`` unchanged.
+
+    """
+    from openforcefield.utils import get_data_file_path
+
+    # Try first the simple path.
+    searched_dirs_paths = ['']
+    # Then try a relative file path w.r.t. an installed directory.
+    searched_dirs_paths.extend(_get_installed_offxml_dir_paths())
+    # Finally, search in openforcefield/data/.
+    # TODO: Remove this when smirnoff99Frosst 1.0.9 will be released.
+    searched_dirs_paths.append(get_data_file_path(''))
+
+    # Determine the actual path of the file.
+    # TODO: What is desired toolkit behavior if two files with the desired name are available?
+    for dir_path in searched_dirs_paths:
+        file_path = os.path.join(dir_path, source)
+        if os.path.isfile(file_path):
+            return file_path
+    return source
+
+
+def _hash_offxml_source(source):
+    """Return the SHA-256 digest of the content of a force field source.
+
+    Parameters
+    ----------
+    source : str or bytes
+        A file path, or the content of a force field as a string or bytes.
+
+    Returns
+    -------
+    digest : str or None
+        The hexadecimal digest, or None if the source cannot be hashed
+        without consuming it (e.g. an open file handle).
+
+    """
+    if isinstance(source, str):
+        file_path = _resolve_offxml_file_path(source)
+        if os.path.isfile(file_path):
+            with open(file_path, 'rb') as f:
+                source = f.read()
+        else:
+            source = source.encode('utf-8')
+    if not isinstance(source, bytes):
+        return None
+    return hashlib.sha256(source).hexdigest()
+
+
 # TODO: Instead of having a global version number, alow each Force to have a separate version number
 MAX_SUPPORTED_VERSION = '1.0'  # maximum version of the SMIRNOFF spec supported by this SMIRNOFF forcefield
 
@@ -221,7 +323,8 @@ class ForceField:
                  parameter_handler_classes=None,
                  parameter_io_handler_classes=None,
                  disable_version_check=False,
-                 allow_cosmetic_attributes=False):
+                 allow_cosmetic_attributes=False,
+                 cache_dir=None):
         """Create a new :class:`ForceField` object from one or more SMIRNOFF parameter definition files.
 
         Parameters
@@ -245,6 +348,18 @@ class ForceField:
             This option is primarily intended for forcefield development.
         allow_cosmetic_attributes : bool, optional. Default = False
             Whether to retain non-spec kwargs from data sources.
+        cache_dir : str, optional, default=None
+            If not None, the parsed parameter handlers are stored in a compiled binary cache in this directory and
+            reloaded from it the next time the same sources are requested, skipping the XML parsing and unit
+            conversion. A cache entry is only used if the content of all sources, the version of the toolkit and
+            the versions of the parameter handler classes and their modules match those used to create it.
+            Changes to the code of a parameter handler that don't change any of these versions are not detected,
+            so clear the cache directory after editing handler code. Sources given as open file handles are never
+            cached.
+
+            .. warning :: Cache entries are pickle files, and loading a pickle file can run arbitrary code.
+               Only use a directory that no untrusted user can write to. Cache files that are not owned by the
+               current user, or that are writable by its group or by others, are ignored.
 
         Examples
         --------
@@ -262,6 +377,12 @@ class ForceField:
         >>> offxml = '<SMIRNOFF version="0.2" aromaticity_model="OEAroModel_MDL"/>'
         >>> forcefield = ForceField(offxml)
 
+        Cache the parsed parameter set so that subsequent loads are faster:
+
+        >>> import tempfile
+        >>> cache_dir = tempfile.mkdtemp()
+        >>> forcefield = ForceField('test_forcefields/smirnoff99Frosst.offxml', cache_dir=cache_dir)
+
         """
         # Clear all object fields
         self._initialize()
@@ -284,9 +405,21 @@ class ForceField:
         self._register_parameter_io_handler_classes(
             parameter_io_handler_classes)
 
+        # Try to load the parameter handlers from the compiled cache before parsing
+        cache_file_path, source_hashes = None, None
+        if cache_dir is not None:
+            cache_file_path, source_hashes = self._get_compiled_cache_file_path(
+                sources, cache_dir, allow_cosmetic_attributes=allow_cosmetic_attributes)
+            if (cache_file_path is not None and
+                    self._load_compiled_cache(cache_file_path, source_hashes)):
+                return
+
         # Parse all sources containing SMIRNOFF parameter definitions
         self.parse_sources(sources, allow_cosmetic_attributes=allow_cosmetic_attributes)
 
+        if cache_file_path is not None:
+            self._save_compiled_cache(cache_file_path, source_hashes)
+
     def _initialize(self):
         """
         Initialize all object fields.
@@ -304,6 +437,144 @@ class ForceField:
         self._date = None
 
 
+    def _get_compiled_cache_file_path(self, sources, cache_dir, allow_cosmetic_attributes=False):
+        """
+        Return the path of the compiled cache file for the given sources.
+
+        The file name is derived from the content of the sources, the toolkit version, the registered
+        handler classes and their versions, and the parsing options, so that any change to them results in
+        a different entry. The version of a handler class is its ``_MAX_SUPPORTED_SECTION_VERSION`` and the
+        ``__version__`` of the module and package that define it, when they have one.
+
+        Parameters
+        ----------
+        sources : iterable of str or bytes or file-like objects
+            The sources passed to the constructor.
+        cache_dir : str
+            The directory containing the compiled cache files.
+        allow_cosmetic_attributes : bool, optional. Default = False
+            Whether non-spec kwargs are retained from the sources.
+
+        Returns
+        -------
+        cache_file_path : str or None
+            The path to the cache file, or None if the sources can't be cached.
+        source_hashes : list of str or None
+            The SHA-256 digest of each source, or None if the sources can't be cached.
+
+        """
+        from openforcefield import __version__ as toolkit_version
+
+        source_hashes = [_hash_offxml_source(source) for source in sources]
+        if None in source_hashes:
+            return None, None
+
+        def qualname(cls):
+            return cls.__module__ + '.' + cls.__qualname__
+
+        def handler_version(cls):
+            module_name = cls.__module__
+            package_name = module_name.split('.')[0]
+            module_versions = [str(getattr(sys.modules.get(name), '__version__', None))
+                               for name in (module_name, package_name)]
+            return [str(getattr(cls, '_MAX_SUPPORTED_SECTION_VERSION', None))] + module_versions
+
+        key_data = [
+            toolkit_version,
+            source_hashes,
+            [qualname(cls) for cls in self._parameter_handler_classes.values()],
+            [handler_version(cls) for cls in self._parameter_handler_classes.values()],
+            [qualname(cls) for cls in self._parameter_io_handler_classes.values()],
+            allow_cosmetic_attributes,
+            self.disable_version_check,
+        ]
+        key = hashlib.sha256(json.dumps(key_data).encode('utf-8')).hexdigest()
+        return os.path.join(cache_dir, key + '.offxml.pkl'), source_hashes
+
+    def _load_compiled_cache(self, cache_file_path, source_hashes):
+        """
+        Load the parameter handlers from a compiled cache file.
+
+        Parameters
+        ----------
+        cache_file_path : str
+            The path to the cache file.
+        source_hashes : list of str
+            The expected SHA-256 digest of each source.
+
+        Returns
+        -------
+        success : bool
+            True if the cache entry was valid and has been loaded.
+
+        """
+        from openforcefield import __version__ as toolkit_version
+
+        if not os.path.isfile(cache_file_path):
+            return False
+        try:
+            with open(cache_file_path, 'rb') as f:
+                # Unpickling can run arbitrary code, so only trust files that no one else could have written.
+                file_stat = os.fstat(f.fileno())
+                is_foreign = hasattr(os, 'getuid') and file_stat.st_uid != os.getuid()
+                if is_foreign or file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                    logger.warning(f"Ignoring force field cache file {cache_file_path}, which is not owned by the "
+                                   f"current user or is writable by other users")
+                    return False
+                cache_data = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read the force field cache file {cache_file_path}: {e}")
+            return False
+
+        if (cache_data.get('toolkit_version') != toolkit_version or
+                cache_data.get('source_hashes') != source_hashes):
+            logger.warning(f"Ignoring stale force field cache file {cache_file_path}")
+            return False
+
+        for attribute_name, value in cache_data['state'].items():
+            setattr(self, attribute_name, value)
+        return True
+
+    def _save_compiled_cache(self, cache_file_path, source_hashes):
+        """
+        Store the parameter handlers in a compiled cache file.
+
+        The file is written to a temporary location and then moved in place, so that concurrent processes
+        never read a partially written entry.
+
+        Parameters
+        ----------
+        cache_file_path : str
+            The path to the cache file.
+        source_hashes : list of str
+            The SHA-256 digest of each source.
+
+        """
+        from openforcefield import __version__ as toolkit_version
+
+        cache_data = {
+            'toolkit_version': toolkit_version,
+            'source_hashes': source_hashes,
+            'state': {
+                attribute_name: getattr(self, attribute_name)
+                for attribute_name in ['_parameter_handlers', '_aromaticity_model', '_author', '_date']
+            }
+        }
+        cache_dir = os.path.dirname(cache_file_path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            file_descriptor, temporary_file_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(file_descriptor, 'wb') as f:
+                    pickle.dump(cache_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporary_file_path, cache_file_path)
+            except BaseException:
+                os.remove(temporary_file_path)
+                raise
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            # Handlers with state that can't be pickled (e.g. in plugins) just aren't cached.
+            logger.warning(f"Could not write the force field cache file {cache_file_path}: {e}")
+
     def _check_smirnoff_version_compatibility(self, version):
         """
         Raise a parsing exception if the given file version is incompatible with this ForceField class.
@@ -915,26 +1186,10 @@ class ForceField:
             A representation of a SMIRNOFF-format data structure. Begins at top-level 'SMIRNOFF' key.
 
         """
-        from openforcefield.utils import get_data_file_path
-
         # Check whether this could be a file path. It could also be a
         # file handler or a simple XML string.
         if isinstance(source, str):
-            # Try first the simple path.
-            searched_dirs_paths = ['']
-            # Then try a relative file path w.r.t. an installed directory.
-            searched_dirs_paths.extend( _get_installed_offxml_dir_paths())
-            # Finally, search in openforcefield/data/.
-            # TODO: Remove this when smirnoff99Frosst 1.0.9 will be released.
-            searched_dirs_paths.append(get_data_file_path(''))
-
-            # Determine the actual path of the file.
-            # TODO: What is desired toolkit behavior if two files with the desired name are available?
-            for dir_path in searched_dirs_paths:
-                file_path = os.path.join(dir_path, source)
-                if os.path.isfile(file_path):
-                    source = file_path
-                    break
+            source = _resolve_offxml_file_path(source)
 
         # Process all SMIRNOFF definition files or objects
         # QUESTION: Allow users to specify forcefield URLs so they can pull forcefield definitions from the web too?
@@ -1100,6 +1355,8 @@ class ForceField:
             The newly created OpenMM System corresponding to the specified ``topology``
 
         """
+        from simtk import openmm
+
         # Make a deep copy of the topology so we don't accidentally modify it
         topology = copy.deepcopy(topology)
 
@@ -39,14 +39,15 @@ __all__ = [
 #=============================================================================================
 
 import copy
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 from enum import Enum
 import functools
 import inspect
 import logging
 import re
+import weakref
 
-from simtk import openmm, unit
+from simtk import unit
 
 from openforcefield.utils import attach_units,  \
     extract_serialized_units_from_dict, ToolkitUnavailableException, MessageException, \
@@ -252,6 +253,8 @@ class ParameterAttribute:
         self.default = default
         self._unit = unit
         self._converter = converter
+        # Units already checked for compatibility with self._unit.
+        self._compatible_units = set()
 
     def __set_name__(self, owner, name):
         self._name = '_' + name
@@ -307,10 +310,14 @@ class ParameterAttribute:
             # Convert eventual strings to Quantity objects.
             value = object_to_quantity(value)
 
-            # Check if units are compatible.
+            # Check if units are compatible. Parameters share only a few
+            # distinct units, so the result of the check is cached.
             try:
-                if not self._unit.is_compatible(value.unit):
-                    raise IncompatibleUnitError(f'{self.name}={value} should have units of {self._unit}')
+                value_unit = value.unit
+                if value_unit not in self._compatible_units:
+                    if not self._unit.is_compatible(value_unit):
+                        raise IncompatibleUnitError(f'{self.name}={value} should have units of {self._unit}')
+                    self._compatible_units.add(value_unit)
             except AttributeError:
                 # This is not a Quantity object.
                 raise IncompatibleUnitError(f'{self.name}={value} should have units of {self._unit}')
@@ -410,6 +417,10 @@ class IndexedParameterAttribute(ParameterAttribute):
         return value
 
 
+# Matches the index at the end of the name of an indexed attribute (e.g. "k2").
+_ATTRIBUTE_INDEX_REGEX = re.compile(r'\d+$')
+
+
 class _ParameterAttributeHandler:
     """A base class for ``ParameterType`` and ``ParameterHandler`` objects.
 
@@ -547,21 +558,37 @@ class _ParameterAttributeHandler:
             this parameter which can be accessed and written out. Otherwise,
             an exception will be raised.
 
+        """
+        # Do not modify the original data.
+        smirnoff_data = copy.deepcopy(kwargs)
+        self._initialize_attributes(smirnoff_data, allow_cosmetic_attributes)
+
+    def _initialize_attributes(self, smirnoff_data, allow_cosmetic_attributes=False):
+        """
+        Initialize parameter and cosmetic attributes from a dict that can be modified.
+
+        Parameters
+        ----------
+        smirnoff_data : dict
+            The attribute values, including the indexed ones (e.g. ``k1``, ``k2``).
+            The dict is modified in place.
+        allow_cosmetic_attributes : bool optional. Default = False
+            Whether to permit non-spec kwargs ("cosmetic attributes").
+
         """
         # A list that may be populated to record the cosmetic attributes
         # read from a SMIRNOFF data source.
         self._cosmetic_attribs = []
 
-        # Do not modify the original data.
-        smirnoff_data = copy.deepcopy(kwargs)
+        attribute_metadata = self._get_attribute_metadata()
 
         # Check for indexed attributes and stack them into a list.
         # Keep track of how many indexed attribute we find to make sure they all have the same length.
         indexed_attr_lengths = {}
-        for attrib_basename in self._get_indexed_parameter_attributes().keys():
+        for attrib_basename in attribute_metadata['indexed']:
             index = 1
             while True:
-                attrib_w_index = '{}{}'.format(attrib_basename, index)
+                attrib_w_index = f'{attrib_basename}{index}'
 
                 # Exit the while loop if the indexed attribute is not given.
                 try:
@@ -599,19 +626,18 @@ class _ParameterAttributeHandler:
                             f'different lengths: {indexed_attr_lengths}')
 
         # Check for missing required arguments.
-        given_attributes = set(smirnoff_data.keys())
-        required_attributes = set(self._get_required_parameter_attributes().keys())
-        missing_attributes = required_attributes.difference(given_attributes)
+        missing_attributes = attribute_metadata['required_names'].difference(smirnoff_data.keys())
         if len(missing_attributes) != 0:
             msg = (f"{self.__class__} require the following missing parameters: {sorted(missing_attributes)}."
                    f" Defined kwargs are {sorted(smirnoff_data.keys())}")
             raise SMIRNOFFSpecError(msg)
 
         # Finally, set attributes of this ParameterType and handle cosmetic attributes.
-        allowed_attributes = set(self._get_parameter_attributes().keys())
+        parameter_attributes = attribute_metadata['all']
         for key, val in smirnoff_data.items():
-            if key in allowed_attributes:
-                setattr(self, key, val)
+            if key in parameter_attributes:
+                # Go directly to the descriptor, all indexed attributes have been stacked.
+                parameter_attributes[key].__set__(self, val)
             # Handle all unknown kwargs as cosmetic so we can write them back out
             elif allow_cosmetic_attributes:
                 self.add_cosmetic_attribute(key, val)
@@ -672,7 +698,7 @@ class _ParameterAttributeHandler:
         attr_name, index = self._split_attribute_index(item)
 
         # Check if this is an indexed attribute.
-        if (index is not None) and attr_name in self._get_indexed_parameter_attributes():
+        if (index is not None) and attr_name in self._get_attribute_metadata()['indexed']:
             indexed_attr_value = getattr(self, attr_name)
             try:
                 return indexed_attr_value[index]
@@ -697,7 +723,7 @@ class _ParameterAttributeHandler:
 
         # Check if this is an indexed attribute. avoiding an infinite
         # recursion by calling getattr() with non-existing keys.
-        if (index is not None) and (attr_name in self._get_indexed_parameter_attributes()):
+        if (index is not None) and (attr_name in self._get_attribute_metadata()['indexed']):
             indexed_attr_value = getattr(self, attr_name)
             try:
                 indexed_attr_value[index] = value
@@ -773,7 +799,7 @@ class _ParameterAttributeHandler:
         If attribute_name doesn't end with an integer, it returns (item, None).
         """
         # Match any number (\d+) at the end of the string ($).
-        match = re.search(r'\d+$', item)
+        match = _ATTRIBUTE_INDEX_REGEX.search(item)
         if match is None:
             return item, None
 
@@ -816,9 +842,32 @@ class _ParameterAttributeHandler:
         True
 
         """
-        # If no filter is specified, get all the parameters.
+        parameter_attributes = cls._get_attribute_metadata()['all']
         if filter is None:
-            filter = lambda x: True
+            return OrderedDict(parameter_attributes)
+        return OrderedDict((name, descriptor) for name, descriptor in parameter_attributes.items()
+                           if filter(descriptor))
+
+    @classmethod
+    def _get_attribute_metadata(cls):
+        """Return the ParameterAttribute descriptors of this class grouped by kind.
+
+        The class is introspected only the first time this is called, and the
+        result is cached in the class. The returned objects must not be modified.
+
+        Returns
+        -------
+        attribute_metadata : dict
+            ``'all'``, ``'indexed'``, ``'required'`` and ``'optional'`` map
+            to ordered dicts from the attribute names to their descriptors,
+            and ``'required_names'`` is the frozenset of required attribute names.
+
+        """
+        # Look only in this class's own namespace, subclasses may define more attributes.
+        try:
+            return cls.__dict__['_attribute_metadata']
+        except KeyError:
+            pass
 
         # Go through MRO and retrieve also parents descriptors. The function
         # inspect.getmembers() automatically resolves the MRO, but it also
@@ -827,23 +876,37 @@ class _ParameterAttributeHandler:
         # starting from the parent class.
         parameter_attributes = OrderedDict((name, descriptor) for c in reversed(inspect.getmro(cls))
                                            for name, descriptor in c.__dict__.items()
-                                           if isinstance(descriptor, ParameterAttribute) and filter(descriptor))
-        return parameter_attributes
+                                           if isinstance(descriptor, ParameterAttribute))
+
+        def select(filter):
+            return OrderedDict((name, descriptor) for name, descriptor in parameter_attributes.items()
+                               if filter(descriptor))
+
+        required = select(lambda x: x.default is x.UNDEFINED)
+        attribute_metadata = {
+            'all': parameter_attributes,
+            'indexed': select(lambda x: isinstance(x, IndexedParameterAttribute)),
+            'required': required,
+            'optional': select(lambda x: x.default is not x.UNDEFINED),
+            'required_names': frozenset(required),
+        }
+        cls._attribute_metadata = attribute_metadata
+        return attribute_metadata
 
     @classmethod
     def _get_indexed_parameter_attributes(cls):
         """Shortcut to retrieve only IndexedParameterAttributes."""
-        return cls._get_parameter_attributes(filter=lambda x: isinstance(x, IndexedParameterAttribute))
+        return OrderedDict(cls._get_attribute_metadata()['indexed'])
 
     @classmethod
     def _get_required_parameter_attributes(cls):
         """Shortcut to retrieve only required ParameterAttributes."""
-        return cls._get_parameter_attributes(filter=lambda x: x.default is x.UNDEFINED)
+        return OrderedDict(cls._get_attribute_metadata()['required'])
 
     @classmethod
     def _get_optional_parameter_attributes(cls):
         """Shortcut to retrieve only required ParameterAttributes."""
-        return cls._get_parameter_attributes(filter=lambda x: x.default is not x.UNDEFINED)
+        return OrderedDict(cls._get_attribute_metadata()['optional'])
 
     def _get_defined_parameter_attributes(self):
         """Returns all the attributes except for the optional attributes that have None default value.
@@ -871,15 +934,19 @@ class ParameterList(list):
     """
     Parameter list that also supports accessing items by SMARTS string.
 
+    The positions of the parameters are indexed by SMIRKS and id, so that
+    lookups by SMIRKS do not require scanning the list. The index is updated
+    when parameters are added to the list or their SMIRKS and ids change,
+    and rebuilt lazily after other modifications of the list.
+
     .. warning :: This API is experimental and subject to change.
 
     """
 
-    # TODO: Make this faster by caching SMARTS -> index lookup?
-
     # TODO: Override __del__ to make sure we don't remove root atom type
 
-    # TODO: Allow retrieval by `id` as well
+    # The attributes of the parameters indexed by position.
+    _INDEXED_ATTRIBUTES = ('smirks', 'id')
 
     def __init__(self, input_parameter_list=None):
         """
@@ -893,12 +960,102 @@ class ParameterList(list):
             will be initialized empty.
         """
         super().__init__()
+        self._invalidate_index()
 
         input_parameter_list = input_parameter_list or []
         # TODO: Should a ParameterList only contain a single kind of ParameterType?
         for input_parameter in input_parameter_list:
             self.append(input_parameter)
 
+    def _invalidate_index(self):
+        """Mark the SMIRKS and id index as outdated."""
+        self._positions_by_attribute = None
+
+    def _is_index_valid(self):
+        """Return True if the index is up to date with the list and its parameters."""
+        return self._positions_by_attribute is not None
+
+    def _track_parameters(self, parameters):
+        """Let the parameters notify this list when their SMIRKS or id change."""
+        for parameter in parameters:
+            if isinstance(parameter, ParameterType):
+                parameter._add_parameter_list(self)
+
+    def _update_index(self, parameter, attribute_name, old_value, new_value):
+        """
+        Move the positions of a parameter whose SMIRKS or id changed to the new value in the index.
+
+        Parameters
+        ----------
+        parameter : ParameterType
+            The modified parameter.
+        attribute_name : str
+            Either 'smirks' or 'id'.
+        old_value : str or None
+            The value of the attribute before the modification.
+        new_value : str or None
+            The value of the attribute after the modification.
+        """
+        if not self._is_index_valid():
+            return
+        positions_by_value = self._positions_by_attribute[attribute_name]
+        try:
+            old_positions = positions_by_value.get(old_value, [])
+            moved_positions = [position for position in old_positions
+                               if list.__getitem__(self, position) is parameter]
+            if len(moved_positions) == 0:
+                return
+            remaining_positions = [position for position in old_positions if position not in moved_positions]
+            if len(remaining_positions) > 0:
+                positions_by_value[old_value] = remaining_positions
+            else:
+                del positions_by_value[old_value]
+            if new_value is not None:
+                positions_by_value[new_value] = sorted(positions_by_value.get(new_value, []) + moved_positions)
+        except TypeError:
+            # Unhashable values are not indexed.
+            self._invalidate_index()
+
+    def _add_to_index(self, parameter, position):
+        """Record the position of a parameter in the index."""
+        for attribute_name, positions in self._positions_by_attribute.items():
+            value = getattr(parameter, attribute_name)
+            if value is not None:
+                positions.setdefault(value, []).append(position)
+
+    def _get_positions(self, attribute_name, value):
+        """
+        Return the positions of the parameters with the given SMIRKS or id.
+
+        Parameters
+        ----------
+        attribute_name : str
+            Either 'smirks' or 'id'.
+        value : str
+            The value of the attribute to look up.
+
+        Returns
+        -------
+        positions : List[int]
+            The positions of the matching parameters in increasing order.
+        """
+        if not self._is_index_valid():
+            self._positions_by_attribute = {name: {} for name in self._INDEXED_ATTRIBUTES}
+            for position, parameter in enumerate(self):
+                self._add_to_index(parameter, position)
+
+        try:
+            positions = self._positions_by_attribute[attribute_name].get(value, [])
+        except TypeError:
+            # Unhashable values can't match any SMIRKS or id.
+            return []
+
+        # Attributes modified without going through the ParameterAttribute
+        # converters (e.g. ids reset to their None default) may leave stale
+        # entries, which are filtered here.
+        return [position for position in positions
+                if getattr(list.__getitem__(self, position), attribute_name) == value]
+
     def append(self, parameter):
         """
         Add a ParameterType object to the end of the ParameterList
@@ -910,6 +1067,9 @@ class ParameterList(list):
         """
         # TODO: Ensure that newly added parameter is the same type as existing?
         super().append(parameter)
+        self._track_parameters([parameter])
+        if self._is_index_valid():
+            self._add_to_index(parameter, len(self) - 1)
 
     def extend(self, other):
         """
@@ -925,7 +1085,12 @@ class ParameterList(list):
                   'but received {} (type {}) instead'.format(other, type(other))
             raise TypeError(msg)
         # TODO: Check if other ParameterList contains the same ParameterTypes?
+        first_position = len(self)
         super().extend(other)
+        self._track_parameters(other)
+        if self._is_index_valid():
+            for position in range(first_position, len(self)):
+                self._add_to_index(list.__getitem__(self, position), position)
 
     def index(self, item):
         """
@@ -945,10 +1110,10 @@ class ParameterList(list):
         if isinstance(item, ParameterType):
             return super().index(item)
         else:
-            for parameter in self:
-                if parameter.smirks == item:
-                    return self.index(parameter)
-            raise IndexError('SMIRKS {item} not found in ParameterList'.format(item=item))
+            positions = self._get_positions('smirks', item)
+            if len(positions) == 0:
+                raise IndexError('SMIRKS {item} not found in ParameterList'.format(item=item))
+            return positions[0]
 
     def insert(self, index, parameter):
         """
@@ -963,6 +1128,8 @@ class ParameterList(list):
         """
         # TODO: Ensure that newly added parameter is the same type as existing?
         super().insert(index, parameter)
+        self._track_parameters([parameter])
+        self._invalidate_index()
 
     def __delitem__(self, item):
         """
@@ -973,12 +1140,13 @@ class ParameterList(list):
         item : str or int
             SMIRKS or numerical index of item in this ParameterList
         """
-        if type(item) is int:
+        if type(item) is int or type(item) is slice:
             index = item
         else:
             # Try to find by SMIRKS
             index = self.index(item)
         super().__delitem__(index)
+        self._invalidate_index()
 
     def __getitem__(self, item):
         """
@@ -997,6 +1165,45 @@ class ParameterList(list):
             index = self.index(item)
         return super().__getitem__(index)
 
+    # The remaining list methods that modify the list must invalidate the index.
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._track_parameters(self if type(index) is slice else [value])
+        self._invalidate_index()
+
+    def __iadd__(self, other):
+        first_position = len(self)
+        result = super().__iadd__(other)
+        self._track_parameters(list.__getitem__(self, slice(first_position, None)))
+        self._invalidate_index()
+        return result
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._invalidate_index()
+        return result
+
+    def pop(self, index=-1):
+        parameter = super().pop(index)
+        self._invalidate_index()
+        return parameter
+
+    def remove(self, parameter):
+        super().remove(parameter)
+        self._invalidate_index()
+
+    def clear(self):
+        super().clear()
+        self._invalidate_index()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._invalidate_index()
+
+    def reverse(self):
+        super().reverse()
+        self._invalidate_index()
 
     # TODO: Override __setitem__ and __del__ to ensure we can slice by SMIRKS as well
     # This is needed for pickling. See https://github.com/openforcefield/openforcefield/issues/411
@@ -1004,7 +1211,10 @@ class ParameterList(list):
     # TODO: Is there a cleaner way (getstate/setstate perhaps?) to allow FFs to be
     #       pickled?
     def __reduce__(self):
-        return (__class__, ( list( self),), self.__dict__)
+        # The index is rebuilt after unpickling rather than serialized.
+        state = {key: value for key, value in self.__dict__.items()
+                 if key != '_positions_by_attribute'}
+        return (__class__, ( list( self),), state)
 
 
     def __contains__(self, item):
@@ -1017,7 +1227,7 @@ class ParameterList(list):
         """
         if isinstance(item, str):
             # Special case for SMIRKS strings
-            if item in [result.smirks for result in self]:
+            if len(self._get_positions('smirks', item)) > 0:
                 return True
         # Fall back to traditional access
         return list.__contains__(self, item)
@@ -1183,6 +1393,37 @@ class ParameterType(_ParameterAttributeHandler):
     id = ParameterAttribute(default=None)
     parent_id = ParameterAttribute(default=None)
 
+    def _add_parameter_list(self, parameter_list):
+        """Keep a weak reference to a ParameterList containing this parameter to update its index."""
+        # ParameterLists are unhashable, so the references are keyed by id.
+        parameter_lists = self.__dict__.setdefault('_parameter_lists', {})
+        parameter_lists[id(parameter_list)] = weakref.ref(parameter_list)
+
+    def _update_parameter_list_indices(self, attr, value):
+        """Update the indices of the ParameterLists containing this parameter if an indexed attribute changes."""
+        # Attributes that are being initialized are not in any index yet.
+        if attr._name not in self.__dict__ or self.__dict__[attr._name] == value:
+            return
+        parameter_lists = self.__dict__.get('_parameter_lists', {})
+        for list_id, parameter_list_ref in list(parameter_lists.items()):
+            parameter_list = parameter_list_ref()
+            if parameter_list is None:
+                del parameter_lists[list_id]
+            else:
+                parameter_list._update_index(self, attr.name, self.__dict__[attr._name], value)
+
+    def __getstate__(self):
+        # Weak references can't be pickled. The unpickled ParameterLists
+        # add themselves back when they are rebuilt.
+        state = self.__dict__.copy()
+        state.pop('_parameter_lists', None)
+        return state
+
+    @id.converter
+    def id(self, attr, id):
+        self._update_parameter_list_indices(attr, id)
+        return id
+
     @smirks.converter
     def smirks(self, attr, smirks):
         # Validate the SMIRKS string to ensure it matches the expected
@@ -1205,6 +1446,7 @@ class ParameterType(_ParameterAttributeHandler):
         #       This would require parameter type knows which ParameterList it belongs to
         ChemicalEnvironment.validate(
             smirks, ensure_valence_type=self._VALENCE_TYPE, toolkit=toolkit)
+        self._update_parameter_list_indices(attr, smirks)
         return smirks
 
     def __init__(self, smirks, allow_cosmetic_attributes=False, **kwargs):
@@ -1225,6 +1467,41 @@ class ParameterType(_ParameterAttributeHandler):
         kwargs['smirks']  = smirks
         super().__init__(allow_cosmetic_attributes=allow_cosmetic_attributes, **kwargs)
 
+    @classmethod
+    def _from_trusted_dicts(cls, smirnoff_dicts, allow_cosmetic_attributes=False):
+        """
+        Create many parameters from dicts owned by the caller.
+
+        This is equivalent to calling the constructor with each dict, but
+        the dicts are modified in place instead of being deep copied first.
+        Values are still converted and validated. Parameter types that
+        customize the constructor are created through it.
+
+        Parameters
+        ----------
+        smirnoff_dicts : iterable of dict
+            The attributes of each parameter. The dicts must not be used after
+            this call.
+        allow_cosmetic_attributes : bool optional. Default = False
+            Whether to permit non-spec kwargs ("cosmetic attributes").
+
+        Returns
+        -------
+        parameters : List[ParameterType]
+            The new parameters.
+
+        """
+        if cls.__init__ is not ParameterType.__init__:
+            return [cls(allow_cosmetic_attributes=allow_cosmetic_attributes, **smirnoff_data)
+                    for smirnoff_data in smirnoff_dicts]
+
+        parameters = []
+        for smirnoff_data in smirnoff_dicts:
+            parameter = cls.__new__(cls)
+            parameter._initialize_attributes(smirnoff_data, allow_cosmetic_attributes)
+            parameters.append(parameter)
+        return parameters
+
     def __repr__(self):
         ret_str = '<{} with '.format(self.__class__.__name__)
         for attr, val in self.to_dict().items():
@@ -1247,6 +1524,26 @@ class ParameterType(_ParameterAttributeHandler):
 #    to which atoms in specified mols.
 #======================================================================
 
+class _OpenMMForceClass:
+    """Class attribute resolving to an OpenMM Force class on first access.
+
+    This lets handlers declare their ``_OPENMMTYPE`` without importing OpenMM
+    when this module is imported.
+
+    Parameters
+    ----------
+    force_class_name : str
+        The name of the Force class in the ``simtk.openmm`` namespace.
+
+    """
+    def __init__(self, force_class_name):
+        self._force_class_name = force_class_name
+
+    def __get__(self, instance, owner):
+        from simtk import openmm
+        return getattr(openmm, self._force_class_name)
+
+
 # TODO: Should we have a parameter handler registry?
 
 class ParameterHandler(_ParameterAttributeHandler):
@@ -1369,11 +1666,12 @@ class ParameterHandler(_ParameterAttributeHandler):
             if not (isinstance(val, list)):
                 val = [val]
             # If we're reading the parameter list, iterate through and attach units to
-            # each parameter_dict, then use it to initialize a ParameterType
-            for unitless_param_dict in val:
-                param_dict = attach_units(unitless_param_dict, attached_units)
-                new_parameter = self._INFOTYPE(**param_dict,
-                                               allow_cosmetic_attributes=allow_cosmetic_attributes)
+            # each parameter_dict, then use it to initialize a ParameterType. attach_units()
+            # returns new dicts, so they don't need to be copied again by the constructor.
+            param_dicts = (attach_units(unitless_param_dict, attached_units) for unitless_param_dict in val)
+            new_parameters = self._INFOTYPE._from_trusted_dicts(
+                param_dicts, allow_cosmetic_attributes=allow_cosmetic_attributes)
+            for new_parameter in new_parameters:
                 self._parameters.append(new_parameter)
 
     @property
@@ -1433,7 +1731,16 @@ class ParameterHandler(_ParameterAttributeHandler):
             A list of matching ParameterType objects
         """
         # TODO: This is a necessary API point for Lee-Ping's ForceBalance
-        raise NotImplementedError()
+        # Use the SMIRKS or id index to find the candidates without scanning the list.
+        candidates = self._parameters
+        for attribute_name in ParameterList._INDEXED_ATTRIBUTES:
+            if attribute_name in parameter_attrs:
+                positions = self._parameters._get_positions(attribute_name, parameter_attrs[attribute_name])
+                candidates = [self._parameters[position] for position in positions]
+                break
+
+        return [parameter for parameter in candidates
+                if all(getattr(parameter, attr) == value for attr, value in parameter_attrs.items())]
 
     class _Match:
         """Represents a ParameterType which has been matched to
@@ -1623,64 +1930,92 @@ class ParameterHandler(_ParameterAttributeHandler):
     # -------------------------------
 
     @classmethod
-    def _check_all_valence_terms_assigned(cls, assigned_terms, valence_terms,
+    def _check_all_valence_terms_assigned(cls, assigned_terms, topology, valence_terms_name,
                                           exception_cls=UnassignedValenceParameterException):
         """Check that all valence terms have been assigned and print a user-friendly error message.
 
+        All the copies of a reference molecule are assigned the same parameters,
+        so the valence terms are checked only for the first copy of each
+        reference molecule and no system-wide list of terms is built.
+
         Parameters
         ----------
         assigned_terms : ValenceDict
             Atom index tuples defining added valence terms.
-        valence_terms : Iterable[TopologyAtom] or Iterable[Iterable[TopologyAtom]]
-            Atom or atom tuples defining topological valence terms.
+        topology : openforcefield.topology.Topology
+            The topology to which the valence terms were assigned.
+        valence_terms_name : str
+            The kind of valence terms to check. One of ``'atoms'``, ``'bonds'``,
+            ``'angles'`` or ``'propers'``.
         exception_cls : UnassignedValenceParameterException
             A specific exception class to raise to allow catching only specific
             types of errors.
 
         """
-        from openforcefield.topology import TopologyAtom
-        # Provided there are no duplicates in either list,
-        # or something weird like a bond has been added to
-        # a torsions list - this should work just fine I think.
-        # If we expect either of those assumptions to be incorrect,
-        # (i.e len(not_found_terms) > 0) we have bigger issues
-        # in the code and should be catching those cases elsewhere!
         # The fact that we graph match all topol molecules to ref
-        # molecules should avoid the len(not_found_terms) > 0 case.
-
-        if len(assigned_terms) == len(valence_terms):
+        # molecules should ensure there are no duplicate terms, and
+        # that no term is assigned twice or assigned to atoms that
+        # do not form a valence term in the topology.
+        ref_mol_to_topology_molecules = topology._reference_molecule_to_topology_molecules
+        n_valence_terms = sum(
+            len(topology_molecules) * getattr(reference_molecule, 'n_' + valence_terms_name)
+            for reference_molecule, topology_molecules in ref_mol_to_topology_molecules.items()
+        )
+        if len(assigned_terms) == n_valence_terms:
             return
 
-        # Convert the valence term to a valence dictionary to make sure
-        # the order of atom indices doesn't matter for comparison.
-        valence_terms_dict = assigned_terms.__class__()
-        for atoms in valence_terms:
-            try:
-                # valence_terms is a list of TopologyAtom tuples.
-                atom_indices = (a.topology_particle_index for a in atoms)
-            except TypeError:
-                # valence_terms is a list of TopologyAtom.
-                atom_indices = (atoms.topology_particle_index,)
-            valence_terms_dict[atom_indices] = atoms
-
-        # Check that both valence dictionaries have the same keys (i.e. terms).
-        assigned_terms_set = set(assigned_terms.keys())
-        valence_terms_set = set(valence_terms_dict.keys())
-        unassigned_terms = valence_terms_set.difference(assigned_terms_set)
-        not_found_terms = assigned_terms_set.difference(valence_terms_set)
+        # Find the topology atom index of the first atom of the first copy of each reference molecule.
+        first_copy_atom_start_indices = {}
+        top_mol_atom_start_index = 0
+        for topology_molecule in topology.topology_molecules:
+            first_copy_atom_start_indices.setdefault(id(topology_molecule.reference_molecule),
+                                                     (topology_molecule, top_mol_atom_start_index))
+            top_mol_atom_start_index += topology_molecule.n_atoms
+
+        def get_topology_molecule_terms(topology_molecule, atom_start_index):
+            # Convert the valence terms of the topology molecule to a valence dictionary
+            # to make sure the order of atom indices doesn't matter for comparison.
+            valence_terms_dict = assigned_terms.__class__()
+            for valence_term in getattr(topology_molecule.reference_molecule, valence_terms_name):
+                if valence_terms_name == 'atoms':
+                    ref_atom_indices = [valence_term.molecule_atom_index]
+                elif valence_terms_name == 'bonds':
+                    ref_atom_indices = [valence_term.atom1_index, valence_term.atom2_index]
+                else:
+                    ref_atom_indices = [atom.molecule_atom_index for atom in valence_term]
+                valence_terms_dict[[atom_start_index + topology_molecule._ref_to_top_index[i]
+                                    for i in ref_atom_indices]] = valence_term
+            return valence_terms_dict
+
+        unassigned_terms = []
+        n_unassigned_terms = 0
+        for reference_molecule, topology_molecules in ref_mol_to_topology_molecules.items():
+            topology_molecule, atom_start_index = first_copy_atom_start_indices[id(reference_molecule)]
+            valence_terms_dict = get_topology_molecule_terms(topology_molecule, atom_start_index)
+            unassigned_top_mol_terms = [key for key in valence_terms_dict if key not in assigned_terms]
+            unassigned_terms.extend(unassigned_top_mol_terms)
+            n_unassigned_terms += len(topology_molecules) * len(unassigned_top_mol_terms)
+
+        listed_copies = 'the first copy of each molecule'
+        if len(unassigned_terms) == 0 and len(assigned_terms) < n_valence_terms:
+            # The first copies are fully assigned, so the missing terms
+            # belong to other copies. Compare the terms of every copy.
+            listed_copies = 'all copies of each molecule'
+            top_mol_atom_start_index = 0
+            for topology_molecule in topology.topology_molecules:
+                valence_terms_dict = get_topology_molecule_terms(topology_molecule, top_mol_atom_start_index)
+                unassigned_terms.extend(key for key in valence_terms_dict if key not in assigned_terms)
+                top_mol_atom_start_index += topology_molecule.n_atoms
+            n_unassigned_terms = len(unassigned_terms)
+
+        # The remaining difference in the number of terms comes from assigned terms that are not in the topology.
+        n_not_found_terms = len(assigned_terms) - (n_valence_terms - n_unassigned_terms)
 
         # Raise an error if there are unassigned terms.
         err_msg = ""
 
+        unassigned_topology_atom_tuples = []
         if len(unassigned_terms) > 0:
-
-            unassigned_topology_atom_tuples = []
-
-            # Gain access to the relevant topology
-            if type(valence_terms[0]) is TopologyAtom:
-                topology = valence_terms[0].topology_molecule.topology
-            else:
-                topology = valence_terms[0][0].topology_molecule.topology
             unassigned_str = ''
             for unassigned_tuple in unassigned_terms:
                 unassigned_str += '\n- Topology indices ' + str(unassigned_tuple)
@@ -1694,22 +2029,28 @@ class ParameterHandler(_ParameterAttributeHandler):
                     unassigned_topology_atoms.append(topology_atom)
                     unassigned_str += f"({topology_atom.atom.name} {topology_atom.atom.element.symbol}), "
                 unassigned_topology_atom_tuples.append(tuple(unassigned_topology_atoms))
-            err_msg += ("{parameter_handler} was not able to find parameters for the following valence terms:\n"
+            err_msg += ("{parameter_handler} was not able to find parameters for the following valence terms "
+                        "(listed for {listed_copies}):\n"
                         "{unassigned_str}").format(parameter_handler=cls.__name__,
+                                                     listed_copies=listed_copies,
                                                      unassigned_str=unassigned_str)
-        if len(not_found_terms) > 0:
+        if n_not_found_terms > 0:
             if err_msg != "":
                 err_msg += '\n'
-            not_found_str = '\n- '.join([str(x) for x in not_found_terms])
-            err_msg += ("{parameter_handler} assigned terms that were not found in the topology:\n"
-                        "- {not_found_str}").format(parameter_handler=cls.__name__,
-                                                    not_found_str=not_found_str)
-        if err_msg != "":
-            err_msg += '\n'
-            exception = exception_cls(err_msg)
-            exception.unassigned_topology_atom_tuples = unassigned_topology_atom_tuples
-            exception.handler_class = cls
-            raise exception
+            err_msg += ("{parameter_handler} assigned {n_not_found_terms} terms that "
+                        "were not found in the topology").format(parameter_handler=cls.__name__,
+                                                                 n_not_found_terms=n_not_found_terms)
+        if err_msg == "":
+            # The terms could not be told apart, but their number is still wrong.
+            err_msg += ("{parameter_handler} assigned {n_assigned_terms} terms, but the topology "
+                        "has {n_valence_terms} terms").format(parameter_handler=cls.__name__,
+                                                              n_assigned_terms=len(assigned_terms),
+                                                              n_valence_terms=n_valence_terms)
+        err_msg += '\n'
+        exception = exception_cls(err_msg)
+        exception.unassigned_topology_atom_tuples = unassigned_topology_atom_tuples
+        exception.handler_class = cls
+        raise exception
 
 
     def _check_attributes_are_equal(self, other, identical_attrs=(),
@@ -1819,7 +2160,7 @@ class BondHandler(ParameterHandler):
 
     _TAGNAME = 'Bonds'  # SMIRNOFF tag name to process
     _INFOTYPE = BondType  # class to hold force type info
-    _OPENMMTYPE = openmm.HarmonicBondForce  # OpenMM force class to create
+    _OPENMMTYPE = _OpenMMForceClass('HarmonicBondForce')  # OpenMM force class to create
     _DEPENDENCIES = [ConstraintHandler]  # ConstraintHandler must be executed first
 
     potential = ParameterAttribute(default='harmonic')
@@ -1910,8 +2251,8 @@ class BondHandler(ParameterHandler):
             len(bond_matches) - skipped_constrained_bonds, skipped_constrained_bonds))
 
         # Check that no topological bonds are missing force parameters.
-        valence_terms = [list(b.atoms) for b in topology.topology_bonds]
-        self._check_all_valence_terms_assigned(assigned_terms=bond_matches, valence_terms=valence_terms,
+        self._check_all_valence_terms_assigned(assigned_terms=bond_matches, topology=topology,
+                                               valence_terms_name='bonds',
                                                exception_cls=UnassignedBondParameterException)
 
 
@@ -1937,7 +2278,7 @@ class AngleHandler(ParameterHandler):
 
     _TAGNAME = 'Angles'  # SMIRNOFF tag name to process
     _INFOTYPE = AngleType  # class to hold force type info
-    _OPENMMTYPE = openmm.HarmonicAngleForce  # OpenMM force class to create
+    _OPENMMTYPE = _OpenMMForceClass('HarmonicAngleForce')  # OpenMM force class to create
     _DEPENDENCIES = [ConstraintHandler]  # ConstraintHandler must be executed first
 
     potential = ParameterAttribute(default='harmonic')
@@ -1995,8 +2336,8 @@ class AngleHandler(ParameterHandler):
             skipped_constrained_angles))
 
         # Check that no topological angles are missing force parameters
-        self._check_all_valence_terms_assigned(assigned_terms=angle_matches,
-                                               valence_terms=list(topology.angles),
+        self._check_all_valence_terms_assigned(assigned_terms=angle_matches, topology=topology,
+                                               valence_terms_name='angles',
                                                exception_cls=UnassignedAngleParameterException)
 
 
@@ -2047,7 +2388,7 @@ class ProperTorsionHandler(ParameterHandler):
 
     _TAGNAME = 'ProperTorsions'  # SMIRNOFF tag name to process
     _INFOTYPE = ProperTorsionType  # info type to store
-    _OPENMMTYPE = openmm.PeriodicTorsionForce  # OpenMM force class to create
+    _OPENMMTYPE = _OpenMMForceClass('PeriodicTorsionForce')  # OpenMM force class to create
 
     potential = ParameterAttribute(
         default='k*(1+cos(periodicity*theta-phase))',
@@ -2113,16 +2454,8 @@ class ProperTorsionHandler(ParameterHandler):
         logger.info('{} torsions added'.format(len(torsion_matches)))
 
         # Check that no topological torsions are missing force parameters
-
-        # I can see the apeal of these kind of methods as an 'absolute' check
-        # that things have gone well, but I think just making sure that the
-        # reference molecule has been fully parametrised should have the same
-        # effect! It would be good to eventually refactor things so that everything
-        # is focused on the single unique molecules, and then simply just cloned
-        # onto the system. It seems like John's proposed System object would do
-        # exactly this.
-        self._check_all_valence_terms_assigned(assigned_terms=torsion_matches,
-                                               valence_terms=list(topology.propers),
+        self._check_all_valence_terms_assigned(assigned_terms=torsion_matches, topology=topology,
+                                               valence_terms_name='propers',
                                                exception_cls=UnassignedProperTorsionParameterException)
 
 
@@ -2149,7 +2482,7 @@ class ImproperTorsionHandler(ParameterHandler):
 
     _TAGNAME = 'ImproperTorsions'  # SMIRNOFF tag name to process
     _INFOTYPE = ImproperTorsionType  # info type to store
-    _OPENMMTYPE = openmm.PeriodicTorsionForce  # OpenMM force class to create
+    _OPENMMTYPE = _OpenMMForceClass('PeriodicTorsionForce')  # OpenMM force class to create
 
     potential = ParameterAttribute(
         default='k*(1+cos(periodicity*theta-phase))',
@@ -2201,6 +2534,7 @@ class ImproperTorsionHandler(ParameterHandler):
         return self._find_matches(entity, transformed_dict_cls=ImproperDict)
 
     def create_force(self, system, topology, **kwargs):
+        from simtk import openmm
         #force = super(ImproperTorsionHandler, self).create_force(system, topology, **kwargs)
         #force = super().create_force(system, topology, **kwargs)
         existing = [system.getForce(i) for i in range(system.getNumForces())]
@@ -2250,7 +2584,7 @@ class ImproperTorsionHandler(ParameterHandler):
 
 class _NonbondedHandler(ParameterHandler):
     """Base class for ParameterHandlers that deal with OpenMM NonbondedForce objects."""
-    _OPENMMTYPE = openmm.NonbondedForce
+    _OPENMMTYPE = _OpenMMForceClass('NonbondedForce')
 
     def create_force(self, system, topology, **kwargs):
         # If we aren't yet keeping track of which molecules' charges have been assigned by which charge methods,
@@ -2420,13 +2754,17 @@ class vdWHandler(_NonbondedHandler):
                                          tolerance=self._SCALETOL)
 
     def create_force(self, system, topology, **kwargs):
+        from simtk import openmm
+
         force = super().create_force(system, topology, **kwargs)
 
         # If we're using PME, then the only possible openMM Nonbonded type is LJPME
         if self._method == 'PME':
-            # If we're given a nonperiodic box, we always set NoCutoff. Later we'll add support for CutoffNonPeriodic
+            # If we're given a nonperiodic box, we set NoCutoff. ElectrostaticsHandler may switch this
+            # to CutoffNonPeriodic at this handler's cutoff if its method is reaction-field.
             if (topology.box_vectors is None):
                 force.setNonbondedMethod(openmm.NonbondedForce.NoCutoff)
+                force.setCutoffDistance(self._cutoff)
                 # if (topology.box_vectors is None):
                 #     raise SMIRNOFFSpecError("If vdW method is  PME, a periodic Topology "
                 #                             "must be provided")
@@ -2435,11 +2773,12 @@ class vdWHandler(_NonbondedHandler):
                 force.setCutoffDistance(9. * unit.angstrom)
                 force.setEwaldErrorTolerance(1.e-4)
 
-        # If method is cutoff, then we currently support openMM's PME for periodic system and NoCutoff for nonperiodic
+        # If method is cutoff, then we currently support openMM's PME for periodic system and NoCutoff for nonperiodic.
+        # ElectrostaticsHandler may switch these to CutoffPeriodic or CutoffNonPeriodic depending on its method.
         elif self._method == 'cutoff':
-            # If we're given a nonperiodic box, we always set NoCutoff. Later we'll add support for CutoffNonPeriodic
             if (topology.box_vectors is None):
                 force.setNonbondedMethod(openmm.NonbondedForce.NoCutoff)
+                force.setCutoffDistance(self._cutoff)
             else:
                 force.setNonbondedMethod(openmm.NonbondedForce.PME)
                 force.setUseDispersionCorrection(True)
@@ -2461,29 +2800,33 @@ class vdWHandler(_NonbondedHandler):
                                         ljtype.epsilon)
 
         # Check that no atoms (n.b. not particles) are missing force parameters.
-        self._check_all_valence_terms_assigned(assigned_terms=atom_matches,
-                                               valence_terms=list(topology.topology_atoms))
+        self._check_all_valence_terms_assigned(assigned_terms=atom_matches, topology=topology,
+                                               valence_terms_name='atoms')
 
     # TODO: Can we express separate constraints for postprocessing and normal processing?
     def postprocess_system(self, system, topology, **kwargs):
+        from simtk import openmm
         # Create exceptions based on bonds.
         # TODO: This postprocessing must occur after the ChargeIncrementModelHandler
         # QUESTION: Will we want to do this for *all* cases, or would we ever want flexibility here?
-        bond_particle_indices = []
 
+        # The bonds of each reference molecule are collected once and offset for each of its copies.
+        ref_mol_bond_indices = {}
+        bond_particle_indices = []
+        top_mol_particle_start_index = 0
         for topology_molecule in topology.topology_molecules:
+            reference_molecule = topology_molecule.reference_molecule
+            try:
+                bond_indices = ref_mol_bond_indices[id(reference_molecule)]
+            except KeyError:
+                bond_indices = [(bond.atom1_index, bond.atom2_index) for bond in reference_molecule.bonds]
+                ref_mol_bond_indices[id(reference_molecule)] = bond_indices
 
-            top_mol_particle_start_index = topology_molecule.atom_start_topology_index
-
-            for topology_bond in topology_molecule.bonds:
-
-                top_index_1 = topology_molecule._ref_to_top_index[topology_bond.bond.atom1_index]
-                top_index_2 = topology_molecule._ref_to_top_index[topology_bond.bond.atom2_index]
-
-                top_index_1 += top_mol_particle_start_index
-                top_index_2 += top_mol_particle_start_index
-
-                bond_particle_indices.append((top_index_1, top_index_2))
+            ref_to_top_index = topology_molecule._ref_to_top_index
+            for ref_index_1, ref_index_2 in bond_indices:
+                bond_particle_indices.append((ref_to_top_index[ref_index_1] + top_mol_particle_start_index,
+                                              ref_to_top_index[ref_index_2] + top_mol_particle_start_index))
+            top_mol_particle_start_index += topology_molecule.n_atoms
 
         for force in system.getForces():
             # TODO: Should we just store which `Force` object we are adding to and use that instead,
@@ -2516,7 +2859,7 @@ class ElectrostaticsHandler(_NonbondedHandler):
     switch_width = ParameterAttribute(default=0.0 * unit.angstrom, unit=unit.angstrom)
     method = ParameterAttribute(
         default='PME',
-        converter=_allow_only(['Coulomb', 'PME'])
+        converter=_allow_only(['Coulomb', 'PME', 'reaction-field'])
     )
 
     # TODO: Use _allow_only when ParameterAttribute will support multiple converters (it'll be easy when we switch to use the attrs library)
@@ -2594,12 +2937,55 @@ class ElectrostaticsHandler(_NonbondedHandler):
         match_found : bool
             Whether a match was found. If True, the input molecule will have been modified in-place.
         """
+        charge_mols_index = self._index_charge_from_molecules(charge_mols)
+        return self._assign_charge_from_indexed_molecules(molecule, charge_mols_index)
 
-        import simtk.unit
+    @staticmethod
+    def _index_charge_from_molecules(charge_mols):
+        """
+        Group a list of charged molecules by their cached graph invariants, so that the candidate
+        matches for a molecule can be looked up without isomorphism checks against every molecule.
+        The invariants are computed without a toolkit and are equal for any two isomorphic molecules.
+
+        Parameters
+        ----------
+        charge_mols : list of [openforcefield.topology.FrozenMolecule]
+            A list of molecules with charges already assigned.
 
-        # Check each charge_mol for whether it's isomorphic to the input molecule
+        Returns
+        -------
+        charge_mols_index : dict of tuple: list of [openforcefield.topology.FrozenMolecule]
+            The molecules of ``charge_mols`` keyed by their graph invariants, in their original order.
+        """
+        charge_mols_index = OrderedDict()
         for charge_mol in charge_mols:
-            ismorphic, topology_atom_map = Molecule.are_isomorphic(molecule, charge_mol,
+            charge_mols_index.setdefault(charge_mol._get_graph_invariants(), []).append(charge_mol)
+        return charge_mols_index
+
+    def _assign_charge_from_indexed_molecules(self, molecule, charge_mols_index):
+        """
+        Given an input molecule, look up the charged molecules with the same graph invariants and
+        assign partial charges from the first isomorphic one to the input molecule.
+
+        Parameters
+        ----------
+        molecule : an openforcefield.topology.FrozenMolecule
+            The molecule to have partial charges assigned if a match is found.
+        charge_mols_index : dict of tuple: list of [openforcefield.topology.FrozenMolecule]
+            Molecules with charges already assigned, as returned by ``_index_charge_from_molecules``.
+
+        Returns
+        -------
+        match_found : bool
+            Whether a match was found. If True, the input molecule will have been modified in-place.
+        """
+
+        import simtk.unit
+
+        # Only the charge_mols with the same invariants can be isomorphic to the input molecule,
+        # the full isomorphism check is still needed to rule out stereoisomers and get the atom mapping
+        for charge_mol in charge_mols_index.get(molecule._get_graph_invariants(), []):
+            ismorphic, topology_atom_map = Molecule.are_isomorphic(charge_mol, molecule,
                                                                    return_atom_map=True,
                                                                    aromatic_matching=True,
                                                                    formal_charge_matching=True,
@@ -2622,9 +3008,15 @@ class ElectrostaticsHandler(_NonbondedHandler):
 
     def create_force(self, system, topology, **kwargs):
         from openforcefield.topology import FrozenMolecule, TopologyAtom, TopologyVirtualSite
+        from simtk import openmm
 
         force = super().create_force(system, topology, **kwargs)
 
+        # Index the charge_from_molecules once, rather than searching the whole list for each reference molecule
+        charge_mols_index = None
+        if 'charge_from_molecules' in kwargs:
+            charge_mols_index = self._index_charge_from_molecules(kwargs['charge_from_molecules'])
+
         # See if each molecule should have charges assigned by the charge_from_molecules kwarg
         for ref_mol in topology.reference_molecules:
 
@@ -2637,8 +3029,8 @@ class ElectrostaticsHandler(_NonbondedHandler):
 
             # First, check whether any of the reference molecules in the topology are in the charge_from_mol list
             charges_from_charge_mol = False
-            if 'charge_from_molecules' in kwargs:
-                charges_from_charge_mol = self.assign_charge_from_molecules(temp_mol, kwargs['charge_from_molecules'])
+            if charge_mols_index is not None:
+                charges_from_charge_mol = self._assign_charge_from_indexed_molecules(temp_mol, charge_mols_index)
 
             # If this reference molecule wasn't in the charge_from_molecules list, end this iteration
             if not(charges_from_charge_mol):
@@ -2712,24 +3104,20 @@ class ElectrostaticsHandler(_NonbondedHandler):
             if topology.box_vectors is None:
                 # (vdWHandler will have already set this to NoCutoff)
                 assert current_nb_method == openmm.NonbondedForce.NoCutoff
-                settings_matched = True
             else:
-                raise IncompatibleParameterError("Electrostatics method set to Coulomb, and topology is periodic. "
-                                                 "In the future, this will lead to use of OpenMM's CutoffPeriodic "
-                                                 "Nonbonded force method, however this is not supported in the "
-                                                 "current Open Force Field toolkit.")
+                # Periodic systems need a cutoff. With a reaction field dielectric of 1, OpenMM's CutoffPeriodic
+                # method computes the plain Coulomb interaction, shifted to zero at the cutoff.
+                self._set_cutoff_nonbonded_method(force, openmm.NonbondedForce.CutoffPeriodic)
+                force.setReactionFieldDielectric(1.0)
+            settings_matched = True
 
-        # If the vdWHandler set the nonbonded method to PME, then ensure that it has the same cutoff
+        # Use a reaction field beyond the cutoff, for both periodic and nonperiodic topologies
         elif self._method == 'reaction-field':
             if topology.box_vectors is None:
-                # (vdWHandler will have already set this to NoCutoff)
-                assert current_nb_method == openmm.NonbondedForce.NoCutoff
-                settings_matched = True
+                self._set_cutoff_nonbonded_method(force, openmm.NonbondedForce.CutoffNonPeriodic)
             else:
-                raise IncompatibleParameterError("Electrostatics method set to reaction-field. In the future, "
-                                                 "this will lead to use of OpenMM's CutoffPeriodic or CutoffNonPeriodic"
-                                                 " Nonbonded force method, however this is not supported in the "
-                                                 "current Open Force Field toolkit")
+                self._set_cutoff_nonbonded_method(force, openmm.NonbondedForce.CutoffPeriodic)
+            settings_matched = True
 
         if not settings_matched:
             raise IncompatibleParameterError("Unable to support provided vdW method, electrostatics "
@@ -2738,6 +3126,31 @@ class ElectrostaticsHandler(_NonbondedHandler):
                                              "of the Open Force Field toolkit.".format(self._method,
                                                                                 topology.box_vectors is not None))
 
+    def _set_cutoff_nonbonded_method(self, force, nonbonded_method):
+        """
+        Switch a NonbondedForce to a cutoff-based nonbonded method, using this handler's cutoff.
+
+        Parameters
+        ----------
+        force : simtk.openmm.NonbondedForce
+            The force, with the cutoff distance already set by vdWHandler.
+        nonbonded_method : int
+            ``NonbondedForce.CutoffNonPeriodic`` or ``NonbondedForce.CutoffPeriodic``.
+
+        Raises
+        ------
+        IncompatibleParameterError
+            If the electrostatics cutoff is different from the vdW cutoff.
+        """
+        # NonbondedForce applies the same cutoff to vdW and electrostatics interactions
+        vdw_cutoff = force.getCutoffDistance()
+        if abs((vdw_cutoff - self._cutoff) / unit.angstrom) > self._SCALETOL:
+            raise IncompatibleParameterError(f"Electrostatics method {self._method} requires the electrostatics "
+                                             f"cutoff ({self._cutoff}) to be equal to the vdW cutoff "
+                                             f"({vdw_cutoff.in_units_of(unit.angstrom)}).")
+        force.setNonbondedMethod(nonbonded_method)
+        force.setCutoffDistance(self._cutoff)
+
     def postprocess_system(self, system, topology, **kwargs):
         force = super().create_force(system, topology, **kwargs)
         # Check to ensure all molecules have had charges assigned
@@ -2774,6 +3187,123 @@ class ElectrostaticsHandler(_NonbondedHandler):
                 raise NonintegralMoleculeChargeException(msg)
 
 
+# Atomic numbers of the element symbols that can appear outside of brackets in a SMARTS pattern.
+_SMARTS_ORGANIC_SUBSET = {'B': 5, 'C': 6, 'N': 7, 'O': 8, 'F': 9, 'P': 15, 'S': 16, 'Cl': 17, 'Br': 35, 'I': 53,
+                          'b': 5, 'c': 6, 'n': 7, 'o': 8, 'p': 15, 's': 16}
+
+# Atomic numbers of the two-letter aromatic element symbols of SMARTS bracket atoms.
+_SMARTS_AROMATIC_TWO_LETTER_SYMBOLS = {'se': 34, 'as': 33}
+
+# Single-letter primitives of bracket atoms that are not element symbols.
+_SMARTS_NON_ELEMENT_PRIMITIVES = frozenset('HDXRA')
+
+# Lowercase single-letter primitives that may follow an aromatic element symbol (e.g. [cr5], [nx3]).
+_SMARTS_LOWERCASE_PRIMITIVES = frozenset('ahrvx')
+
+
+def _get_bracket_atom_atomic_number(bracket_atom):
+    """Return the atomic number fixed by the primitives of a SMARTS bracket atom, or None if it is not fixed."""
+    from simtk.openmm.app import element
+
+    # With OR or NOT operators, the element of the atom cannot be determined without a full parse.
+    if ',' in bracket_atom or '!' in bracket_atom:
+        return None
+    atomic_number = re.search(r'#(\d+)', bracket_atom)
+    if atomic_number is not None:
+        return int(atomic_number.group(1))
+    if bracket_atom[:1].islower():
+        # Two-letter aromatic symbols must be matched before their one-letter prefix ([se] is not sulfur).
+        if bracket_atom[:2] in _SMARTS_AROMATIC_TWO_LETTER_SYMBOLS:
+            return _SMARTS_AROMATIC_TWO_LETTER_SYMBOLS[bracket_atom[:2]]
+        if bracket_atom[1:2].islower() and bracket_atom[1] not in _SMARTS_LOWERCASE_PRIMITIVES:
+            return None
+        if bracket_atom[:1] in ('b', 'c', 'n', 'o', 'p', 's'):
+            return _SMARTS_ORGANIC_SUBSET[bracket_atom[0]]
+        return None
+    # A two-letter symbol must end with a lowercase letter, otherwise the second letter is a
+    # primitive (e.g. [CD3] is a carbon with three connections, not cadmium).
+    candidate_symbols = [bracket_atom[:1]]
+    if bracket_atom[1:2].islower():
+        candidate_symbols.insert(0, bracket_atom[:2])
+    for symbol in candidate_symbols:
+        if not symbol.isalpha() or not symbol[0].isupper() or symbol in _SMARTS_NON_ELEMENT_PRIMITIVES:
+            continue
+        # Element.getBySymbol() is case-insensitive, so check that the symbol matches exactly.
+        try:
+            element_match = element.Element.getBySymbol(symbol)
+        except KeyError:
+            continue
+        if element_match.symbol == symbol:
+            return element_match.atomic_number
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_smirks_composition(smirks):
+    """
+    Find the element composition, number of atoms and number of bonds of a SMIRKS pattern.
+
+    These are lower bounds on the size of any molecule matched by the pattern, and are used
+    to skip patterns that cannot match a molecule without running the toolkit.
+
+    Parameters
+    ----------
+    smirks : str
+        A connected SMIRKS pattern.
+
+    Returns
+    -------
+    composition : tuple or None
+        ``(element_counts, n_atoms, n_bonds)``, where ``element_counts`` is a sorted tuple of
+        ``(atomic_number, count)`` pairs for the atoms whose element is fixed by the pattern.
+        ``None`` if the pattern is disconnected, recursive or cannot be parsed.
+    """
+    if '.' in smirks or '$' in smirks:
+        return None
+
+    element_counts = Counter()
+    n_atoms = 0
+    n_ring_closures = 0
+    position = 0
+    while position < len(smirks):
+        if smirks[position] == '[':
+            end = smirks.find(']', position)
+            if end == -1:
+                return None
+            atomic_number = _get_bracket_atom_atomic_number(smirks[position+1:end])
+            position = end + 1
+        elif smirks[position:position+2] in ('Cl', 'Br'):
+            atomic_number = _SMARTS_ORGANIC_SUBSET[smirks[position:position+2]]
+            position += 2
+        elif smirks[position] in _SMARTS_ORGANIC_SUBSET:
+            atomic_number = _SMARTS_ORGANIC_SUBSET[smirks[position]]
+            position += 1
+        elif smirks[position] in '*Aa':
+            atomic_number = None
+            position += 1
+        else:
+            # Ring closures, bonds and branches.
+            if smirks[position] == '%':
+                n_ring_closures += 1
+                position += 3
+            elif smirks[position].isdigit():
+                n_ring_closures += 1
+                position += 1
+            elif smirks[position] in '-=#:~@/\\()!,;&':
+                position += 1
+            else:
+                return None
+            continue
+
+        n_atoms += 1
+        if atomic_number is not None:
+            element_counts[atomic_number] += 1
+
+    # Each ring closure digit appears twice and closes one bond of a connected pattern.
+    n_bonds = n_atoms - 1 + n_ring_closures // 2
+    return tuple(sorted(element_counts.items())), n_atoms, n_bonds
+
+
 class LibraryChargeHandler(_NonbondedHandler):
     """Handle SMIRNOFF ``<LibraryCharges>`` tags
 
@@ -2815,65 +3345,107 @@ class LibraryChargeHandler(_NonbondedHandler):
         #  Should we reduce its scope and have a check here to make sure entity is a Topology?
         return self._find_matches(entity, transformed_dict_cls=dict)
 
-    def create_force(self, system, topology, **kwargs):
-        from openforcefield.topology import FrozenMolecule, TopologyAtom, TopologyVirtualSite
-
-        force = super().create_force(system, topology, **kwargs)
+    def _get_library_charge_index(self):
+        """
+        Group the library charges by the element composition and bond count of their SMIRKS.
 
-        # Iterate over all defined library charge parameters, allowing later matches to override earlier ones.
-        atom_matches = self.find_matches(topology)
+        Returns
+        -------
+        library_charge_index : collections.OrderedDict
+            ``library_charge_index[(element_counts, n_atoms, n_bonds)]`` is the list of positions
+            in this handler's parameter list of the library charges with that composition (see
+            ``_get_smirks_composition``). Library charges with SMIRKS that cannot be analyzed are
+            listed under the ``None`` key.
+        """
+        library_charge_index = OrderedDict()
+        for parameter_index, library_charge in enumerate(self._parameters):
+            composition = _get_smirks_composition(library_charge.smirks)
+            library_charge_index.setdefault(composition, []).append(parameter_index)
+        return library_charge_index
 
-        # Create a set of all the topology atom indices for which library charges can be applied
-        assignable_atoms = set()
-        atom_assignments = dict()
-        # TODO: This assumes that later matches should always override earlier ones. This may require more
-        #       thought, since matches can be partially overlapping
-        for topology_indices, library_charge in atom_matches.items():
-            for charge_idx, top_idx in enumerate(topology_indices):
-                if top_idx in assignable_atoms:
-                    logger.debug(f'Multiple library charge assignments found for atom {top_idx}')
-                assignable_atoms.add(top_idx)
-                atom_assignments[top_idx] = library_charge.parameter_type.charge[charge_idx]
-        # TODO: Should header include a residue separator delimiter? Maybe not, since it's not clear how having
-        #       multiple LibraryChargeHandlers could return a single set of matches while respecting different
-        #       separators.
-
-        # Keep track of the reference molecules that this successfully assigns charges to, so we can
-        # mark them and subsequent charge generation handlers won't override the values
-        ref_mols_assigned = set()
-
-        # Check to see whether the set contains any complete molecules, and remove the matches if not.
-        for top_mol in topology.topology_molecules:
+    def _find_molecule_charges(self, molecule, library_charge_index):
+        """
+        Find the library charges of all the atoms of a molecule.
 
-            # Make a temporary copy of ref_mol to assign charges from charge_mol
-            temp_mol = FrozenMolecule(top_mol.reference_molecule)
+        Only the library charges with a composition that fits in the molecule are matched.
 
-            # If charges were already assigned, skip this molecule
-            if self.check_charges_assigned(temp_mol, topology):
-                continue
+        Parameters
+        ----------
+        molecule : openforcefield.topology.FrozenMolecule
+            The molecule to assign library charges to.
+        library_charge_index : collections.OrderedDict
+            The library charges grouped by composition, as returned by ``_get_library_charge_index``.
 
-            # Ensure all of the atoms in this mol are covered, otherwise skip it
-            top_particle_idxs = [atom.topology_particle_index for atom in top_mol.atoms]
-            if len(set(top_particle_idxs).intersection(assignable_atoms)) != top_mol.n_atoms:
-                logger.debug('Entire molecule is not covered. Skipping library charge assignment.')
-                continue
+        Returns
+        -------
+        atom_charges : dict or None
+            ``atom_charges[atom_index]`` is the charge of the atom with index ``atom_index`` in
+            ``molecule``, or ``None`` if the library charges do not cover the entire molecule.
+        """
+        element_counts = Counter(atom.atomic_number for atom in molecule.atoms)
+        candidate_parameter_indices = []
+        for composition, parameter_indices in library_charge_index.items():
+            if composition is not None:
+                template_element_counts, n_atoms, n_bonds = composition
+                if n_atoms > molecule.n_atoms or n_bonds > molecule.n_bonds:
+                    continue
+                if any(count > element_counts[atomic_number] for atomic_number, count in template_element_counts):
+                    continue
+            candidate_parameter_indices.extend(parameter_indices)
+
+        # Match the candidates in the order of the parameter list, allowing later matches to override earlier ones.
+        atom_matches = dict()
+        for parameter_index in sorted(candidate_parameter_indices):
+            library_charge = self._parameters[parameter_index]
+            matches_for_this_type = {tuple(match): library_charge
+                                     for match in molecule.chemical_environment_matches(library_charge.smirks)}
+            atom_matches.update(matches_for_this_type)
 
-            # If we pass both tests above, go ahead and assign charges
-            # TODO: We could probably save a little time by looking up this TopologyMolecule's _reference molecule_
-            #       and assigning charges to all other instances of it in this topology
-            for top_particle_idx in top_particle_idxs:
-                _, sigma, epsilon = force.getParticleParameters(top_particle_idx)
-                force.setParticleParameters(top_particle_idx,
-                                            atom_assignments[top_particle_idx],
-                                            sigma,
-                                            epsilon)
+        # TODO: This assumes that later matches should always override earlier ones. This may require more
+        #       thought, since matches can be partially overlapping
+        atom_charges = dict()
+        for atom_indices, library_charge in atom_matches.items():
+            for charge_idx, atom_idx in enumerate(atom_indices):
+                if atom_idx in atom_charges:
+                    logger.debug(f'Multiple library charge assignments found for atom {atom_idx}')
+                atom_charges[atom_idx] = library_charge.charge[charge_idx]
+
+        # Ensure all of the atoms in this mol are covered, otherwise skip it
+        if len(atom_charges) != molecule.n_atoms:
+            logger.debug('Entire molecule is not covered. Skipping library charge assignment.')
+            return None
+        return atom_charges
 
-            ref_mols_assigned.add(temp_mol)
+    def create_force(self, system, topology, **kwargs):
+        force = super().create_force(system, topology, **kwargs)
 
-        # Finally, mark that charges were assigned for this reference molecule
-        for assigned_mol in ref_mols_assigned:
-            self.mark_charges_assigned(assigned_mol, topology)
+        # Match the library charges once for each reference molecule whose charges were not already assigned.
+        library_charge_index = self._get_library_charge_index()
+        ref_mol_charges = dict()
+        for ref_mol in topology.reference_molecules:
+            if self.check_charges_assigned(ref_mol, topology):
+                continue
+            atom_charges = self._find_molecule_charges(ref_mol, library_charge_index)
+            if atom_charges is not None:
+                ref_mol_charges[id(ref_mol)] = atom_charges
 
+        # Copy the charges to all instances of the reference molecules, keeping a running
+        # particle offset rather than querying the start index of each topology molecule.
+        particle_start_index = 0
+        for topology_molecule in topology.topology_molecules:
+            atom_charges = ref_mol_charges.get(id(topology_molecule.reference_molecule))
+            if atom_charges is not None:
+                for ref_atom_idx, charge in atom_charges.items():
+                    top_particle_idx = particle_start_index + topology_molecule._ref_to_top_index[ref_atom_idx]
+                    _, sigma, epsilon = force.getParticleParameters(top_particle_idx)
+                    force.setParticleParameters(top_particle_idx, charge, sigma, epsilon)
+            particle_start_index += topology_molecule.n_particles
+
+        # Finally, mark that charges were assigned for these reference molecules, so that subsequent
+        # charge generation handlers won't override the values
+        for ref_mol in topology.reference_molecules:
+            if id(ref_mol) in ref_mol_charges:
+                self.mark_charges_assigned(ref_mol, topology)
 
 
 class ToolkitAM1BCCHandler(_NonbondedHandler):
@@ -3153,7 +3725,7 @@ class GBSAHandler(ParameterHandler):
 
     _TAGNAME = 'GBSA'
     _INFOTYPE = GBSAType
-    _OPENMMTYPE = openmm.GBSAOBCForce
+    _OPENMMTYPE = _OpenMMForceClass('GBSAOBCForce')
     _DEPENDENCIES = [vdWHandler, ElectrostaticsHandler,
                      ToolkitAM1BCCHandler, ChargeIncrementModelHandler, LibraryChargeHandler]
 
@@ -3257,7 +3829,8 @@ class GBSAHandler(ParameterHandler):
 
 
     def create_force(self, system, topology, **kwargs):
-        import simtk
+        import simtk.openmm.app.internal.customgbforces
+        from simtk import openmm
 
         self._validate_parameters()
 
@@ -3286,6 +3859,12 @@ class GBSAHandler(ParameterHandler):
         else:
             amber_cutoff = nonbonded_force.getCutoffDistance().value_in_unit(unit.nanometer)
 
+        # The GBSA force accounts for the solvent screening, so a reaction field beyond
+        # the cutoff must not use the solvent dielectric (as in OpenMM's implicit solvent models).
+        if nonbonded_force.getNonbondedMethod() in (openmm.NonbondedForce.CutoffNonPeriodic,
+                                                    openmm.NonbondedForce.CutoffPeriodic):
+            nonbonded_force.setReactionFieldDielectric(1.0)
+
         if self.gb_model == 'OBC2':
             gbsa_force = openmm_force_type()
 
@@ -3316,6 +3895,8 @@ class GBSAHandler(ParameterHandler):
 
             #gbsa_force.setNonbondedMethod(simtk.openmm.NonbondedForce.CutoffPeriodic)
             gbsa_force.setNonbondedMethod(simtk.openmm.CustomGBForce.CutoffPeriodic)
+        elif amber_cutoff is not None:
+            gbsa_force.setNonbondedMethod(simtk.openmm.CustomGBForce.CutoffNonPeriodic)
         else:
             #gbsa_force.setNonbondedMethod(simtk.openmm.NonbondedForce.NoCutoff)
             gbsa_force.setNonbondedMethod(simtk.openmm.CustomGBForce.NoCutoff)
@@ -3365,8 +3946,8 @@ class GBSAHandler(ParameterHandler):
             gbsa_force.finalize()
 
         # Check that no atoms (n.b. not particles) are missing force parameters.
-        self._check_all_valence_terms_assigned(assigned_terms=atom_matches,
-                                               valence_terms=list(topology.topology_atoms))
+        self._check_all_valence_terms_assigned(assigned_terms=atom_matches, topology=topology,
+                                               valence_terms_name='atoms')
 
         system.addForce(gbsa_force)
 
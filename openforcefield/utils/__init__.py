@@ -1,7 +1,26 @@
 # General utilities for forcefields
 
+import sys
+
 from openforcefield.utils.utils import *
-from openforcefield.utils.toolkits import *
+from openforcefield.utils import utils as _utils
+from openforcefield.utils import toolkits as _toolkits
+
+# Star-importing the toolkit availability flags (e.g. RDKIT_AVAILABLE) would probe the
+# toolkits on import, so they are left out here and forwarded by __getattr__ instead.
+globals().update({name: getattr(_toolkits, name) for name in _toolkits.__all__
+                  if name not in _toolkits._TOOLKIT_AVAILABILITY_FLAGS})
+
+__all__ = _utils.__all__ + _toolkits.__all__
+
 
+def __getattr__(name):
+    # Forward the lazily-resolved toolkit availability flags.
+    if name in _toolkits._TOOLKIT_AVAILABILITY_FLAGS:
+        return getattr(_toolkits, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
+if sys.version_info < (3, 7):
+    # Module-level __getattr__ (PEP 562) is not supported.
+    from openforcefield.utils.toolkits import OPENEYE_AVAILABLE, RDKIT_AVAILABLE, AMBERTOOLS_AVAILABLE
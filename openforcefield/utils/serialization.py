@@ -15,6 +15,108 @@ Serialization mix-in
 
 import abc
 
+import numpy as np
+
+
+#=============================================================================================
+# NUMPY ARRAY ENCODING
+#=============================================================================================
+
+# MessagePack extension type code of numpy arrays
+_MSGPACK_NDARRAY_EXT_TYPE = 42
+# Key tagging the BSON sub-documents that hold numpy arrays
+_BSON_NDARRAY_KEY = '__ndarray__'
+
+
+def _ndarray_ext_header(array):
+    """
+    Return the header of the MessagePack extension payload of a numpy array, which is followed by the
+    array data in native byte order: the length of the header as a little-endian uint16, then the
+    MessagePack encoded dtype string and shape.
+    """
+    import msgpack
+    if array.dtype.hasobject:
+        raise TypeError(f'Can not serialize numpy arrays of dtype {array.dtype}')
+    header = msgpack.packb([array.dtype.str, list(array.shape)])
+    return len(header).to_bytes(2, 'little') + header
+
+
+def _msgpack_default(obj):
+    """Encode numpy arrays as MessagePack extension types for ``msgpack.packb(default=...)``."""
+    import msgpack
+    if isinstance(obj, np.ndarray):
+        return msgpack.ExtType(_MSGPACK_NDARRAY_EXT_TYPE,
+                               _ndarray_ext_header(obj) + np.ascontiguousarray(obj).tobytes())
+    raise TypeError(f'Object of type {type(obj).__name__} can not be serialized with MessagePack')
+
+
+def _msgpack_ext_hook(code, data):
+    """Decode numpy array MessagePack extension types as read-only views into the serialized data."""
+    import msgpack
+    if code != _MSGPACK_NDARRAY_EXT_TYPE:
+        return msgpack.ExtType(code, data)
+    header_length = int.from_bytes(data[:2], 'little')
+    dtype, shape = msgpack.unpackb(data[2:2 + header_length])
+    return np.frombuffer(data, dtype=dtype, offset=2 + header_length).reshape(shape)
+
+
+def _write_messagepack(obj, file_obj, packer):
+    """
+    Write the MessagePack encoding of ``obj`` to a file-like object piece by piece, writing the data of
+    numpy arrays straight from their buffers.
+    """
+    if isinstance(obj, dict):
+        file_obj.write(packer.pack_map_header(len(obj)))
+        for key, value in obj.items():
+            _write_messagepack(key, file_obj, packer)
+            _write_messagepack(value, file_obj, packer)
+    elif isinstance(obj, (list, tuple)):
+        file_obj.write(packer.pack_array_header(len(obj)))
+        for value in obj:
+            _write_messagepack(value, file_obj, packer)
+    elif isinstance(obj, np.ndarray):
+        header = _ndarray_ext_header(obj)
+        array = np.ascontiguousarray(obj)
+        # ext 32 format: 0xc9, payload length as a big-endian uint32, type code
+        file_obj.write(b'\xc9' + (len(header) + array.nbytes).to_bytes(4, 'big') +
+                       _MSGPACK_NDARRAY_EXT_TYPE.to_bytes(1, 'big'))
+        file_obj.write(header)
+        file_obj.write(memoryview(array).cast('B'))
+    else:
+        file_obj.write(packer.pack(obj))
+
+
+def _encode_bson_arrays(obj):
+    """
+    Replace the numpy arrays in a dict representation by sub-documents holding their dtype,
+    shape and data in native byte order as BSON binary data.
+    """
+    if isinstance(obj, dict):
+        return type(obj)((key, _encode_bson_arrays(value)) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return [_encode_bson_arrays(value) for value in obj]
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            raise TypeError(f'Can not serialize numpy arrays of dtype {obj.dtype}')
+        return {_BSON_NDARRAY_KEY: np.ascontiguousarray(obj).tobytes(),
+                'dtype': obj.dtype.str,
+                'shape': list(obj.shape)}
+    return obj
+
+
+def _decode_bson_arrays(obj):
+    """
+    Replace the sub-documents written by ``_encode_bson_arrays`` by read-only numpy array views
+    into their data.
+    """
+    if isinstance(obj, dict):
+        if _BSON_NDARRAY_KEY in obj:
+            return np.frombuffer(obj[_BSON_NDARRAY_KEY], dtype=obj['dtype']).reshape(obj['shape'])
+        return type(obj)((key, _decode_bson_arrays(value)) for key, value in obj.items())
+    if isinstance(obj, list):
+        return [_decode_bson_arrays(value) for value in obj]
+    return obj
+
 
 #=============================================================================================
 # SERIALIZATION MIX-IN
@@ -29,6 +131,10 @@ class Serializable(abc.ABC):
     To use this mix-in, the class inheriting from this class must have implemented ``to_dict()`` and ``from_dict()`` methods
     that utilize dictionaries containing only serialiable Python objects.
 
+    The binary formats (BSON and MessagePack) use the dictionary returned by ``_to_binary_dict()``,
+    which may also contain numpy arrays. These are stored with their dtype and shape in native byte
+    order, and are deserialized as read-only arrays viewing the serialized data.
+
     .. warning ::
 
        The serialization/deserialiation schemes used here place some strict constraints on what kinds of ``dict`` objects
@@ -101,6 +207,15 @@ class Serializable(abc.ABC):
     def from_dict(cls, d):
         pass
 
+    def _to_binary_dict(self):
+        """
+        Return the dictionary representation used by the binary serialization formats.
+
+        This is ``to_dict()`` by default. Classes holding large numerical arrays override it to leave
+        them as numpy arrays, which ``from_dict()`` must then accept in place of their ``to_dict()`` form.
+        """
+        return self.to_dict()
+
     def to_json(self, indent=None):
         """
         Return a JSON serialized representation.
@@ -157,7 +272,7 @@ class Serializable(abc.ABC):
 
         """
         import bson
-        d = self.to_dict()
+        d = _encode_bson_arrays(self._to_binary_dict())
         return bson.dumps(d)
 
     @classmethod
@@ -179,7 +294,7 @@ class Serializable(abc.ABC):
 
         """
         import bson
-        d = bson.loads(serialized)
+        d = _decode_bson_arrays(bson.loads(serialized))
         return cls.from_dict(d)
 
     def to_toml(self):
@@ -309,8 +424,27 @@ class Serializable(abc.ABC):
 
         """
         import msgpack
-        d = self.to_dict()
-        return msgpack.dumps(d, use_bin_type=True)
+        d = self._to_binary_dict()
+        return msgpack.dumps(d, use_bin_type=True, default=_msgpack_default)
+
+    def to_messagepack_file(self, file_obj):
+        """
+        Write a MessagePack representation to a file-like object.
+
+        Unlike ``to_messagepack``, the whole representation is never held in memory at once, and
+        numpy arrays are written straight from their buffers.
+
+        Specification: https://msgpack.org/index.html
+
+        Parameters
+        ----------
+        file_obj : file-like object
+            A binary file-like object to write to
+
+        """
+        import msgpack
+        packer = msgpack.Packer(use_bin_type=True)
+        _write_messagepack(self._to_binary_dict(), file_obj, packer)
 
     @classmethod
     def from_messagepack(cls, serialized):
@@ -331,7 +465,29 @@ class Serializable(abc.ABC):
 
         """
         import msgpack
-        d = msgpack.loads(serialized, raw=False)
+        d = msgpack.loads(serialized, raw=False, ext_hook=_msgpack_ext_hook)
+        return cls.from_dict(d)
+
+    @classmethod
+    def from_messagepack_file(cls, file_obj):
+        """
+        Instantiate an object from a MessagePack representation in a file-like object.
+
+        Specification: https://msgpack.org/index.html
+
+        Parameters
+        ----------
+        file_obj : file-like object
+            A binary file-like object to read from, as written by ``to_messagepack_file``
+
+        Returns
+        -------
+        instance : cls
+            Instantiated object.
+
+        """
+        import msgpack
+        d = msgpack.unpack(file_obj, raw=False, ext_hook=_msgpack_ext_hook)
         return cls.from_dict(d)
 
     def to_xml(self, indent=2):
@@ -50,12 +50,20 @@ __all__ = [
 # GLOBAL IMPORTS
 #=============================================================================================
 
+import bz2
 import copy
-from distutils.spawn import find_executable
 from functools import wraps
+import gzip
 import importlib
+import itertools
 import logging
+import mmap
+import os
+import re
+import shutil
 import subprocess
+import sys
+import time
 
 from simtk import unit
 import numpy as np
@@ -128,6 +136,225 @@ class GAFFAtomTypeWarning(RuntimeWarning):
 # UTILITY FUNCTIONS
 #=============================================================================================
 
+_COMPRESSED_FILE_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open}
+
+
+def _open_file(file_path, mode='rt'):
+    """
+    Open a file, transparently compressing or decompressing it if its name ends in ``.gz`` or ``.bz2``.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file
+    mode : str, optional, default='rt'
+        The mode to open the file in, as for the built-in ``open``
+
+    Returns
+    -------
+    file_obj : file-like object
+        The opened file
+    """
+    for suffix, opener in _COMPRESSED_FILE_OPENERS.items():
+        if file_path.endswith(suffix):
+            return opener(file_path, mode)
+    return open(file_path, mode)
+
+
+# Patterns matching the end of each SDF record and the start of each SMILES record
+_RECORD_OFFSET_PATTERNS = {'SDF': (re.compile(rb'^\$\$\$\$[^\n]*(?:\n|$)', re.MULTILINE), 'end'),
+                           'MOL': (re.compile(rb'^\$\$\$\$[^\n]*(?:\n|$)', re.MULTILINE), 'end'),
+                           'SMI': (re.compile(rb'^[ \t]*[^\s]', re.MULTILINE), 'start')}
+
+
+def _build_record_offsets(file_path, file_format):
+    """
+    Find the byte offsets of the records in an uncompressed SDF or SMILES file.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file
+    file_format : str
+        The upper case format specifier, one of 'SDF', 'MOL' or 'SMI'
+
+    Returns
+    -------
+    offsets : np.ndarray of int64 with shape (n_records + 1,)
+        Record ``i`` spans the bytes ``offsets[i]:offsets[i+1]`` of the file
+    """
+    if file_format not in _RECORD_OFFSET_PATTERNS:
+        raise NotImplementedError(f'Record offsets can not be found for {file_format} files')
+    pattern, boundary = _RECORD_OFFSET_PATTERNS[file_format]
+    file_size = os.path.getsize(file_path)
+    if file_size == 0:
+        return np.zeros(1, dtype=np.int64)
+
+    with open(file_path, 'rb') as file_obj:
+        with mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if boundary == 'end':
+                offsets = [0] + [match.end() for match in pattern.finditer(data)]
+                # Keep a last record that is not terminated by $$$$
+                if data[offsets[-1]:].strip():
+                    offsets.append(file_size)
+            else:
+                offsets = [match.start() for match in pattern.finditer(data)] + [file_size]
+                if len(offsets) == 1:
+                    offsets = [0, 0]
+    return np.array(offsets, dtype=np.int64)
+
+
+def _get_record_offsets(file_path, file_format, index_path=None):
+    """
+    Get the byte offsets of the records in an uncompressed SDF or SMILES file, using a saved index if possible.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the file
+    file_format : str
+        The upper case format specifier, one of 'SDF', 'MOL' or 'SMI'
+    index_path : str, optional, default=None
+        The path of an ``.npz`` file storing the offsets. If it exists and was built for the current version
+        of the file (same size and modification time), the offsets are loaded from it. Otherwise, they are
+        found and saved to it. If None, the offsets are not saved.
+
+    Returns
+    -------
+    offsets : np.ndarray of int64 with shape (n_records + 1,)
+        Record ``i`` spans the bytes ``offsets[i]:offsets[i+1]`` of the file
+    """
+    file_stat = os.stat(file_path)
+    file_signature = np.array([file_stat.st_size, file_stat.st_mtime_ns], dtype=np.int64)
+    if index_path is not None and os.path.exists(index_path):
+        with np.load(index_path) as index:
+            if np.array_equal(index['file_signature'], file_signature):
+                return index['offsets']
+
+    offsets = _build_record_offsets(file_path, file_format)
+    if index_path is not None:
+        # Save through a file object, so that numpy does not append a suffix to the path
+        with open(index_path, 'wb') as index_file:
+            np.savez(index_file, offsets=offsets, file_signature=file_signature)
+    return offsets
+
+
+def _read_file_byte_range(toolkit_class, file_path, file_format, byte_range, first_record_index,
+                          allow_undefined_stereo, serialize):
+    """
+    Read the molecules in a range of bytes of a file. This runs in the worker processes of
+    ``ToolkitWrapper.from_file_parallel``. Records that can't be parsed are reported, while errors
+    converting parsed records to molecules are raised.
+
+    Returns
+    -------
+    records : list of (int, Molecule or dict or None, Exception or None)
+        The record index, molecule (or its dict representation if ``serialize``) and error of each record
+    """
+    import io
+
+    byte_start, byte_stop = byte_range
+    with open(file_path, 'rb') as file_obj:
+        file_obj.seek(byte_start)
+        data = file_obj.read(byte_stop - byte_start)
+
+    toolkit = toolkit_class()
+    records = list()
+    for record_index, molecule, error in toolkit._iter_file_obj(io.BytesIO(data),
+                                                                file_format,
+                                                                allow_undefined_stereo=allow_undefined_stereo,
+                                                                first_record_index=first_record_index,
+                                                                raise_conversion_errors=True):
+        if serialize and molecule is not None:
+            molecule = molecule.to_dict()
+        records.append((record_index, molecule, error))
+    return records
+
+
+class _FileObjMoleculeWriter:
+    """
+    Writes molecules one at a time to an open file-like object with ``ToolkitWrapper.to_file_obj``.
+    """
+    def __init__(self, toolkit, file_obj, file_format):
+        self._toolkit = toolkit
+        self._file_obj = file_obj
+        self._file_format = file_format
+
+    def write(self, molecule):
+        self._toolkit.to_file_obj(molecule, self._file_obj, self._file_format)
+
+    def close(self):
+        pass
+
+
+class _RDKitMoleculeWriter:
+    """
+    Writes molecules and all their conformers to an open file-like object through a single RDKit writer.
+    """
+    # Formats in which each conformer is written as a separate record or model
+    _conformer_formats = ['SDF', 'MOL', 'PDB']
+
+    def __init__(self, toolkit, file_obj, file_format):
+        from rdkit import Chem
+        self._toolkit = toolkit
+        self._write_conformers = file_format in self._conformer_formats
+        try:
+            if file_format == 'SMI':
+                # Write the header line only once per file, if at all, so that the file can be read back
+                self._writer = Chem.SmilesWriter(file_obj, includeHeader=False)
+            else:
+                self._writer = toolkit._toolkit_file_write_formats[file_format](file_obj)
+        except KeyError:
+            raise ValueError(f'The requested file type ({file_format}) is not supported to be written using '
+                             f'RDKitToolkitWrapper.')
+
+    def write(self, molecule):
+        rdmol = self._toolkit.to_rdkit(molecule)
+        if self._write_conformers and rdmol.GetNumConformers() > 1:
+            # to_rdkit does not assign unique conformer ids
+            for conformer_id, conformer in enumerate(rdmol.GetConformers()):
+                conformer.SetId(conformer_id)
+                self._writer.write(rdmol, confId=conformer_id)
+        else:
+            self._writer.write(rdmol)
+
+    def close(self):
+        self._writer.close()
+
+
+class _OpenEyeMoleculeWriter:
+    """
+    Writes molecules and all their conformers to an open file-like object through a single OpenEye output stream.
+
+    The stream stays open for the lifetime of the writer and writes to an in-memory buffer, which is
+    drained into the file object after each molecule.
+    """
+    def __init__(self, toolkit, file_obj, file_format):
+        from openeye import oechem
+        self._toolkit = toolkit
+        self._file_obj = file_obj
+        self._buffer = oechem.oeosstream()
+        self._ofs = oechem.oemolostream(self._buffer, False)
+        self._ofs.SetFormat(getattr(oechem, 'OEFormat_' + file_format))
+
+    def _drain_buffer(self):
+        file_data = self._buffer.str()
+        if isinstance(file_data, bytes):
+            file_data = file_data.decode()
+        self._file_obj.write(file_data)
+        self._buffer.clear()
+
+    def write(self, molecule):
+        from openeye import oechem
+        oechem.OEWriteMolecule(self._ofs, self._toolkit.to_openeye(molecule))
+        self._ofs.flush()
+        self._drain_buffer()
+
+    def close(self):
+        self._ofs.close()
+        self._drain_buffer()
+
+
 #=============================================================================================
 # CHEMINFORMATICS TOOLKIT WRAPPERS
 #=============================================================================================
@@ -233,6 +460,123 @@ class ToolkitWrapper:
         """
         return NotImplementedError
 
+    def iter_file(self,
+                  file_path,
+                  file_format,
+                  allow_undefined_stereo=False,
+                  start=0,
+                  stop=None):
+        """
+        Lazily create openforcefield.topology.Molecule objects from the records of a file using this toolkit.
+
+        This default implementation reads the whole file with ``from_file``. Toolkits that can
+        stream records override it.
+
+        Parameters
+        ----------
+        file_path : str
+            The file to read the molecules from
+        file_format : str
+            Format specifier, usually file suffix (eg. 'MOL2', 'SMI')
+            Note that not all toolkits support all formats. Check ToolkitWrapper.toolkit_file_read_formats for details.
+        allow_undefined_stereo : bool, default=False
+            If false, the records of molecules with undefined stereochemistry are reported as errors.
+        start : int, optional, default=0
+            The index of the first record to read
+        stop : int, optional, default=None
+            The index of the record to stop reading before. If None, the file is read to the end.
+
+        Yields
+        ------
+        record_index : int
+            The index of the record in the file
+        molecule : Molecule or None
+            The molecule of this record, or None if the record could not be read
+        error : Exception or None
+            The reason the record could not be read, or None if it was read successfully
+        """
+        molecules = self.from_file(file_path, file_format, allow_undefined_stereo=allow_undefined_stereo)
+        for record_index, molecule in itertools.islice(enumerate(molecules), start, stop):
+            yield record_index, molecule, None
+
+    def from_file_parallel(self,
+                           file_path,
+                           file_format,
+                           allow_undefined_stereo=False,
+                           n_workers=None,
+                           index_path=None,
+                           serialize=False,
+                           errors=None):
+        """
+        Read all molecules from an uncompressed SDF or SMILES file, splitting the work across a pool of processes.
+
+        The byte offsets of the records in the file are found first (or loaded from ``index_path``), and each
+        worker is handed a contiguous range of records to read and convert with this toolkit.
+
+        Parameters
+        ----------
+        file_path : str
+            The file to read the molecules from
+        file_format : str
+            Format specifier, one of 'SDF', 'MOL' or 'SMI'
+        allow_undefined_stereo : bool, default=False
+            If false, raises an exception if any molecules contain undefined stereochemistry.
+        n_workers : int, optional, default=None
+            The number of worker processes. If None, the number of CPUs is used.
+        index_path : str, optional, default=None
+            The path to save the record byte-offset index of the file to, so that it only has to be built once.
+            The index is rebuilt if the file has changed since it was saved.
+        serialize : bool, optional, default=False
+            If True, the dict representation of each molecule (see ``Molecule.to_dict``) is returned instead
+            of the molecule, which avoids reconstructing the molecules in the parent process.
+        errors : list, optional, default=None
+            If given, a ``(record_index, error)`` tuple is appended to this list for each record that could not be
+            parsed or sanitized. Otherwise, a warning is logged for these records. In both cases they are skipped.
+            Errors converting the parsed records to molecules are raised.
+
+        Returns
+        -------
+        molecules : list of Molecule or list of dict
+            The molecules of the file, in the order of the file
+        """
+        file_format = file_format.upper()
+        if file_path.endswith(tuple(_COMPRESSED_FILE_OPENERS)):
+            raise ValueError(f'Compressed files can not be read in parallel, since the records can not be '
+                             f'located in them without decompressing the whole file: {file_path}')
+        if not hasattr(self, '_iter_file_obj'):
+            raise NotImplementedError(f'{self.toolkit_name} can not read files in parallel')
+        if n_workers is None:
+            n_workers = os.cpu_count()
+
+        offsets = _get_record_offsets(file_path, file_format, index_path=index_path)
+        n_records = len(offsets) - 1
+        # Use a few chunks per worker to balance the load
+        n_chunks = max(1, min(n_records, 4 * n_workers))
+        chunk_first_records = np.linspace(0, n_records, n_chunks + 1).astype(np.int64)
+        chunks = [(first_record, (int(offsets[first_record]), int(offsets[last_record])))
+                  for first_record, last_record in zip(chunk_first_records[:-1], chunk_first_records[1:])
+                  if last_record > first_record]
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            chunk_records = executor.map(_read_file_byte_range,
+                                         itertools.repeat(self.__class__),
+                                         itertools.repeat(file_path),
+                                         itertools.repeat(file_format),
+                                         [byte_range for _, byte_range in chunks],
+                                         [int(first_record) for first_record, _ in chunks],
+                                         itertools.repeat(allow_undefined_stereo),
+                                         itertools.repeat(serialize))
+            molecules = list()
+            for record_index, molecule, error in itertools.chain.from_iterable(chunk_records):
+                if error is None:
+                    molecules.append(molecule)
+                elif errors is not None:
+                    errors.append((record_index, error))
+                else:
+                    logger.warning(f'Skipping record {record_index} of {file_path}: {error}')
+        return molecules
+
     def from_file_obj(self,
                       file_obj,
                       file_format,
@@ -259,6 +603,28 @@ class ToolkitWrapper:
         """
         return NotImplementedError
 
+    def _open_molecule_writer(self, file_obj, file_format):
+        """
+        Open a writer that writes many molecules to a file-like object in the given format.
+
+        This default implementation calls ``to_file_obj`` for each molecule. Toolkits which can
+        keep one output stream open between molecules override it.
+
+        Parameters
+        ----------
+        file_obj : file-like object
+            The text file-like object to write to
+        file_format : str
+            The upper case format specifier
+
+        Returns
+        -------
+        writer
+            An object with a ``write(molecule)`` method that writes a molecule and all its conformers,
+            and a ``close()`` method that must be called after the last molecule
+        """
+        return _FileObjMoleculeWriter(self, file_obj, file_format)
+
 
 @inherit_docstrings
 class OpenEyeToolkitWrapper(ToolkitWrapper):
@@ -419,6 +785,76 @@ class OpenEyeToolkitWrapper(ToolkitWrapper):
         ifs = oechem.oemolistream(file_path)
         return self._read_oemolistream_molecules(ifs, allow_undefined_stereo, file_path=file_path)
 
+    def iter_file(self,
+                  file_path,
+                  file_format,
+                  allow_undefined_stereo=False,
+                  start=0,
+                  stop=None):
+        """
+        Lazily create openforcefield.topology.Molecule objects from the records of a file using this toolkit.
+
+        Gzipped files are streamed by OpenEye directly. Files compressed with bzip2 are decompressed into memory first.
+
+        Parameters
+        ----------
+        file_path : str
+            The file to read the molecules from
+        file_format : str
+            Format specifier, usually file suffix (eg. 'MOL2', 'SMI')
+            Note that not all toolkits support all formats. Check ToolkitWrapper.toolkit_file_read_formats for details.
+        allow_undefined_stereo : bool, default=False
+            If false, the records of molecules with undefined stereochemistry are reported as errors.
+        start : int, optional, default=0
+            The index of the first record to read
+        stop : int, optional, default=None
+            The index of the record to stop reading before. If None, the file is read to the end.
+
+        Yields
+        ------
+        record_index : int
+            The index of the record in the file
+        molecule : Molecule or None
+            The molecule of this record, or None if the record could not be read
+        error : Exception or None
+            The reason the record could not be read, or None if it was read successfully
+        """
+        from openeye import oechem
+
+        if file_path.endswith('.bz2'):
+            with _open_file(file_path, 'rb') as file_obj:
+                yield from self._iter_file_obj(file_obj, file_format, allow_undefined_stereo, start, stop)
+            return
+
+        # oemolistream detects the format (and gzip compression) from the file name
+        ifs = oechem.oemolistream(file_path)
+        try:
+            yield from self._iter_oemolistream_records(ifs, allow_undefined_stereo, file_path=file_path,
+                                                       start=start, stop=stop)
+        finally:
+            ifs.close()
+
+    def _iter_file_obj(self, file_obj, file_format, allow_undefined_stereo=False, start=0, stop=None,
+                       first_record_index=0, raise_conversion_errors=False):
+        """
+        Lazily create openforcefield.topology.Molecule objects from the records of a binary file-like object.
+
+        See ``iter_file`` for details. The whole file object is read into memory first. ``start`` and ``stop``
+        count the records in ``file_obj``, while ``first_record_index`` is the index in the whole file of its
+        first record, for when it holds only part of a file.
+        """
+        from openeye import oechem
+
+        ifs = oechem.oemolistream()
+        ifs.openstring(file_obj.read())
+        ifs.SetFormat(getattr(oechem, 'OEFormat_' + file_format.upper()))
+        try:
+            yield from self._iter_oemolistream_records(ifs, allow_undefined_stereo, start=start, stop=stop,
+                                                       first_record_index=first_record_index,
+                                                       raise_conversion_errors=raise_conversion_errors)
+        finally:
+            ifs.close()
+
     def from_file_obj(self,
                       file_obj,
                       file_format,
@@ -512,6 +948,9 @@ class OpenEyeToolkitWrapper(ToolkitWrapper):
         oechem.OEWriteMolecule(ofs, oemol)
         ofs.close()
 
+    def _open_molecule_writer(self, file_obj, file_format):
+        return _OpenEyeMoleculeWriter(self, file_obj, file_format)
+
     @classmethod
     def _read_oemolistream_molecules(cls, oemolistream, allow_undefined_stereo, file_path=None):
         """
@@ -534,25 +973,105 @@ class OpenEyeToolkitWrapper(ToolkitWrapper):
             The list of Molecule objects in the stream.
 
         """
-        from openforcefield.topology import Molecule
+        return list(cls._iter_oemolistream_molecules(oemolistream, allow_undefined_stereo, file_path=file_path))
+
+    @classmethod
+    def _iter_oemolistream_molecules(cls, oemolistream, allow_undefined_stereo, file_path=None):
+        """
+        Lazily reads the Molecules in a OEMol input stream.
+
+        Parameters
+        ----------
+        oemolistream : oechem.oemolistream
+            The OEMol input stream to read from.
+        allow_undefined_stereo : bool
+            If false, raises an exception if oemol contains undefined stereochemistry.
+        file_path : str, optional
+            The path to the mol2 file. This is used exclusively to make
+            the error message more meaningful when the mol2 files doesn't
+            use Tripos atom types.
+
+        Yields
+        ------
+        molecule : Molecule
+            The next Molecule object in the stream.
+
+        Raises
+        ------
+        UndefinedStereochemistryError
+            If a molecule contains undefined stereochemistry and ``allow_undefined_stereo`` is False.
+
+        """
+        records = cls._iter_oemolistream_records(oemolistream, allow_undefined_stereo, file_path=file_path)
+        for _, mol, error in records:
+            if error is not None:
+                raise error
+            yield mol
+
+    @classmethod
+    def _iter_oemolistream_records(cls, oemolistream, allow_undefined_stereo, file_path=None, start=0, stop=None,
+                                   first_record_index=0, raise_conversion_errors=False):
+        """
+        Lazily reads the Molecules in a OEMol input stream, reporting the records that can not be converted.
+
+        Parameters
+        ----------
+        oemolistream : oechem.oemolistream
+            The OEMol input stream to read from.
+        allow_undefined_stereo : bool
+            If false, the records of molecules with undefined stereochemistry are reported as errors.
+        file_path : str, optional
+            The path to the mol2 file. This is used exclusively to make
+            the error message more meaningful when the mol2 files doesn't
+            use Tripos atom types.
+        start : int, optional, default=0
+            The index in the stream of the first record to convert. The records before it are read but not converted.
+        stop : int, optional, default=None
+            The index in the stream of the record to stop reading before. If None, the stream is read to the end.
+        first_record_index : int, optional, default=0
+            The index reported for the first record of the stream.
+        raise_conversion_errors : bool, optional, default=False
+            If True, errors converting a record to a molecule are raised instead of reported.
+
+        Yields
+        ------
+        record_index : int
+            The index of the record
+        molecule : Molecule or None
+            The molecule of this record, or None if it could not be converted
+        error : Exception or None
+            The reason the record could not be converted, or None if it was converted successfully
+
+        """
         from openeye import oechem
 
-        mols = list()
         oemol = oechem.OEMol()
-        while oechem.OEReadMolecule(oemolistream, oemol):
-            oechem.OEPerceiveChiral(oemol)
-            oechem.OEAssignAromaticFlags(oemol, oechem.OEAroModel_MDL)
-            oechem.OE3DToInternalStereo(oemol)
-            mol = cls.from_openeye(
-                oemol,
-                allow_undefined_stereo=allow_undefined_stereo)
-            mols.append(mol)
+        for index in itertools.count():
+            if stop is not None and index >= stop:
+                break
+            if not oechem.OEReadMolecule(oemolistream, oemol):
+                break
+            if index < start:
+                continue
+
+            try:
+                oechem.OEPerceiveChiral(oemol)
+                oechem.OEAssignAromaticFlags(oemol, oechem.OEAroModel_MDL)
+                oechem.OE3DToInternalStereo(oemol)
+                mol = cls.from_openeye(
+                    oemol,
+                    allow_undefined_stereo=allow_undefined_stereo)
+            except Exception as error:
+                if raise_conversion_errors:
+                    raise
+                yield first_record_index + index, None, error
+                continue
 
             # Check if this file may be using GAFF atom types.
             if oemolistream.GetFormat() == oechem.OEFormat_MOL2:
                 cls._check_mol2_gaff_atom_type(mol, file_path)
 
-        return mols
+            yield first_record_index + index, mol, None
 
     @staticmethod
     def _check_mol2_gaff_atom_type(molecule, file_path=None):
@@ -769,8 +1288,49 @@ class OpenEyeToolkitWrapper(ToolkitWrapper):
         # TODO: What other information should we preserve besides name?
         # TODO: How should we preserve the name?
 
-        molecule = Molecule()
-        molecule.name = oemol.GetTitle()
+        # Extract the atom attributes, in the order of the OEMol's atom iterator
+        map_atoms = dict()  # {oemol_idx: molecule_idx}
+        atom_mapping = {}
+        atomic_numbers = list()
+        formal_charges = list()
+        is_aromatic = list()
+        atom_stereo = list()
+        atom_names = list()
+        for atom_index, oeatom in enumerate(oemol.GetAtoms()):
+            map_atoms[oeatom.GetIdx()] = atom_index  # store for mapping oeatom to molecule atom indices below
+            atom_mapping[atom_index] = oeatom.GetMapIdx()
+            atomic_numbers.append(oeatom.GetAtomicNum())
+            formal_charges.append(oeatom.GetFormalCharge())
+            is_aromatic.append(oeatom.IsAromatic())
+            atom_stereo.append(OpenEyeToolkitWrapper._openeye_cip_atom_stereochemistry(oemol, oeatom))
+            name = ''
+            if oeatom.HasData('name'):
+                name = oeatom.GetData('name')
+            atom_names.append(name)
+
+        # Extract the bond attributes
+        bonds = list()
+        bond_orders = list()
+        bond_is_aromatic = list()
+        bond_stereo = list()
+        fractional_bond_orders = list()
+        for oebond in oemol.GetBonds():
+            bonds.append((map_atoms[oebond.GetBgnIdx()], map_atoms[oebond.GetEndIdx()]))
+            bond_orders.append(oebond.GetOrder())
+            bond_is_aromatic.append(oebond.IsAromatic())
+            bond_stereo.append(OpenEyeToolkitWrapper._openeye_cip_bond_stereochemistry(oemol, oebond))
+            if oebond.HasData('fractional_bond_order'):
+                fractional_bond_orders.append(oebond.GetData('fractional_bond_order'))
+            else:
+                fractional_bond_orders.append(None)
+
+        molecule = Molecule.from_arrays(atomic_numbers, formal_charges, is_aromatic, atom_stereo,
+                                        bonds, bond_orders,
+                                        bond_is_aromatic=bond_is_aromatic,
+                                        bond_stereo=bond_stereo,
+                                        fractional_bond_orders=fractional_bond_orders,
+                                        atom_names=atom_names,
+                                        name=oemol.GetTitle())
 
         # Copy any attached SD tag information
         # TODO: Should we use an API for this?
@@ -778,84 +1338,38 @@ class OpenEyeToolkitWrapper(ToolkitWrapper):
         for dp in oechem.OEGetSDDataPairs(oemol):
             molecule._properties[dp.GetTag()] = dp.GetValue()
 
-        map_atoms = dict()  # {oemol_idx: molecule_idx}
-        atom_mapping = {}
-        for oeatom in oemol.GetAtoms():
-            oe_idx = oeatom.GetIdx()
-            map_id = oeatom.GetMapIdx()
-            atomic_number = oeatom.GetAtomicNum()
-            formal_charge = oeatom.GetFormalCharge()
-            is_aromatic = oeatom.IsAromatic()
-            stereochemistry = OpenEyeToolkitWrapper._openeye_cip_atom_stereochemistry(
-                oemol, oeatom)
-            #stereochemistry = self._openeye_cip_atom_stereochemistry(oemol, oeatom)
-            name = ''
-            if oeatom.HasData('name'):
-                name = oeatom.GetData('name')
-            atom_index = molecule.add_atom(
-                atomic_number,
-                formal_charge,
-                is_aromatic,
-                stereochemistry=stereochemistry,
-                name=name)
-            map_atoms[
-                oe_idx] = atom_index  # store for mapping oeatom to molecule atom indices below
-            atom_mapping[atom_index] = map_id
-
         # if we have a full atom map add it to the molecule, 0 indicates a missing mapping or no mapping
         if 0 not in atom_mapping.values():
             molecule._properties['atom_map'] = atom_mapping
 
-        for oebond in oemol.GetBonds():
-            atom1_index = map_atoms[oebond.GetBgnIdx()]
-            atom2_index = map_atoms[oebond.GetEndIdx()]
-            bond_order = oebond.GetOrder()
-            is_aromatic = oebond.IsAromatic()
-            stereochemistry = OpenEyeToolkitWrapper._openeye_cip_bond_stereochemistry(
-                oemol, oebond)
-            if oebond.HasData('fractional_bond_order'):
-                fractional_bond_order = oebond.GetData('fractional_bond_order')
-            else:
-                fractional_bond_order = None
-
-            molecule.add_bond(
-                atom1_index,
-                atom2_index,
-                bond_order,
-                is_aromatic=is_aromatic,
-                stereochemistry=stereochemistry,
-                fractional_bond_order=fractional_bond_order)
-
         # TODO: Copy conformations, if present
         # TODO: Come up with some scheme to know when to import coordinates
         # From SMILES: no
         # From MOL2: maybe
         # From other: maybe
         if hasattr(oemol, 'GetConfs'):
+            n_atoms = molecule.n_atoms
+            # OE indices of the atoms, in the order of the Molecule's atoms
+            oe_indices = np.empty(n_atoms, dtype=np.int64)
+            for oe_idx, off_idx in map_atoms.items():
+                oe_indices[off_idx] = oe_idx
+            oe_coords = oechem.OEFloatArray(3 * oemol.GetMaxAtomIdx())
+            conformers = list()
             for conf in oemol.GetConfs():
-                n_atoms = molecule.n_atoms
-                positions = unit.Quantity(
-                    np.zeros([n_atoms, 3], np.float), unit.angstrom)
-                for oe_id in conf.GetCoords().keys():
-                    off_atom_coords = unit.Quantity(conf.GetCoords()[oe_id],
-                                                    unit.angstrom)
-                    off_atom_index = map_atoms[oe_id]
-                    positions[off_atom_index, :] = off_atom_coords
-                if (positions == 0 * unit.angstrom).all() and n_atoms > 1:
+                conf.GetCoords(oe_coords)
+                positions = np.array(oe_coords, dtype=np.float64).reshape(-1, 3)[oe_indices]
+                if not positions.any() and n_atoms > 1:
                     continue
-                molecule.add_conformer(positions)
+                conformers.append(positions)
+            if len(conformers) != 0:
+                molecule.add_conformers(unit.Quantity(np.stack(conformers), unit.angstrom))
 
         # Copy partial charges, if present
-        partial_charges = unit.Quantity(
-            np.zeros(molecule.n_atoms, dtype=np.float),
-            unit=unit.elementary_charge)
-        for oe_atom in oemol.GetAtoms():
-            oe_idx = oe_atom.GetIdx()
-            off_idx = map_atoms[oe_idx]
-            charge = oe_atom.GetPartialCharge() * unit.elementary_charge
-            partial_charges[off_idx] = charge
+        partial_charges = np.zeros(molecule.n_atoms, dtype=np.float)
+        for off_idx, oe_atom in enumerate(oemol.GetAtoms()):
+            partial_charges[off_idx] = oe_atom.GetPartialCharge()
 
-        molecule.partial_charges = partial_charges
+        molecule.partial_charges = unit.Quantity(partial_charges, unit.elementary_charge)
 
         return molecule
 
@@ -992,20 +1506,17 @@ class OpenEyeToolkitWrapper(ToolkitWrapper):
         # Retain conformations, if present
         if molecule.n_conformers != 0:
             oemol.DeleteConfs()
-            for conf in molecule._conformers:
+            # Reorder all conformers into OE atom indexing at once
+            conformers = molecule.conformers_array.value_in_unit(unit.angstrom)
+            oe_conformers = np.zeros((molecule.n_conformers, oemol.NumAtoms(), 3),
+                                     dtype=np.float32)
+            off_indices = list(map_atoms.keys())
+            oe_indices = list(map_atoms.values())
+            oe_conformers[:, oe_indices] = conformers[:, off_indices]
+            # TODO: Is there any risk that the atom indexing systems will change?
+            for oe_conformer in oe_conformers:
                 # OE needs a 1 x (3*n_Atoms) double array as input
-                flat_coords = np.zeros((oemol.NumAtoms() * 3),
-                                       dtype=np.float32)
-                for index, oe_idx in map_atoms.items():
-                    (x, y, z) = conf[index, :] / unit.angstrom
-                    flat_coords[(3 * oe_idx)] = x
-                    flat_coords[(3 * oe_idx) + 1] = y
-                    flat_coords[(3 * oe_idx) + 2] = z
-
-                # TODO: Do we need to do these internal unit checks?
-                # TODO: Is there any risk that the atom indexing systems will change?
-                #flat_coords = (conf.in_units_of(unit.angstrom) / unit.angstrom).flatten()
-                oecoords = oechem.OEFloatArray(flat_coords)
+                oecoords = oechem.OEFloatArray(oe_conformer.ravel())
                 oemol.NewConf(oecoords)
 
         # Retain charges, if present
@@ -1285,10 +1796,10 @@ class OpenEyeToolkitWrapper(ToolkitWrapper):
         molecule2 = self.from_openeye(oemol, allow_undefined_stereo=True)
 
         if clear_existing:
-            molecule._conformers = list()
+            molecule._set_conformers(None)
 
-        for conformer in molecule2._conformers:
-            molecule._add_conformer(conformer)
+        if molecule2.n_conformers != 0:
+            molecule._add_conformers(molecule2.conformers_array)
 
     def compute_partial_charges(self, molecule, quantum_chemical_method="AM1-BCC", partial_charge_method='None'):
         #charge_model="am1bcc"):
@@ -1481,7 +1992,7 @@ class OpenEyeToolkitWrapper(ToolkitWrapper):
         if use_conformers is None:
             temp_mol.generate_conformers(n_conformers=1)
         else:
-            temp_mol._conformers = None
+            temp_mol.set_conformers(None)
             for conformer in use_conformers:
                 temp_mol.add_conformer(conformer)
 
@@ -1779,7 +2290,8 @@ class RDKitToolkitWrapper(ToolkitWrapper):
     def from_file(self,
                   file_path,
                   file_format,
-                  allow_undefined_stereo=False):
+                  allow_undefined_stereo=False,
+                  n_workers=1):
         """
         Create an openforcefield.topology.Molecule from a file using this toolkit.
 
@@ -1794,6 +2306,9 @@ class RDKitToolkitWrapper(ToolkitWrapper):
             Note that not all toolkits support all formats. Check ToolkitWrapper.toolkit_file_read_formats for details.
         allow_undefined_stereo : bool, default=False
             If false, raises an exception if oemol contains undefined stereochemistry.
+        n_workers : int, optional, default=1
+            The number of processes to read uncompressed SDF and SMILES files with. If None, the number of CPUs
+            is used. See ``from_file_parallel``. Compressed files are always read by a single process.
 
         Returns
         -------
@@ -1801,33 +2316,22 @@ class RDKitToolkitWrapper(ToolkitWrapper):
             a list of Molecule objects is returned.
 
         """
-        from rdkit import Chem
         mols = list()
-        if (file_format == 'MOL') or (file_format == 'SDF'):
-            for rdmol in Chem.SupplierFromFilename(file_path, removeHs=False, sanitize=False, strictParsing=True):
-                if rdmol is None:
-                    continue
-
-                # Sanitize the molecules (fails on nitro groups)
-                try:
-                    Chem.SanitizeMol(rdmol, Chem.SANITIZE_ALL ^ Chem.SANITIZE_SETAROMATICITY ^ Chem.SANITIZE_ADJUSTHS)
-                    Chem.AssignStereochemistryFrom3D(rdmol)
-                except ValueError as e:
-                    print(rdmol.GetProp('_Name'), e)
-                    continue
-                Chem.SetAromaticity(rdmol, Chem.AromaticityModel.AROMATICITY_MDL)
-                mol = self.from_rdkit(rdmol, allow_undefined_stereo=allow_undefined_stereo)
-                mols.append(mol)
-
-        elif (file_format == 'SMI'):
-            # TODO: We have to do some special stuff when we import SMILES (currently
-            # just adding H's, but could get fancier in the future). It might be
-            # worthwhile to parse the SMILES file ourselves and pass each SMILES
-            # through the from_smiles function instead
-            for rdmol in Chem.SmilesMolSupplier(file_path, titleLine=False):
-                rdmol = Chem.AddHs(rdmol)
-                mol = self.from_rdkit(rdmol, allow_undefined_stereo=allow_undefined_stereo)
-                mols.append(mol)
+        is_compressed = file_path.endswith(tuple(_COMPRESSED_FILE_OPENERS))
+        if file_format in ['MOL', 'SDF', 'SMI'] and n_workers != 1 and not is_compressed:
+            mols = self.from_file_parallel(file_path, file_format, allow_undefined_stereo=allow_undefined_stereo,
+                                           n_workers=n_workers)
+
+        elif file_format in ['MOL', 'SDF', 'SMI']:
+            # Records that can't be parsed or sanitized are skipped, while conversion errors are raised
+            with _open_file(file_path, 'rb') as file_obj:
+                records = self._iter_file_obj(file_obj, file_format, allow_undefined_stereo=allow_undefined_stereo,
+                                              raise_conversion_errors=True)
+                for record_index, mol, error in records:
+                    if error is not None:
+                        logger.warning(f'Skipping record {record_index} of {file_path}: {error}')
+                        continue
+                    mols.append(mol)
 
         elif (file_format == 'PDB'):
             raise Exception(
@@ -1844,6 +2348,142 @@ class RDKitToolkitWrapper(ToolkitWrapper):
 
         return mols
 
+    def iter_file(self,
+                  file_path,
+                  file_format,
+                  allow_undefined_stereo=False,
+                  start=0,
+                  stop=None):
+        """
+        Lazily create openforcefield.topology.Molecule objects from the records of a file using this toolkit.
+
+        Files whose names end in ``.gz`` or ``.bz2`` are decompressed on the fly. Records that can not be
+        parsed, sanitized or converted are reported instead of raising an exception.
+
+        Parameters
+        ----------
+        file_path : str
+            The file to read the molecules from
+        file_format : str
+            Format specifier, usually file suffix (eg. 'SDF', 'SMI')
+            Note that not all toolkits support all formats. Check ToolkitWrapper.toolkit_file_read_formats for details.
+        allow_undefined_stereo : bool, default=False
+            If false, the records of molecules with undefined stereochemistry are reported as errors.
+        start : int, optional, default=0
+            The index of the first record to read
+        stop : int, optional, default=None
+            The index of the record to stop reading before. If None, the file is read to the end.
+
+        Yields
+        ------
+        record_index : int
+            The index of the record in the file
+        molecule : Molecule or None
+            The molecule of this record, or None if the record could not be read
+        error : Exception or None
+            The reason the record could not be read, or None if it was read successfully
+        """
+        with _open_file(file_path, 'rb') as file_obj:
+            yield from self._iter_file_obj(file_obj, file_format, allow_undefined_stereo, start, stop)
+
+    def _iter_file_obj(self, file_obj, file_format, allow_undefined_stereo=False, start=0, stop=None,
+                       first_record_index=0, raise_conversion_errors=False):
+        """
+        Lazily create openforcefield.topology.Molecule objects from the records of a binary file-like object.
+
+        See ``iter_file`` for details. ``start`` and ``stop`` count the records in ``file_obj``, while
+        ``first_record_index`` is the index in the whole file of its first record, for when it holds
+        only part of a file. If ``raise_conversion_errors`` is True, errors converting the records that
+        were parsed and sanitized to molecules are raised instead of reported.
+        """
+        from rdkit import Chem
+
+        file_format = file_format.upper()
+        if file_format in ['MOL', 'SDF']:
+            supplier = Chem.ForwardSDMolSupplier(file_obj, removeHs=False, sanitize=False, strictParsing=True)
+            for record_index, rdmol in itertools.islice(enumerate(supplier, first_record_index), start, stop):
+                if rdmol is None:
+                    yield record_index, None, ValueError('Unable to parse the SDF record')
+                    continue
+                try:
+                    self._sanitize_sdf_rdmol(rdmol)
+                except ValueError as error:
+                    yield record_index, None, error
+                    continue
+                yield from self._convert_record(rdmol, record_index, allow_undefined_stereo, raise_conversion_errors)
+
+        elif file_format == 'SMI':
+            # Skip blank lines without counting them as records, as Chem.SmilesMolSupplier does
+            records = (line.decode().split() for line in file_obj if line.strip())
+            for record_index, fields in itertools.islice(enumerate(records, first_record_index), start, stop):
+                rdmol = self._rdmol_from_smi_record(fields)
+                if rdmol is None:
+                    yield record_index, None, ValueError(f'Unable to parse the SMILES {fields[0]}')
+                    continue
+                yield from self._convert_record(rdmol, record_index, allow_undefined_stereo, raise_conversion_errors)
+
+        else:
+            raise NotImplementedError(f'RDKitToolkitWrapper can not stream molecules from {file_format} files')
+
+    def _convert_record(self, rdmol, record_index, allow_undefined_stereo, raise_conversion_errors):
+        """Yield the ``(record_index, molecule, error)`` record of a parsed RDKit molecule."""
+        try:
+            molecule = self.from_rdkit(rdmol, allow_undefined_stereo=allow_undefined_stereo)
+        except Exception as error:
+            if raise_conversion_errors:
+                raise
+            yield record_index, None, error
+        else:
+            yield record_index, molecule, None
+
+    @staticmethod
+    def _sanitize_sdf_rdmol(rdmol):
+        """
+        Sanitize an RDKit molecule read from an SDF record without sanitization, in place.
+
+        Parameters
+        ----------
+        rdmol : rdkit.Chem.Mol
+            The molecule to sanitize
+
+        Raises
+        ------
+        ValueError
+            If the molecule can not be sanitized (eg. some nitro groups)
+        """
+        from rdkit import Chem
+        Chem.SanitizeMol(rdmol, Chem.SANITIZE_ALL ^ Chem.SANITIZE_SETAROMATICITY ^ Chem.SANITIZE_ADJUSTHS)
+        Chem.AssignStereochemistryFrom3D(rdmol)
+        Chem.SetAromaticity(rdmol, Chem.AromaticityModel.AROMATICITY_MDL)
+
+    @staticmethod
+    def _rdmol_from_smi_record(fields):
+        """
+        Create an RDKit molecule with explicit hydrogens from the whitespace separated fields of a SMILES file line.
+
+        The second field is used as the molecule name and any further fields are stored as
+        ``Column_<index>`` properties, as in ``Chem.SmilesMolSupplier``.
+
+        Parameters
+        ----------
+        fields : list of str
+            The SMILES followed by the optional name and other columns
+
+        Returns
+        -------
+        rdmol : rdkit.Chem.Mol or None
+            The molecule, or None if the SMILES could not be parsed
+        """
+        from rdkit import Chem
+        rdmol = Chem.MolFromSmiles(fields[0])
+        if rdmol is None:
+            return None
+        if len(fields) > 1:
+            rdmol.SetProp('_Name', fields[1])
+        for column_index, value in enumerate(fields[2:], 2):
+            rdmol.SetProp(f'Column_{column_index}', value)
+        return Chem.AddHs(rdmol)
+
     def from_file_obj(self,
                       file_obj,
                       file_format,
@@ -1954,6 +2594,14 @@ class RDKitToolkitWrapper(ToolkitWrapper):
         with open(file_path, 'w') as file_obj:
             self.to_file_obj(molecule=molecule, file_obj=file_obj, file_format=file_format)
 
+    def _open_molecule_writer(self, file_obj, file_format):
+        """
+        Open a writer that writes many molecules and their conformers to a file-like object through one RDKit writer.
+
+        See ``ToolkitWrapper._open_molecule_writer``.
+        """
+        return _RDKitMoleculeWriter(self, file_obj, file_format.upper())
+
     def canonical_order_atoms(self, molecule):
         """
         Canonical order the atoms in the molecule using the RDKit.
@@ -2152,10 +2800,10 @@ class RDKitToolkitWrapper(ToolkitWrapper):
         molecule2 = self.from_rdkit(rdmol, allow_undefined_stereo=True)
 
         if clear_existing:
-            molecule._conformers = list()
+            molecule._set_conformers(None)
 
-        for conformer in molecule2._conformers:
-            molecule._add_conformer(conformer)
+        if molecule2.n_conformers != 0:
+            molecule._add_conformers(molecule2.conformers_array)
 
     def from_rdkit(self, rdmol, allow_undefined_stereo=False):
         """
@@ -2217,25 +2865,12 @@ class RDKitToolkitWrapper(ToolkitWrapper):
         self._detect_undefined_stereo(rdmol, raise_warning=allow_undefined_stereo,
                                       err_msg_prefix="Unable to make OFFMol from RDMol: ")
 
-        # Create a new openforcefield Molecule
-        offmol = Molecule()
-
-        # If RDMol has a title save it
-        if rdmol.HasProp("_Name"):
-            #raise Exception('{}'.format(rdmol.GetProp('name')))
-            offmol.name = rdmol.GetProp("_Name")
-        else:
-            offmol.name = ""
-
-        # Store all properties
-        # TODO: Should there be an API point for storing properties?
-        properties = rdmol.GetPropsAsDict()
-        offmol._properties = properties
-
-        # setting chirality in openeye requires using neighbor atoms
-        # therefore we can't do it until after the atoms and bonds are all added
-        map_atoms = {}
-        map_bonds = {}
+        # Extract the atom attributes. The RDKit atom indices are kept, so no index mapping is needed.
+        atomic_numbers = list()
+        formal_charges = list()
+        is_aromatic = list()
+        atom_stereo = list()
+        atom_names = list()
         # if we are loading from a mapped smiles extract the mapping
         atom_mapping = {}
         for rda in rdmol.GetAtoms():
@@ -2246,12 +2881,11 @@ class RDKitToolkitWrapper(ToolkitWrapper):
                 map_id = int(rda.GetProp('_map_idx'))
             except KeyError:
                 map_id = rda.GetAtomMapNum()
+            atom_mapping[rd_idx] = map_id
 
-            # create a new atom
-            #atomic_number = oemol.NewAtom(rda.GetAtomicNum())
-            atomic_number = rda.GetAtomicNum()
-            formal_charge = rda.GetFormalCharge()
-            is_aromatic = rda.GetIsAromatic()
+            atomic_numbers.append(rda.GetAtomicNum())
+            formal_charges.append(rda.GetFormalCharge())
+            is_aromatic.append(rda.GetIsAromatic())
             if rda.HasProp('_Name'):
                 name = rda.GetProp('_Name')
             else:
@@ -2260,59 +2894,33 @@ class RDKitToolkitWrapper(ToolkitWrapper):
                     name = rda.GetMonomerInfo().GetName().strip()
                 except AttributeError:
                     name = ''
+            atom_names.append(name)
 
-            # If chiral, store the chirality to be set later
             stereochemistry = None
-            #tag = rda.GetChiralTag()
             if rda.HasProp('_CIPCode'):
                 stereo_code = rda.GetProp('_CIPCode')
-                #if tag == Chem.CHI_TETRAHEDRAL_CCW:
                 if stereo_code == 'R':
                     stereochemistry = 'R'
-                #if tag == Chem.CHI_TETRAHEDRAL_CW:
                 elif stereo_code == 'S':
                     stereochemistry = 'S'
                 else:
                     raise UndefinedStereochemistryError("In from_rdkit: Expected atom stereochemistry of R or S. "
                                                         "Got {} instead.".format(stereo_code))
-
-            atom_index = offmol.add_atom(
-                atomic_number,
-                formal_charge,
-                is_aromatic,
-                name=name,
-                stereochemistry=stereochemistry)
-            map_atoms[rd_idx] = atom_index
-            atom_mapping[atom_index] = map_id
-
-        # if we have a full atom map add it to the molecule, 0 indicates a missing mapping or no mapping
-        if 0 not in atom_mapping.values():
-            offmol._properties['atom_map'] = atom_mapping
-
-        # Similar to chirality, stereochemistry of bonds in OE is set relative to their neighbors
+            atom_stereo.append(stereochemistry)
+
+        # Extract the bond attributes
+        bonds = list()
+        bond_orders = list()
+        bond_is_aromatic = list()
+        bond_stereo = list()
+        fractional_bond_orders = list()
         for rdb in rdmol.GetBonds():
-            rdb_idx = rdb.GetIdx()
-            a1 = rdb.GetBeginAtomIdx()
-            a2 = rdb.GetEndAtomIdx()
-
-            # Determine bond aromaticity and Kekulized bond order
-            is_aromatic = rdb.GetIsAromatic()
-            order = rdb.GetBondTypeAsDouble()
-            # Convert floating-point bond order to integral bond order
-            order = int(order)
-
-            # create a new bond
-            bond_index = offmol.add_bond(map_atoms[a1], map_atoms[a2], order,
-                                         is_aromatic)
-            map_bonds[rdb_idx] = bond_index
-
-        # Now fill in the cached (structure-dependent) properties. We have to have the 2D structure of the molecule
-        # in place first, because each call to add_atom and add_bond invalidates all cached properties
-        for rdb in rdmol.GetBonds():
-            rdb_idx = rdb.GetIdx()
-            offb_idx = map_bonds[rdb_idx]
-            offb = offmol.bonds[offb_idx]
-            # determine if stereochemistry is needed
+            bonds.append((rdb.GetBeginAtomIdx(), rdb.GetEndAtomIdx()))
+            # Determine bond aromaticity and Kekulized bond order,
+            # converting the floating-point bond order to integral bond order
+            bond_orders.append(int(rdb.GetBondTypeAsDouble()))
+            bond_is_aromatic.append(rdb.GetIsAromatic())
+
             stereochemistry = None
             tag = rdb.GetStereo()
             if tag == Chem.BondStereo.STEREOZ:
@@ -2323,36 +2931,50 @@ class RDKitToolkitWrapper(ToolkitWrapper):
                 raise ValueError(
                     "Expected RDKit bond stereochemistry of E or Z, got {} instead"
                     .format(tag))
-            offb._stereochemistry = stereochemistry
+            bond_stereo.append(stereochemistry)
+
             fractional_bond_order = None
             if rdb.HasProp("fractional_bond_order"):
                 fractional_bond_order = rdb.GetDoubleProp(
                     'fractional_bond_order')
-            offb.fractional_bond_order = fractional_bond_order
-
-        # TODO: Save conformer(s), if present
-        # If the rdmol has a conformer, store its coordinates
-        if len(rdmol.GetConformers()) != 0:
-            for conf in rdmol.GetConformers():
-                n_atoms = offmol.n_atoms
-                # TODO: Will this always be angstrom when loading from RDKit?
-                positions = unit.Quantity(
-                    np.zeros((n_atoms, 3)), unit.angstrom)
-                for rd_idx, off_idx in map_atoms.items():
-                    atom_coords = conf.GetPositions()[rd_idx, :] * unit.angstrom
-                    positions[off_idx, :] = atom_coords
-                offmol.add_conformer(positions)
-
-        partial_charges = unit.Quantity(
-            np.zeros(offmol.n_atoms, dtype=np.float), unit=unit.elementary_charge)
+            fractional_bond_orders.append(fractional_bond_order)
+
+        # If RDMol has a title save it
+        if rdmol.HasProp("_Name"):
+            name = rdmol.GetProp("_Name")
+        else:
+            name = ""
+
+        # Create a new openforcefield Molecule
+        offmol = Molecule.from_arrays(atomic_numbers, formal_charges, is_aromatic, atom_stereo,
+                                      bonds, bond_orders,
+                                      bond_is_aromatic=bond_is_aromatic,
+                                      bond_stereo=bond_stereo,
+                                      fractional_bond_orders=fractional_bond_orders,
+                                      atom_names=atom_names,
+                                      name=name)
+
+        # Store all properties
+        # TODO: Should there be an API point for storing properties?
+        properties = rdmol.GetPropsAsDict()
+        offmol._properties = properties
+
+        # if we have a full atom map add it to the molecule, 0 indicates a missing mapping or no mapping
+        if 0 not in atom_mapping.values():
+            offmol._properties['atom_map'] = atom_mapping
+
+        # If the rdmol has conformers, store their coordinates in one block
+        if rdmol.GetNumConformers() != 0:
+            # TODO: Will this always be angstrom when loading from RDKit?
+            positions = np.stack([conf.GetPositions() for conf in rdmol.GetConformers()])
+            offmol._adopt_conformers(unit.Quantity(positions, unit.angstrom))
+
+        partial_charges = np.zeros(offmol.n_atoms, dtype=np.float)
 
         any_atom_has_partial_charge = False
         for rd_idx, rd_atom in enumerate(rdmol.GetAtoms()):
-            off_idx = map_atoms[rd_idx]
             if rd_atom.HasProp("partial_charge"):
-                charge = rd_atom.GetDoubleProp(
-                    "partial_charge") * unit.elementary_charge
-                partial_charges[off_idx] = charge
+                partial_charges[rd_idx] = rd_atom.GetDoubleProp("partial_charge")
                 any_atom_has_partial_charge = True
             else:
                 # If some other atoms had partial charges but this one doesn't, raise an Exception
@@ -2361,7 +2983,8 @@ class RDKitToolkitWrapper(ToolkitWrapper):
                         "Some atoms in rdmol have partial charges, but others do not."
                     )
 
-            offmol.partial_charges = partial_charges
+        if offmol.n_atoms != 0:
+            offmol.partial_charges = unit.Quantity(partial_charges, unit.elementary_charge)
         return offmol
 
     @classmethod
@@ -2515,11 +3138,11 @@ class RDKitToolkitWrapper(ToolkitWrapper):
         cls._assign_rdmol_bonds_stereo(molecule, rdmol)
 
         # Set coordinates if we have them
-        if molecule._conformers:
-            for conformer in molecule._conformers:
-                rdmol_conformer = Chem.Conformer()
-                for atom_idx in range(molecule.n_atoms):
-                    x, y, z = conformer[atom_idx, :].value_in_unit(unit.angstrom)
+        if molecule.n_conformers != 0:
+            # Strip units from all conformers at once instead of atom by atom
+            for conformer in molecule.conformers_array.value_in_unit(unit.angstrom).tolist():
+                rdmol_conformer = Chem.Conformer(molecule.n_atoms)
+                for atom_idx, (x, y, z) in enumerate(conformer):
                     rdmol_conformer.SetAtomPosition(atom_idx,
                                                     Geometry.Point3D(x, y, z))
                 rdmol.AddConformer(rdmol_conformer)
@@ -3013,8 +3636,7 @@ class AmberToolsToolkitWrapper(ToolkitWrapper):
 
         """
         # TODO: Check all tools needed
-        # TODO: How should we implement find_executable?
-        ANTECHAMBER_PATH = find_executable("antechamber")
+        ANTECHAMBER_PATH = shutil.which("antechamber")
         if ANTECHAMBER_PATH is None:
             return False
         else:
@@ -3067,12 +3689,11 @@ class AmberToolsToolkitWrapper(ToolkitWrapper):
         #                             SUPPORTED_ANTECHAMBER_CHARGE_MODELS))
         #
         # # Find the path to antechamber
-        # # TODO: How should we implement find_executable?
-        # ANTECHAMBER_PATH = find_executable("antechamber")
+        # ANTECHAMBER_PATH = shutil.which("antechamber")
         # if ANTECHAMBER_PATH is None:
         #     raise (IOError("Antechamber not found, cannot run charge_mol()"))
         #
-        # if len(molecule._conformers) == 0:
+        # if molecule.n_conformers == 0:
         #     raise Exception(
         #         "No conformers present in molecule submitted for partial charge calculation. Consider "
         #         "loading the molecule from a file with geometry already present or running "
@@ -3147,19 +3768,18 @@ class AmberToolsToolkitWrapper(ToolkitWrapper):
 
 
         # Find the path to antechamber
-        # TODO: How should we implement find_executable?
-        ANTECHAMBER_PATH = find_executable("antechamber")
+        ANTECHAMBER_PATH = shutil.which("antechamber")
         if ANTECHAMBER_PATH is None:
             raise (IOError("Antechamber not found, cannot run "
                            "AmberToolsToolkitWrapper.compute_partial_charges_am1bcc()"))
 
-        if len(molecule._conformers) == 0:
+        if molecule.n_conformers == 0:
             raise ValueError(
                 "No conformers present in molecule submitted for partial charge calculation. Consider "
                 "loading the molecule from a file with geometry already present or running "
                 "molecule.generate_conformers() before calling molecule.compute_partial_charges"
             )
-        if len(molecule._conformers) > 1:
+        if molecule.n_conformers > 1:
             logger.warning("Warning: In AmberToolsToolkitwrapper.compute_partial_charges_am1bcc: "
                            "Molecule '{}' has more than one conformer, but this function "
                            "will only generate charges for the first one.".format(molecule.name))
@@ -3336,8 +3956,7 @@ class AmberToolsToolkitWrapper(ToolkitWrapper):
          """
         from openforcefield.topology import Molecule
         # Find the path to antechamber
-        # TODO: How should we implement find_executable?
-        ANTECHAMBER_PATH = find_executable("antechamber")
+        ANTECHAMBER_PATH = shutil.which("antechamber")
         if ANTECHAMBER_PATH is None:
             raise (IOError("Antechamber not found, cannot run "
                            "AmberToolsToolkitWrapper.assign_fractional_bond_orders()"))
@@ -3348,17 +3967,17 @@ class AmberToolsToolkitWrapper(ToolkitWrapper):
         if use_conformers is None:
             temp_mol.generate_conformers(n_conformers=1)
         else:
-            temp_mol._conformers = None
+            temp_mol.set_conformers(None)
             for conformer in use_conformers:
                 temp_mol.add_conformer(conformer)
 
-        if len(temp_mol.conformers) == 0:
+        if temp_mol.n_conformers == 0:
             raise ValueError(
                 "No conformers present in molecule submitted for fractional bond order calculation. Consider "
                 "loading the molecule from a file with geometry already present or running "
                 "molecule.generate_conformers() before calling molecule.assign_fractional_bond_orders"
             )
-        if len(temp_mol.conformers) > 1:
+        if temp_mol.n_conformers > 1:
             logger.warning(f"Warning: In AmberToolsToolkitWrapper.assign_fractional_bond_orders: "
                            f"Molecule '{molecule.name}' has more than one conformer, but this function "
                            f"will only generate fractional bond orders for the first one.")
@@ -3416,6 +4035,36 @@ class AmberToolsToolkitWrapper(ToolkitWrapper):
 #=============================================================================================
 
 
+# Maximum number of (method, argument shape) keys for which a ToolkitRegistry remembers the toolkit that succeeded
+_MAX_DISPATCH_CACHE_SIZE = 1024
+
+
+def _get_argument_shape(args, kwargs):
+    """Return a hashable key describing the arguments of a ToolkitRegistry.call().
+
+    Positional arguments are described by their type. Keyword arguments are described by their name and, for
+    strings, booleans, integers and ``None`` (which typically select an option such as a charge model or file
+    format), their value, or by their type otherwise.
+
+    Parameters
+    ----------
+    args : tuple
+        The positional arguments.
+    kwargs : dict
+        The keyword arguments.
+
+    Returns
+    -------
+    argument_shape : tuple
+
+    """
+    kwargs_shape = tuple(
+        (name, value if isinstance(value, (str, bool, int, type(None))) else type(value))
+        for name, value in sorted(kwargs.items())
+    )
+    return tuple(type(arg) for arg in args), kwargs_shape
+
+
 class ToolkitRegistry:
     """
     Registry for ToolkitWrapper objects
@@ -3447,8 +4096,7 @@ class ToolkitRegistry:
     ...     if toolkit.is_available():
     ...         toolkit_registry.register_toolkit(toolkit)
 
-    Retrieve the global singleton toolkit registry, which is created when this module is imported from all available
-    toolkits:
+    Retrieve the global singleton toolkit registry, which registers all available toolkits when it is first used:
 
     >>> from openforcefield.utils.toolkits import GLOBAL_TOOLKIT_REGISTRY as toolkit_registry
     >>> available_toolkits = toolkit_registry.registered_toolkits
@@ -3459,7 +4107,8 @@ class ToolkitRegistry:
     def __init__(self,
                  register_imported_toolkit_wrappers=False,
                  toolkit_precedence=None,
-                 exception_if_unavailable=True):
+                 exception_if_unavailable=True,
+                 defer_registration=False):
         """
         Create an empty toolkit registry.
 
@@ -3473,10 +4122,20 @@ class ToolkitRegistry:
             None, defaults to [OpenEyeToolkitWrapper, RDKitToolkitWrapper, AmberToolsToolkitWrapper].
         exception_if_unavailable : bool, optional, default=True
             If True, an exception will be raised if the toolkit is unavailable
+        defer_registration : bool, optional, default=False
+            If True, the toolkits in ``toolkit_precedence`` are instantiated (which imports and probes the
+            underlying toolkits) the first time the registry is used rather than on construction.
 
         """
 
-        self._toolkits = list()
+        self._toolkit_list = list()
+        self._deferred_registration = None
+        # method name -> list of (toolkit, bound method) for the toolkits providing it, in order of precedence
+        self._dispatch_table = dict()
+        # (method name, argument shape) -> indices in the dispatch table of the toolkits that raised NotImplementedError
+        self._unimplemented_toolkits = dict()
+        # method name -> [number of calls, cumulative time in seconds]
+        self._call_statistics = dict()
 
         if toolkit_precedence is None:
             toolkit_precedence = [
@@ -3495,6 +4154,24 @@ class ToolkitRegistry:
                     continue
                 toolkit_precedence.append(toolkit)
 
+        if defer_registration:
+            self._deferred_registration = (toolkit_precedence, exception_if_unavailable)
+        else:
+            for toolkit in toolkit_precedence:
+                self.register_toolkit(toolkit, exception_if_unavailable=exception_if_unavailable)
+
+    @property
+    def _toolkits(self):
+        """The list of registered toolkit wrappers, completing any deferred registration first."""
+        if self._deferred_registration is not None:
+            self._register_deferred_toolkits()
+        return self._toolkit_list
+
+    def _register_deferred_toolkits(self):
+        """Register the toolkits whose registration was deferred on construction."""
+        toolkit_precedence, exception_if_unavailable = self._deferred_registration
+        # Clear the deferred registration first so register_toolkit() can append to the list.
+        self._deferred_registration = None
         for toolkit in toolkit_precedence:
             self.register_toolkit(toolkit, exception_if_unavailable=exception_if_unavailable)
 
@@ -3556,6 +4233,7 @@ class ToolkitRegistry:
 
         # Add toolkit to the registry.
         self._toolkits.append(toolkit_wrapper)
+        self._clear_dispatch_table()
 
     def add_toolkit(self, toolkit_wrapper):
         """
@@ -3575,6 +4253,68 @@ class ToolkitRegistry:
                                                        type(toolkit_wrapper))
             raise Exception(msg)
         self._toolkits.append(toolkit_wrapper)
+        self._clear_dispatch_table()
+
+    def _clear_dispatch_table(self):
+        """Forget the cached toolkit methods, which must be done whenever the registered toolkits change."""
+        self._dispatch_table.clear()
+        self._unimplemented_toolkits.clear()
+
+    def _get_dispatch_methods(self, method_name):
+        """Return the (toolkit, bound method) pairs providing ``method_name``, in order of precedence."""
+        try:
+            return self._dispatch_table[method_name]
+        except KeyError:
+            pass
+        # Resolve the toolkits before creating the entry, as completing a
+        # deferred registration clears the dispatch table.
+        toolkits = self._toolkits
+        methods = [(toolkit, getattr(toolkit, method_name))
+                   for toolkit in toolkits if hasattr(toolkit, method_name)]
+        self._dispatch_table[method_name] = methods
+        return methods
+
+    def __getstate__(self):
+        # Bound methods are rebuilt on demand rather than serialized.
+        state = self.__dict__.copy()
+        state['_dispatch_table'] = dict()
+        state['_unimplemented_toolkits'] = dict()
+        return state
+
+    @property
+    def call_statistics(self):
+        """
+        The number of calls and the cumulative time spent in each method executed through :py:meth:`call`.
+
+        .. warning :: This API is experimental and subject to change.
+
+        Returns
+        -------
+        call_statistics : dict of str: dict
+            For each method name, a dictionary with keys ``'n_calls'`` and ``'cumulative_time'``
+            (the total wall-clock time in seconds, including the toolkits that could not handle the call).
+
+        Examples
+        --------
+
+        >>> from openforcefield.topology import Molecule
+        >>> toolkit_registry = ToolkitRegistry(toolkit_precedence=[RDKitToolkitWrapper])
+        >>> molecule = Molecule.from_smiles('Cc1ccccc1', toolkit_registry=toolkit_registry)
+        >>> toolkit_registry.call_statistics['from_smiles']['n_calls']
+        1
+
+        """
+        return {method_name: {'n_calls': n_calls, 'cumulative_time': cumulative_time}
+                for method_name, (n_calls, cumulative_time) in self._call_statistics.items()}
+
+    def reset_call_statistics(self):
+        """
+        Reset the statistics reported by :py:attr:`call_statistics`.
+
+        .. warning :: This API is experimental and subject to change.
+
+        """
+        self._call_statistics.clear()
 
     # TODO: Can we automatically resolve calls to methods that are not explicitly defined using some Python magic?
 
@@ -3611,10 +4351,9 @@ class ToolkitRegistry:
         .. todo :: Is there a better way to figure out which toolkits implement given methods by introspection?
 
         """
-        for toolkit in self._toolkits:
-            if hasattr(toolkit, method_name):
-                method = getattr(toolkit, method_name)
-                return method
+        methods = self._get_dispatch_methods(method_name)
+        if len(methods) > 0:
+            return methods[0][1]
 
         # No toolkit was found to provide the requested capability
         # TODO: Can we help developers by providing a check for typos in expected method names?
@@ -3632,6 +4371,12 @@ class ToolkitRegistry:
 
         This is a convenient shorthand for ``toolkit_registry.resolve_method(method_name)(*args, **kwargs)``
 
+        The registry remembers which toolkits raised ``NotImplementedError`` for a given method and argument
+        shape (see :py:func:`_get_argument_shape`), and skips them on subsequent calls, so that a method which
+        always falls back to a lower-precedence toolkit does not pay for the failing toolkits every time.
+        Toolkits raising ``ValueError`` may still handle other inputs of the same shape, so they are always
+        tried again. The number of calls and the time spent are recorded in :py:attr:`call_statistics`.
+
         Parameters
         ----------
         method_name : str
@@ -3654,16 +4399,38 @@ class ToolkitRegistry:
         """
         # TODO: catch ValueError and compile list of methods that exist but rejected the specific parameters because they did not implement the requested methods
 
+        start_time = time.perf_counter()
+        try:
+            return self._dispatch(method_name, args, kwargs)
+        finally:
+            statistics = self._call_statistics.setdefault(method_name, [0, 0.0])
+            statistics[0] += 1
+            statistics[1] += time.perf_counter() - start_time
+
+    def _dispatch(self, method_name, args, kwargs):
+        """Execute ``method_name`` with the first toolkit able to handle the arguments (see :py:meth:`call`)."""
+        methods = self._get_dispatch_methods(method_name)
+        dispatch_key = (method_name, _get_argument_shape(args, kwargs))
+
         value_errors = list()
-        for toolkit in self._toolkits:
-            if hasattr(toolkit, method_name):
-                method = getattr(toolkit, method_name)
-                try:
-                    return method(*args, **kwargs)
-                except NotImplementedError:
-                    pass
-                except ValueError as value_error:
-                    value_errors.append((toolkit, value_error))
+
+        # Try the toolkits in order of precedence, skipping those that do not implement this
+        # method for these kinds of arguments. A ValueError may depend on the content of the
+        # arguments, so it is not remembered.
+        unimplemented_toolkits = self._unimplemented_toolkits.get(dispatch_key, ())
+        for index, (toolkit, method) in enumerate(methods):
+            if index in unimplemented_toolkits:
+                continue
+            try:
+                return method(*args, **kwargs)
+            except NotImplementedError:
+                if dispatch_key not in self._unimplemented_toolkits:
+                    if len(self._unimplemented_toolkits) >= _MAX_DISPATCH_CACHE_SIZE:
+                        self._unimplemented_toolkits.clear()
+                    unimplemented_toolkits = self._unimplemented_toolkits[dispatch_key] = set()
+                unimplemented_toolkits.add(index)
+            except ValueError as value_error:
+                value_errors.append((toolkit, value_error))
 
         # No toolkit was found to provide the requested capability
         # TODO: Can we help developers by providing a check for typos in expected method names?
@@ -3680,49 +4447,67 @@ class ToolkitRegistry:
 # GLOBAL TOOLKIT REGISTRY
 #=============================================================================================
 
-# Create global toolkit registry, where all available toolkits are registered
-# TODO: Should this be all lowercase since it's not a constant?
-GLOBAL_TOOLKIT_REGISTRY = ToolkitRegistry(
-    register_imported_toolkit_wrappers=True,
-    exception_if_unavailable=False)
+# Define basic toolkits that handle essential file I/O
 
-#=============================================================================================
-# SET GLOBAL TOOLKIT-AVAIABLE VARIABLES
-#=============================================================================================
+BASIC_CHEMINFORMATICS_TOOLKITS = [RDKitToolkitWrapper, OpenEyeToolkitWrapper]
 
-OPENEYE_AVAILABLE = False
-RDKIT_AVAILABLE = False
-AMBERTOOLS_AVAILABLE = False
 
-# Only available toolkits will have made it into the GLOBAL_TOOLKIT_REGISTRY
-for toolkit in GLOBAL_TOOLKIT_REGISTRY.registered_toolkits:
-    if type(toolkit) is OpenEyeToolkitWrapper:
-        OPENEYE_AVAILABLE = True
-    elif type(toolkit) is RDKitToolkitWrapper:
-        RDKIT_AVAILABLE = True
-    elif type(toolkit) is AmberToolsToolkitWrapper:
-        AMBERTOOLS_AVAILABLE = True
+class _GlobalToolkitRegistry(ToolkitRegistry):
+    """The global toolkit registry, which warns on first use if no basic cheminformatics toolkit is available."""
 
-#=============================================================================================
-# WARN IF INSUFFICIENT TOOLKITS INSTALLED
-#=============================================================================================
+    def _register_deferred_toolkits(self):
+        super()._register_deferred_toolkits()
 
-# Define basic toolkits that handle essential file I/O
+        # Ensure we have at least one basic toolkit
+        if sum([
+                tk.is_available()
+                for tk in self._toolkit_list
+                if type(tk) in BASIC_CHEMINFORMATICS_TOOLKITS
+        ]) == 0:
+            msg = 'WARNING: No basic cheminformatics toolkits are available.\n'
+            msg += 'At least one basic toolkit is required to handle SMARTS matching and file I/O. \n'
+            msg += 'Please install at least one of the following basic toolkits:\n'
+            for wrapper in all_subclasses(ToolkitWrapper):
+                if wrapper.toolkit_name is not None:
+                    msg += '{} : {}\n'.format(
+                        wrapper._toolkit_name,
+                        wrapper._toolkit_installation_instructions)
+            print(msg)
 
-BASIC_CHEMINFORMATICS_TOOLKITS = [RDKitToolkitWrapper, OpenEyeToolkitWrapper]
 
-# Ensure we have at least one basic toolkit
-if sum([
-        tk.is_available()
-        for tk in GLOBAL_TOOLKIT_REGISTRY.registered_toolkits
-        if type(tk) in BASIC_CHEMINFORMATICS_TOOLKITS
-]) == 0:
-    msg = 'WARNING: No basic cheminformatics toolkits are available.\n'
-    msg += 'At least one basic toolkit is required to handle SMARTS matching and file I/O. \n'
-    msg += 'Please install at least one of the following basic toolkits:\n'
-    for wrapper in all_subclasses(ToolkitWrapper):
-        if wrapper.toolkit_name is not None:
-            msg += '{} : {}\n'.format(
-                wrapper._toolkit_name,
-                wrapper._toolkit_installation_instructions)
-    print(msg)
+# Create global toolkit registry, where all available toolkits are registered. Registration is
+# deferred until the registry is first used, so importing this module does not import the toolkits.
+# TODO: Should this be all lowercase since it's not a constant?
+GLOBAL_TOOLKIT_REGISTRY = _GlobalToolkitRegistry(
+    register_imported_toolkit_wrappers=True,
+    exception_if_unavailable=False,
+    defer_registration=True)
+
+#=============================================================================================
+# GLOBAL TOOLKIT-AVAILABLE VARIABLES
+#=============================================================================================
+
+# The OPENEYE_AVAILABLE, RDKIT_AVAILABLE and AMBERTOOLS_AVAILABLE module attributes are
+# resolved from the GLOBAL_TOOLKIT_REGISTRY on first access.
+_TOOLKIT_AVAILABILITY_FLAGS = {
+    'OPENEYE_AVAILABLE': OpenEyeToolkitWrapper,
+    'RDKIT_AVAILABLE': RDKitToolkitWrapper,
+    'AMBERTOOLS_AVAILABLE': AmberToolsToolkitWrapper,
+}
+
+
+def __getattr__(name):
+    if name in _TOOLKIT_AVAILABILITY_FLAGS:
+        # Only available toolkits will have made it into the GLOBAL_TOOLKIT_REGISTRY
+        toolkit_class = _TOOLKIT_AVAILABILITY_FLAGS[name]
+        available = any(type(toolkit) is toolkit_class
+                        for toolkit in GLOBAL_TOOLKIT_REGISTRY.registered_toolkits)
+        globals()[name] = available
+        return available
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if sys.version_info < (3, 7):
+    # Module-level __getattr__ (PEP 562) is not supported, so resolve the flags now.
+    for _flag_name in _TOOLKIT_AVAILABILITY_FLAGS:
+        __getattr__(_flag_name)
@@ -34,7 +34,9 @@ __all__ = [
 #=============================================================================================
 
 import contextlib
+import copy
 import functools
+import re
 
 from simtk import unit
 import logging
@@ -60,6 +62,11 @@ class MessageException(Exception):
     def __str__(self):
         return self.msg
 
+    def __reduce__(self):
+        # Exceptions are pickled with their args, which here include the exception itself,
+        # e.g. when they are raised in a worker process
+        return self.__class__, (self.msg, )
+
 
 class IncompatibleUnitError(MessageException):
     """
@@ -243,6 +250,32 @@ def _ast_eval(node):
         raise TypeError(node)
 
 
+# Matches a number literal followed by a multiplication and a unit expression.
+_QUANTITY_STRING_REGEX = re.compile(
+    r'^(-?(?:\d+\.\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?|\d+[eE][-+]?\d+|0|[1-9]\d*))'
+    r'\s*\*\s*([A-Za-z_(][^\n]*)$'
+)
+_INTEGER_STRING_REGEX = re.compile(r'^-?\d+$')
+
+
+@functools.lru_cache(maxsize=1024)
+def _evaluate_unit_string(unit_string):
+    """
+    Parse and evaluate a unit or quantity string, caching the result.
+
+    Force field files contain only a few distinct unit expressions, so
+    caching avoids building and walking the same syntax tree repeatedly.
+    Callers must not modify the returned object.
+
+    Parameters
+    ----------
+    unit_string : str
+        The string to evaluate.
+    """
+    import ast
+    return _ast_eval(ast.parse(unit_string, mode='eval').body)
+
+
 def string_to_unit(unit_string):
     """
     Deserializes a simtk.unit.Quantity from a string representation, for
@@ -259,8 +292,10 @@ def string_to_unit(unit_string):
     output_unit: simtk.unit.Quantity
         The deserialized unit from the string
     """
-    import ast
-    output_unit = _ast_eval(ast.parse(unit_string, mode='eval').body)
+    output_unit = _evaluate_unit_string(unit_string)
+    # Only units are immutable and can be safely shared between calls.
+    if not isinstance(output_unit, unit.Unit):
+        output_unit = copy.deepcopy(output_unit)
     return output_unit
 
     #if (serialized['unitless_value'] is None) and (serialized['unit'] is None):
@@ -292,10 +327,32 @@ def string_to_quantity(quantity_string):
     """
     if quantity_string is None:
         return None
-    # This can be the exact same as string_to_unit
-    import ast
-    output_quantity = _ast_eval(ast.parse(quantity_string, mode='eval').body)
-    return output_quantity
+
+    # Fast path for the "<number> * <unit expression>" strings found in
+    # force field files. The unit expression is evaluated once with a unit
+    # value and reused for all the quantities sharing it.
+    match = _QUANTITY_STRING_REGEX.match(quantity_string)
+    if match is not None:
+        value_string, unit_string = match.groups()
+        unit_template = _evaluate_unit_string('1 * ' + unit_string)
+        # If the unit expression only combined units without scaling the
+        # value, the result is exactly what the full evaluation would return.
+        if isinstance(unit_template, unit.Quantity):
+            template_value = unit_template._value
+        else:
+            template_value = unit_template
+        if type(template_value) is int and template_value == 1:
+            if _INTEGER_STRING_REGEX.match(value_string):
+                value = int(value_string)
+            else:
+                value = float(value_string)
+            if isinstance(unit_template, unit.Quantity):
+                return unit.Quantity(value, unit_template.unit)
+            return value
+
+    output_quantity = _evaluate_unit_string(quantity_string)
+    # Quantities may wrap mutable containers, so we never return cached ones.
+    return copy.deepcopy(output_quantity)
 
 def convert_all_strings_to_quantity(smirnoff_data):
     """
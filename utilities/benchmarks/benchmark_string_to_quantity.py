@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""
+Micro-benchmark of the parsing of quantity strings when loading a force field.
+
+Compares the evaluation of every quantity string in a SMIRNOFF force field by
+building and walking its syntax tree, which is what
+``openforcefield.utils.string_to_quantity`` used to do, with the current
+``string_to_quantity``, which caches the evaluation of unit expressions.
+
+Usage:
+
+    python benchmark_string_to_quantity.py [--forcefield test_forcefields/smirnoff99Frosst.offxml] [--repeats 10]
+
+"""
+
+import argparse
+import ast
+import timeit
+
+from openforcefield.typing.engines.smirnoff import XMLParameterIOHandler
+from openforcefield.utils import get_data_file_path, string_to_quantity
+from openforcefield.utils.utils import _ast_eval
+
+
+def iter_strings(data):
+    """Yield all the strings in a SMIRNOFF data structure."""
+    if isinstance(data, dict):
+        for value in data.values():
+            yield from iter_strings(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from iter_strings(item)
+    elif isinstance(data, str):
+        yield data
+
+
+def ast_string_to_quantity(quantity_string):
+    """The uncached implementation of string_to_quantity."""
+    return _ast_eval(ast.parse(quantity_string, mode='eval').body)
+
+
+def parse_all(parse_function, quantity_strings):
+    for quantity_string in quantity_strings:
+        parse_function(quantity_string)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--forcefield', default='test_forcefields/smirnoff99Frosst.offxml',
+                        help='The force field whose quantity strings are parsed.')
+    parser.add_argument('--repeats', type=int, default=10,
+                        help='The number of times all the strings are parsed.')
+    args = parser.parse_args()
+
+    smirnoff_data = XMLParameterIOHandler().parse_file(get_data_file_path(args.forcefield))
+
+    # Keep only the strings that define quantities.
+    quantity_strings = []
+    for string in iter_strings(smirnoff_data):
+        try:
+            ast_string_to_quantity(string)
+        except (AttributeError, TypeError, SyntaxError):
+            continue
+        quantity_strings.append(string)
+
+    print(f'{len(quantity_strings)} quantity strings '
+          f'({len(set(quantity_strings))} distinct) in {args.forcefield}')
+
+    timings = {}
+    for name, parse_function in [('ast', ast_string_to_quantity),
+                                 ('string_to_quantity', string_to_quantity)]:
+        timings[name] = min(timeit.repeat(lambda: parse_all(parse_function, quantity_strings),
+                                          number=1, repeat=args.repeats))
+        print(f'{name:>20}: {timings[name] * 1000:8.2f} ms')
+    print(f'{"speedup":>20}: {timings["ast"] / timings["string_to_quantity"]:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()